@@ -0,0 +1,32 @@
+# Sudoku solver and generator. Run "python -m simple_sudoku" for the GUI.
+# Names are imported on first use, so a worker that only solves never loads numpy or tkinter.
+import importlib
+
+__all__ = [
+    "solve", "generate", "count_solutions",
+    "BitmaskSolver", "DancingLinksSolver", "PortfolioSolver", "Sudoku", "GUI",
+]
+
+lazy_names = {  # Name: module that defines it.
+    "solve": "api",
+    "generate": "api",
+    "count_solutions": "api",
+    "BitmaskSolver": "bitmask",
+    "DancingLinksSolver": "dlx",
+    "PortfolioSolver": "portfolio",
+    "Sudoku": "sudoku",
+    "GUI": "gui",
+}
+
+
+def __getattr__(name):
+    if name not in lazy_names:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f"{__name__}.{lazy_names[name]}"), name)
+    globals()[name] = value  # Later lookups skip this function.
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,178 @@
+# Start the GUI with "python -m simple_sudoku", other tools are sub-commands (see --help).
+import argparse
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m simple_sudoku", description="Sudoku GUI and tools.")
+    parser.add_argument("--size", type=int, choices=(4, 9, 16, 25), default=9,
+                        help="Board size of the GUI (default: 9).")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed of the GUI, created puzzles and solutions are the same for the same seed.")
+    parser.add_argument("--debug", action="store_true", help="Print the time of every board redraw of the GUI.")
+    commands = parser.add_subparsers(dest="command")
+
+    batch = commands.add_parser("batch", help="Solve many puzzles, one per line, solutions are written in order.")
+    batch.add_argument("input", nargs="?", default="-", help="File of puzzles, - for stdin (default).")
+    batch.add_argument("-o", "--output", default="-", help="File for solutions, - for stdout (default).")
+    batch.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    batch.add_argument("--chunk", type=int, default=64, help="Puzzles sent to a worker at once.")
+    batch.add_argument("--binary", type=int, metavar="SIZE", default=None,
+                       help="Read and write packed 4-bit records of SIZE x SIZE puzzles (up to 16), not text lines.")
+
+    check = commands.add_parser("check", help="Check many boards, one per line, prints ok or bad for each.")
+    check.add_argument("input", nargs="?", default="-", help="File of boards, - for stdin (default).")
+    check.add_argument("--partial", action="store_true",
+                       help="Accept boards with empty spots as long as nothing is in conflict.")
+
+    convert = commands.add_parser("convert", help="Convert a file of puzzles between line, digits, sdk and packed.")
+    convert.add_argument("input", nargs="?", default="-", help="File of puzzles, - for stdin (default).")
+    convert.add_argument("-o", "--output", default="-", help="Converted file, - for stdout (default).")
+    convert.add_argument("--from", dest="source_format", choices=("line", "digits", "sdk", "packed"), default="line",
+                         help="Format of the input (default: line, which also reads digits).")
+    convert.add_argument("--to", dest="target_format", choices=("line", "digits", "sdk", "packed"), default="line",
+                         help="Format of the output (default: line).")
+    convert.add_argument("--binary", type=int, metavar="SIZE", default=None,
+                         help="Size of the puzzles of packed input.")
+
+    bench = commands.add_parser("bench", help="Time solving, generating and validating over the bundled corpora.")
+    bench.add_argument("-o", "--output", default=None, help="Save the results as JSON to this file.")
+    bench.add_argument("--compare", default=None, metavar="JSON",
+                       help="Results of an earlier run, exit status 1 if anything got worse.")
+    bench.add_argument("--tolerance", type=float, default=0.25,
+                       help="Slowdown allowed by --compare before it counts, 0.25 is 25%% (default).")
+    bench.add_argument("--engine", choices=("bitmask", "dlx"), default="bitmask", help="Solver (default: bitmask).")
+    bench.add_argument("-w", "--workers", type=int, default=1, help="Worker processes for hard puzzles (default: 1).")
+    bench.add_argument("--timeout", type=float, default=10.0, help="Seconds allowed per puzzle (default: 10).")
+    bench.add_argument("--quick", action="store_true", help="Skip generating and validate fewer boards.")
+    bench.add_argument("--profile", action="store_true", help="Run under cProfile and print the slowest calls.")
+
+    serve = commands.add_parser("serve", help="Serve /solve, /generate, /validate and /grade over HTTP (JSON).")
+    serve.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1).")
+    serve.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080).")
+    serve.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    serve.add_argument("--batch", type=int, default=32,
+                       help="Most requests waiting for a busy pool before they are sent anyway (default: 32).")
+
+    load = commands.add_parser("load", help="Load the HTTP service with concurrent requests, report latency.")
+    load.add_argument("--host", default="127.0.0.1", help="Address of the server (default: 127.0.0.1).")
+    load.add_argument("--port", type=int, default=8080, help="Port of the server (default: 8080).")
+    load.add_argument("--spawn", action="store_true", help="Start a server in this process instead.")
+    load.add_argument("-w", "--workers", type=int, default=None, help="Worker processes of a --spawn server.")
+    load.add_argument("--batch", type=int, default=32, help="--batch of a --spawn server.")
+    load.add_argument("--endpoint", choices=("solve", "generate", "validate", "grade"), default="solve",
+                      help="Endpoint to load (default: solve).")
+    load.add_argument("-c", "--concurrency", type=int, default=16, help="Connections sending at once (default: 16).")
+    load.add_argument("-n", "--requests", type=int, default=1000, help="Requests in total (default: 1000).")
+    load.add_argument("--corpus", default="hard", help="Bundled corpus the puzzles come from (default: hard).")
+    load.add_argument("-o", "--output", default=None, help="Save the results as JSON to this file.")
+
+    args = parser.parse_args(argv)
+
+    if args.command is None:  # No command, start the GUI.
+        from .gui import GUI
+        GUI(args.size, seed=args.seed, debug=args.debug)
+    elif args.command == "batch":
+        from . import batch as batch_module
+
+        mode = "b" if args.binary is not None else ""
+
+        source = open(args.input, "r" + mode) if args.input != "-" else (
+            sys.stdin.buffer if mode else sys.stdin)
+        target = open(args.output, "w" + mode) if args.output != "-" else (
+            sys.stdout.buffer if mode else sys.stdout)
+
+        try:
+            batch_module.run(source, target, workers=args.workers, chunk_size=args.chunk, binary_size=args.binary)
+        except ValueError as error:  # Malformed input, stop with a message instead of a traceback.
+            sys.stderr.write(f"{parser.prog} batch: {error}\n")
+            return 2
+        finally:
+            if source not in (sys.stdin, sys.stdin.buffer):
+                source.close()
+            if target not in (sys.stdout, sys.stdout.buffer):
+                target.close()
+    elif args.command == "check":
+        from .batch import read_lines
+        from .validate import check_stream
+
+        source = open(args.input) if args.input != "-" else sys.stdin
+        bad = 0
+
+        try:
+            for result in check_stream(read_lines(source), full=not args.partial):
+                bad += result is False
+                sys.stdout.write("ok\n" if result is True else "bad\n")
+        except ValueError as error:
+            sys.stderr.write(f"{parser.prog} check: {error}\n")
+            return 2
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        return 1 if bad else 0
+    elif args.command == "convert":
+        from . import formats
+
+        source = args.input if args.input != "-" else sys.stdin.buffer
+
+        try:
+            data = formats.dump(formats.load(source, args.source_format, size=args.binary), args.target_format)
+        except ValueError as error:  # Nothing is written, so a bad line never leaves half a file behind.
+            sys.stderr.write(f"{parser.prog} convert: {error}\n")
+            return 2
+
+        if args.output == "-":
+            sys.stdout.buffer.write(data)
+        else:
+            with open(args.output, "wb") as target:
+                target.write(data)
+    elif args.command == "serve":
+        from . import server
+
+        server.run(args.host, args.port, workers=args.workers, max_batch=args.batch, report=sys.stderr)
+    elif args.command == "load":
+        import json
+
+        from . import loadgen
+
+        results = loadgen.run(args.host, args.port, endpoint=args.endpoint, concurrency=args.concurrency,
+                              count=args.requests, corpus=args.corpus, spawn=args.spawn, workers=args.workers,
+                              max_batch=args.batch)
+
+        if args.output is not None:
+            with open(args.output, "w") as target:
+                json.dump(results, target, indent=2)
+
+        return 1 if results["errors"] else 0
+    elif args.command == "bench":
+        import json
+
+        from . import benchmark
+        from .stats import profile
+
+        options = dict(engine=args.engine, workers=args.workers, timeout=args.timeout,
+                       generate_count=0 if args.quick else 5, validate_count=10000 if args.quick else 100000)
+
+        if args.profile is True:  # Memory tracing would show up in the profile, so it's left out.
+            results = profile(benchmark.run, memory=False, **options)
+        else:
+            results = benchmark.run(**options)
+
+        if args.output is not None:
+            with open(args.output, "w") as target:
+                json.dump(results, target, indent=2)
+
+        if args.compare is not None:
+            with open(args.compare) as source:
+                regressions = benchmark.compare(json.load(source), results, tolerance=args.tolerance)
+
+            for key, metric, old, new in regressions:
+                sys.stderr.write(f"Worse: {key} {metric} {old:g} -> {new:g}\n")
+
+            return 1 if regressions else 0
+    return
+
+
+if __name__ == "__main__":
+    sys.exit(main())
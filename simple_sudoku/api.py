@@ -0,0 +1,34 @@
+# Plain function API for batch workers, grids are lists of rows with 0 for empty spots. No numpy or tkinter needed.
+import math
+
+from .bitmask import get_solver
+from .generator import generate
+
+
+def check_grid(grid):  # Return size of the grid, raise ValueError if it's not a square Sudoku grid.
+    size = len(grid)
+    block_row = int(math.sqrt(size))
+
+    if size == 0 or block_row * block_row != size:
+        raise ValueError(f"Grid must have a square number of rows, got {size}.")
+
+    for row in grid:
+        if len(row) != size:
+            raise ValueError(f"Every row must have {size} values.")
+
+        for value in row:
+            if not 0 <= value <= size:
+                raise ValueError(f"Values must be between 0 (empty) and {size}, got {value}.")
+    return size
+
+
+def solve(grid, rng=None):  # Return one solution of grid, or None if there is none.
+    solutions = get_solver(check_grid(grid)).solve(grid, limit=1, rng=rng)
+
+    if len(solutions) == 0:
+        return None
+    return solutions[0]
+
+
+def count_solutions(grid, limit=2):  # Count solutions of grid, stops counting at limit (None counts all).
+    return len(get_solver(check_grid(grid)).solve(grid, limit=limit))
@@ -0,0 +1,262 @@
+# Bank of ready made puzzles in a memory mapped file, so playing never waits for the generator.
+import mmap
+import os
+import struct
+import threading
+
+from .formats import pack_bits, pack_nibbles, unpack_bits, unpack_nibbles
+from .generator import DIFFICULTY_REMOVED, generate
+
+# File layout:
+#   Header: magic, version, number of sections.
+#   Section table: size, difficulty index, capacity, next slot to write and number of stored puzzles of each section.
+#   Data: every section is a ring buffer of fixed size records.
+# Record: solution packed 2 spots per byte (value - 1, so 16 x 16 fits in 4 bits), then one bit per spot which is set
+# when the spot is a clue of the puzzle. Nibbles and bits are those of the packed format (formats.py).
+HEADER = struct.Struct("<4sHH")
+SECTION = struct.Struct("<BBHIII")
+MAGIC = b"SDKB"
+VERSION = 2  # 1 had the clue bits the other way round in each byte, such files are started again.
+
+BANK_SIZES = (4, 9, 16)  # Sizes a record can hold, values take 4 bits.
+DIFFICULTIES = tuple(DIFFICULTY_REMOVED)  # Difficulty index used in the file.
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".simple_sudoku_bank")  # Bank used by the GUI.
+
+
+def record_size(size):
+    total_cell = size * size
+    return (total_cell + 1) // 2 + (total_cell + 7) // 8
+
+
+def pack_record(puzzle, solution):
+    return (pack_nibbles([value - 1 for row in solution for value in row])
+            + pack_bits([value != 0 for row in puzzle for value in row]))
+
+
+def unpack_record(record, size):  # Return (puzzle, solution) as lists of rows.
+    total_cell = size * size
+
+    values = [value + 1 for value in unpack_nibbles(record, total_cell)]
+    clues = unpack_bits(record[(total_cell + 1) // 2:], total_cell)
+
+    solution = [values[row * size:(row + 1) * size] for row in range(size)]
+    puzzle = [[value if clue else 0 for value, clue in zip(solution[row], clues[row * size:(row + 1) * size])]
+              for row in range(size)]
+    return puzzle, solution
+
+
+class PuzzleBank:  # Puzzles stored by (size, difficulty), take and put are O(1).
+    def __init__(self, path, sizes=BANK_SIZES, difficulties=DIFFICULTIES, capacity=64):
+        # capacity is that of new sections. A file missing some of the sections of sizes and difficulties is rebuilt
+        # with them added, its puzzles are kept. A file of an older version is started again.
+        for size in sizes:
+            if size not in BANK_SIZES:
+                raise ValueError(f"Puzzle bank holds sizes {BANK_SIZES} only, got {size}.")
+
+        self.path = path
+        self.lock = threading.Lock()  # The GUI takes while the filler thread puts.
+        self.file = None
+        self.map = None
+        self.sections = {}  # (size, difficulty): (offset of section entry, offset of data, record size).
+
+        keys = [(size, difficulty) for size in sizes for difficulty in difficulties]
+
+        if not os.path.exists(path) or self.open() is False:
+            self.create(path, [(size, difficulty, capacity) for size, difficulty in keys])
+            self.open()
+
+        missing = [key for key in keys if key not in self.sections]
+
+        if missing:
+            self.extend(missing, capacity)
+
+    def __repr__(self):
+        return f"<PuzzleBank {self.path}>"
+
+    def open(self):  # Map the file and read its section table, False if it is of an older version.
+        self.file = open(self.path, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+        magic, version, section_count = HEADER.unpack_from(self.map, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a puzzle bank.")
+
+        if version != VERSION:
+            self.close()
+            return False
+
+        self.sections = {}
+        data_offset = HEADER.size + section_count * SECTION.size
+
+        for index in range(section_count):
+            entry_offset = HEADER.size + index * SECTION.size
+            size, difficulty_index, _, capacity, _, _ = SECTION.unpack_from(self.map, entry_offset)
+
+            self.sections[(size, DIFFICULTIES[difficulty_index])] = (entry_offset, data_offset, record_size(size))
+            data_offset += capacity * record_size(size)
+        return True
+
+    @staticmethod
+    def create(path, layout):  # Empty bank of (size, difficulty, capacity) sections.
+        with open(path + ".tmp", "wb") as file:  # Write and rename, a half written bank is never seen.
+            file.write(HEADER.pack(MAGIC, VERSION, len(layout)))
+
+            for size, difficulty, capacity in layout:
+                file.write(SECTION.pack(size, DIFFICULTIES.index(difficulty), 0, capacity, 0, 0))
+
+            for size, _, capacity in layout:
+                file.write(bytes(capacity * record_size(size)))
+
+        os.replace(path + ".tmp", path)
+        return
+
+    def extend(self, keys, capacity):  # Rebuild the file with new sections of keys, stored puzzles are kept.
+        layout = []
+        stored = []  # Records of each section of layout, oldest first.
+
+        for key, (_, data_offset, c_record_size) in self.sections.items():
+            c_capacity, head, count = self.read_entry(key)
+
+            starts = [data_offset + ((head - count + index) % c_capacity) * c_record_size for index in range(count)]
+            stored.append([self.map[start:start + c_record_size] for start in starts])
+            layout.append(key + (c_capacity,))
+
+        self.close()
+        self.create(self.path, layout + [key + (capacity,) for key in keys])
+        self.open()
+
+        for (size, difficulty, c_capacity), records in zip(layout, stored):  # Written from slot 0 on.
+            _, data_offset, c_record_size = self.sections[(size, difficulty)]
+            self.map[data_offset:data_offset + len(records) * c_record_size] = b"".join(records)
+            self.write_entry((size, difficulty), c_capacity, len(records) % c_capacity, len(records))
+        return
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        return
+
+    def keys(self):
+        return list(self.sections)
+
+    def read_entry(self, key):
+        entry_offset = self.sections[key][0]
+        size, difficulty_index, _, capacity, head, count = SECTION.unpack_from(self.map, entry_offset)
+        return capacity, head, count
+
+    def write_entry(self, key, capacity, head, count):
+        size, difficulty = key
+        SECTION.pack_into(self.map, self.sections[key][0], size, DIFFICULTIES.index(difficulty), 0, capacity, head,
+                          count)
+        return
+
+    def count(self, size, difficulty):  # Number of stored puzzles, 0 for a section the bank doesn't have.
+        if (size, difficulty) not in self.sections:
+            return 0
+
+        with self.lock:
+            return self.read_entry((size, difficulty))[2]
+
+    def free(self, size, difficulty):  # Room left in a section.
+        if (size, difficulty) not in self.sections:
+            return 0
+
+        with self.lock:
+            capacity, _, count = self.read_entry((size, difficulty))
+            return capacity - count
+
+    def put(self, size, difficulty, puzzle, solution):  # Store a puzzle, False if the section is full or missing.
+        key = (size, difficulty)
+
+        if key not in self.sections:
+            return False
+
+        record = pack_record(puzzle, solution)
+
+        with self.lock:
+            capacity, head, count = self.read_entry(key)
+
+            if count >= capacity:
+                return False
+
+            _, data_offset, c_record_size = self.sections[key]
+            start = data_offset + head * c_record_size
+
+            self.map[start:start + c_record_size] = record
+            self.write_entry(key, capacity, (head + 1) % capacity, count + 1)
+        return True
+
+    def take(self, size, difficulty):  # Oldest stored (puzzle, solution), None if there's none.
+        key = (size, difficulty)
+
+        if key not in self.sections:
+            return None
+
+        with self.lock:
+            capacity, head, count = self.read_entry(key)
+
+            if count == 0:
+                return None
+
+            _, data_offset, c_record_size = self.sections[key]
+            start = data_offset + ((head - count) % capacity) * c_record_size
+
+            record = self.map[start:start + c_record_size]
+            self.write_entry(key, capacity, head, count - 1)
+
+        return unpack_record(record, size)
+
+
+class BankFiller(threading.Thread):  # Background thread that keeps sections of a bank full.
+    def __init__(self, bank, keys=None):
+        # keys: (size, difficulty) of the sections to fill, every section of the bank when None. A GUI only fills
+        # what it plays, each puzzle made here competes with the Tk thread for the GIL.
+        super().__init__(name="bank-filler", daemon=True)
+
+        self.bank = bank
+        self.fill_keys = list(bank.keys()) if keys is None else [key for key in keys if key in bank.keys()]
+        self.wake_event = threading.Event()  # Set after a take, so the filler doesn't have to poll.
+        self.stop_event = threading.Event()
+
+        self.failed = set()  # Sections the generator can't make puzzles for (e.g. expert 4 x 4), not tried again.
+
+    def wake(self):
+        self.wake_event.set()
+        return
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+        return
+
+    def run(self):
+        while self.stop_event.is_set() is False:
+            keys = [key for key in self.fill_keys if key not in self.failed]
+
+            if len(keys) == 0:
+                return
+
+            # Emptiest section first, so the one just used is refilled before the others get extra puzzles.
+            key = max(keys, key=lambda c_key: self.bank.free(*c_key))
+            size, difficulty = key
+
+            if self.bank.free(size, difficulty) == 0:  # All full, sleep until a puzzle is taken.
+                self.wake_event.wait()
+                self.wake_event.clear()
+                continue
+
+            try:
+                puzzle, solution = generate(difficulty, size)
+            except ValueError:  # Difficulty can't be reached for this size.
+                self.failed.add(key)
+                continue
+
+            self.bank.put(size, difficulty, puzzle, solution)
+        return
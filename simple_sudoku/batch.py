@@ -0,0 +1,168 @@
+# Batch solving of puzzle files or stdin on worker processes, solutions come out in input order.
+import bisect
+import collections
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .api import get_solver
+from .formats import format_line, pack_cells, packed_size, parse_line, unpack_cells
+
+
+def read_lines(stream):  # Puzzles of a text stream, blank lines and lines starting with # are skipped.
+    # A line that is not a puzzle raises ValueError naming its line number.
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+
+        if line and not line.startswith("#"):
+            try:
+                yield parse_line(line)
+            except ValueError as error:
+                raise ValueError(f"Line {number}: {error}") from None
+
+
+def read_packed(stream, size):  # Puzzles of a binary stream.
+    record_size = packed_size(size)
+
+    while True:
+        record = stream.read(record_size)
+
+        if len(record) < record_size:
+            if record:
+                raise ValueError("Binary input ends in the middle of a puzzle.")
+            return
+
+        yield unpack_cells(record, size)
+
+
+def solve_chunk(chunk):  # Runs in a worker process, returns (solution, seconds) for each puzzle.
+    # A puzzle without solution gives all empty spots, which can never be a real solution.
+    results = []
+
+    for cells in chunk:
+        start = time.perf_counter()
+
+        size = int(math.sqrt(len(cells)))
+        solutions = get_solver(size).solve([cells[row * size:(row + 1) * size] for row in range(size)], limit=1)
+
+        if len(solutions) == 0:
+            solution = [0] * len(cells)
+        else:
+            solution = [value for row in solutions[0] for value in row]
+
+        results.append((solution, time.perf_counter() - start))
+    return results
+
+
+def chunked(puzzles, chunk_size):
+    chunk = []
+
+    for cells in puzzles:
+        chunk.append(cells)
+
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+class LatencyHistogram:  # Log scale histogram, percentiles in constant memory however many puzzles are solved.
+    def __init__(self, lowest=1e-6, highest=1e3, growth=1.02):
+        self.bounds = []  # Upper bound of each bucket, 2% apart.
+
+        bound = lowest
+
+        while bound < highest:
+            self.bounds.append(bound)
+            bound *= growth
+
+        self.bounds.append(math.inf)
+        self.counts = [0] * len(self.bounds)
+        self.total = 0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += 1
+
+    def percentile(self, percent):  # Upper bound of the bucket holding the percentile, 0.0 when empty.
+        if self.total == 0:
+            return 0.0
+
+        rank = math.ceil(self.total * percent / 100)
+        seen = 0
+
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+
+def solve_stream(puzzles, workers=None, chunk_size=64, histogram=None):  # Yield solutions in input order.
+    # Only a few chunks per worker are in flight at any time, so memory stays constant for any input length.
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    chunks = chunked(puzzles, chunk_size)
+
+    def finished(results):
+        for solution, seconds in results:
+            if histogram is not None:
+                histogram.add(seconds)
+            yield solution
+
+    if workers <= 1:  # No pool, solve in this process.
+        for chunk in chunks:
+            yield from finished(solve_chunk(chunk))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+
+        for chunk in chunks:
+            pending.append(executor.submit(solve_chunk, chunk))
+
+            if len(pending) >= workers * 4:
+                yield from finished(pending.popleft().result())
+
+        while pending:
+            yield from finished(pending.popleft().result())
+    return
+
+
+def run(source, target, workers=None, chunk_size=64, binary_size=None, report=sys.stderr):  # Solve all and report.
+    # Text lines in and out, or packed records of binary_size x binary_size puzzles when binary_size is given.
+    if binary_size is None:
+        puzzles = read_lines(source)
+    else:
+        packed_size(binary_size)  # ValueError for sizes the binary format can't hold.
+        puzzles = read_packed(source, binary_size)
+
+    histogram = LatencyHistogram()
+    unsolved = 0
+
+    start = time.perf_counter()
+
+    for cells in solve_stream(puzzles, workers=workers, chunk_size=chunk_size, histogram=histogram):
+        if cells[0] == 0:  # Solutions never have an empty spot.
+            unsolved += 1
+
+        if binary_size is None:
+            target.write(format_line(cells) + "\n")
+        else:
+            target.write(pack_cells(cells))
+
+    elapsed = time.perf_counter() - start
+
+    if report is not None:
+        rate = histogram.total / elapsed if elapsed > 0 else 0.0
+
+        report.write(f"{histogram.total} puzzles ({unsolved} without solution) in {elapsed:.3f} s, "
+                     f"{rate:.1f} puzzles/s, p50 {histogram.percentile(50) * 1000:.3f} ms, "
+                     f"p99 {histogram.percentile(99) * 1000:.3f} ms\n")
+    return histogram
@@ -0,0 +1,279 @@
+# Benchmarks of solving, generating and validating over the bundled corpora, results are saved as JSON so runs of
+# different commits can be compared. No GUI and no network needed.
+import collections
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from .batch import read_lines
+from .formats import parse_line
+
+CORPORA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpora")
+CORPORA = ("easy", "hard", "17-clue", "16x16")  # Files in CORPORA_DIR, without the .txt.
+VARIANT_CORPUS = "variants"  # Puzzles of every variant with their rules, "classic" ones are the baseline.
+
+TIMEOUTS = (0.01, 0.1, 1.0, 10.0)  # Seconds, success rate is reported for each one.
+
+GENERATE_DIFFICULTIES = ("easy", "medium", "hard")
+
+FORMAT_VERSION = 1  # Bumped when the layout of the results changes.
+
+
+def load_corpus(name):  # Puzzles of a bundled corpus as lists of rows.
+    with open(os.path.join(CORPORA_DIR, name + ".txt")) as source:
+        puzzles = []
+
+        for cells in read_lines(source):
+            size = int(round(len(cells) ** 0.5))
+            puzzles.append([cells[row * size:(row + 1) * size] for row in range(size)])
+    return puzzles
+
+
+def load_variants(name=VARIANT_CORPUS):  # {variant: (list of rules, list of puzzles as lists of rows)}.
+    variants = {}
+
+    with open(os.path.join(CORPORA_DIR, name + ".txt")) as source:
+        for line in source:
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            variant, puzzle, rules = line.split(" ", 2)
+            cells = parse_line(puzzle)
+            size = int(round(len(cells) ** 0.5))
+
+            rules_list, puzzles = variants.setdefault(variant, ([], []))
+            rules_list.append(json.loads(rules))
+            puzzles.append([cells[row * size:(row + 1) * size] for row in range(size)])
+    return variants
+
+
+def git_commit():  # Commit of the working tree, None outside of git.
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(CORPORA_DIR)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summary(seconds, ok, nodes=None, peak=None):  # Result of one benchmark from per item times.
+    ordered = sorted(seconds)
+    count = len(ordered)
+
+    result = {
+        "count": count,
+        "succeeded": sum(ok),
+        "seconds": sum(ordered),
+        "mean_ms": sum(ordered) / count * 1000 if count else 0.0,
+        "p50_ms": ordered[count // 2] * 1000 if count else 0.0,
+        "max_ms": ordered[-1] * 1000 if count else 0.0,
+    }
+
+    if nodes is not None:
+        result["nodes"] = sum(nodes)
+
+    if peak is not None:
+        result["peak_kib"] = peak / 1024
+    return result
+
+
+def measure(function, items, memory):  # Run function on every item, return (results, seconds, peak bytes or None).
+    # Memory is traced in a second pass, tracing slows Python down and would spoil the times.
+    results = []
+    seconds = []
+
+    for item in items:
+        start = time.perf_counter()
+        results.append(function(item))
+        seconds.append(time.perf_counter() - start)
+
+    peak = None
+
+    if memory is True:
+        tracemalloc.start()
+
+        try:
+            for item in items:
+                function(item)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return results, seconds, peak
+
+
+def bench_solve(name, engine="bitmask", workers=1, timeout=TIMEOUTS[-1], seed=2020, memory=True):  # Solve a corpus.
+    return bench_puzzles(load_corpus(name), engine=engine, workers=workers, timeout=timeout, seed=seed, memory=memory)
+
+
+def bench_puzzles(puzzles, engine="bitmask", workers=1, timeout=TIMEOUTS[-1], seed=2020, memory=True, rules=None):
+    # Solve puzzles, rules is the rules of each puzzle for variants. Every Sudoku gets the same seed, so node counts
+    # are the same between runs of the same code (with one worker).
+    from .board import Board
+    from .sudoku import Sudoku
+
+    rules = rules or [None] * len(puzzles)
+
+    def solve(index):  # Return (solution or None, SearchStats).
+        puzzle = puzzles[index]
+
+        sudoku = Sudoku(len(puzzle), engine=engine, seed=seed, rules=rules[index])
+        sudoku.grid = Board.from_rows(puzzle)
+
+        deadline = time.perf_counter() + timeout
+        solved = sudoku.solve_with_threads(workers=workers, stop=lambda: time.perf_counter() > deadline,
+                                           complete=workers <= 1)
+
+        return (sudoku.grid.rows() if solved is True else None), sudoku.stats
+
+    results, seconds, peak = measure(solve, range(len(puzzles)), memory)
+
+    ok = [solution is not None and elapsed <= timeout for (solution, _), elapsed in zip(results, seconds)]
+
+    result = summary(seconds, ok, nodes=[stats.nodes for _, stats in results], peak=peak)
+    result["backtracks"] = sum(stats.backtracks for _, stats in results)
+    result["max_depth"] = max(stats.max_depth for _, stats in results)
+    result["restarts"] = sum(stats.restarts for _, stats in results)
+    result["outcomes"] = dict(collections.Counter(stats.outcome for _, stats in results))
+    result["success_at"] = {str(limit): sum(1 for success, elapsed in zip(ok, seconds) if success and elapsed <= limit)
+                            / len(puzzles) for limit in TIMEOUTS if limit <= timeout}
+    return result, [solution for solution, _ in results]
+
+
+def bench_variants(seed=2020, memory=True):  # Solve the variant corpus, return {variant: result}.
+    # Variants are solved in this process with the bitmask engine, vs_classic is the time of a variant over the time
+    # of the classic puzzles of the same corpus (made the same way), so the cost of each rule shows up on its own.
+    from .validate import solved_boards
+    from .variants import make_topology
+
+    results = {}
+
+    for variant, (rules, puzzles) in load_variants().items():
+        result, solutions = bench_puzzles(puzzles, seed=seed, memory=memory, rules=rules)
+
+        result["succeeded"] = sum(solution is not None and solved_boards(solution, make_topology(len(solution), rule))
+                                  for solution, rule in zip(solutions, rules))
+        results[variant] = result
+
+    classic = results.get("classic")
+
+    for result in results.values():
+        if classic is not None and classic["seconds"] > 0:
+            result["vs_classic"] = result["seconds"] / classic["seconds"]
+    return results
+
+
+def bench_generate(difficulty, count=5, size=9, seed=2020, memory=True):  # Generate count graded puzzles.
+    from .generator import generate
+
+    rng = random.Random(seed)
+
+    def make(_):
+        try:
+            generate(difficulty, size, rng=rng)
+        except ValueError:  # Grader never agreed with difficulty.
+            return False
+        return True
+
+    ok, seconds, peak = measure(make, range(count), memory)
+    return summary(seconds, ok, peak=peak)
+
+
+def bench_validate(solutions, count=100000, seed=2020, memory=True):  # Check count boards derived from solutions.
+    import numpy
+
+    from .transform import multiply
+    from .validate import solved_boards
+
+    rng = numpy.random.default_rng(seed)
+    size = len(solutions[0])
+
+    boards = numpy.concatenate([multiply(solution, -(-count // len(solutions)), rng=rng)[0]
+                                for solution in solutions])[:count]
+
+    results, seconds, peak = measure(solved_boards, [boards], memory)
+
+    result = summary(seconds, [bool(results[0].all())], peak=peak)
+    result["boards"] = len(boards)
+    result["boards_per_s"] = len(boards) / seconds[0] if seconds[0] > 0 else 0.0
+    result["size"] = size
+    return result
+
+
+def run(corpora=CORPORA, engine="bitmask", workers=1, timeout=TIMEOUTS[-1], generate_count=5,
+        validate_count=100000, variants=True, memory=True, report=sys.stderr):  # Run every benchmark, return results.
+    results = {}
+
+    def done(key, result):
+        results[key] = result
+
+        if report is not None:
+            report.write(f"{key:<20} {result['succeeded']}/{result['count']} ok  {result['seconds']:9.3f} s  "
+                         f"p50 {result['p50_ms']:9.3f} ms  max {result['max_ms']:9.3f} ms"
+                         + (f"  {result['nodes']} nodes" if "nodes" in result else "")
+                         + (f"  peak {result['peak_kib']:.0f} KiB" if "peak_kib" in result else "")
+                         + (f"  {result['vs_classic']:.2f}x classic" if "vs_classic" in result else "") + "\n")
+
+    solved = []
+
+    for name in corpora:
+        result, solutions = bench_solve(name, engine=engine, workers=workers, timeout=timeout, memory=memory)
+        done(f"solve/{name}", result)
+
+        solved.extend(solution for solution in solutions if solution is not None and len(solution) == 9)
+
+    if variants is True:
+        for variant, result in bench_variants(memory=memory).items():
+            done(f"variant/{variant}", result)
+
+    if generate_count > 0:
+        for difficulty in GENERATE_DIFFICULTIES:
+            done(f"generate/{difficulty}", bench_generate(difficulty, count=generate_count, memory=memory))
+
+    if validate_count > 0 and solved:
+        done("validate/9x9", bench_validate(solved, count=validate_count, memory=memory))
+
+    return {
+        "version": FORMAT_VERSION,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "engine": engine,
+        "workers": workers,
+        "timeout": timeout,
+        "results": results,
+    }
+
+
+def compare(old, new, tolerance=0.25, floor=0.01):  # Return (key, metric, old, new) of every measure that got worse.
+    # Times may grow by tolerance (and by at least floor seconds) before counting, short runs are noisy. Successes
+    # always count. Node counts are only compared when both runs used one worker, the portfolio's workers race each
+    # other so their counts change from run to run. Results of different sizes (e.g. a --quick run against a full
+    # one) are skipped.
+    if old.get("version") != new.get("version"):
+        raise ValueError(f"Results of format {old.get('version')} and {new.get('version')} can't be compared.")
+
+    regressions = []
+    same_nodes = old.get("workers") == 1 and new.get("workers") == 1  # Node counts are deterministic.
+
+    for key, new_result in new["results"].items():
+        old_result = old["results"].get(key)
+
+        if old_result is None or old_result["count"] != new_result["count"] or \
+                old_result.get("boards") != new_result.get("boards"):
+            continue
+
+        if new_result["succeeded"] < old_result["succeeded"]:
+            regressions.append((key, "succeeded", old_result["succeeded"], new_result["succeeded"]))
+
+        if new_result["seconds"] > max(old_result["seconds"] * (1 + tolerance), old_result["seconds"] + floor):
+            regressions.append((key, "seconds", old_result["seconds"], new_result["seconds"]))
+
+        if same_nodes and "nodes" in old_result and "nodes" in new_result and new_result["nodes"] > old_result["nodes"]:
+            regressions.append((key, "nodes", old_result["nodes"], new_result["nodes"]))
+    return regressions
@@ -0,0 +1,321 @@
+# Bitmask constraint propagation solver, pure Python so it can be used without numpy.
+import time
+
+from .stats import CANCELLED, GAVE_UP, NO_SOLUTION, SOLVED, SearchStats
+from .topology import get_topology
+
+
+class BitmaskSolver:  # Constraint propagation solver using a bitmask of used values for every row, column and block.
+    SOLVED = -1  # Returned by propagation when no empty spot is left.
+
+    def __init__(self, size, topology=None):
+        # topology of a variant (see variants.make_topology), the shared classic tables when None, so creating a
+        # solver costs next to nothing.
+        if topology is None:
+            topology = get_topology(size)
+
+        self.topology = topology
+
+        self.total_row = topology.total_row
+
+        self.block_row = topology.block_row
+
+        self.all_mask = (1 << self.total_row) - 1  # Bit (value - 1) represents value.
+
+        # Spots are numbered row * total_row + col. Units are rows first, then columns, then blocks.
+        self.units = topology.units
+
+        # Units (row, column, block and those of the variant) which each spot belongs to.
+        self.cell_units = topology.cell_units
+
+        self.house_count = topology.house_count  # Units holding every value, only these give hidden singles.
+
+        # Values a cage can still take for the values already in it, as {cage << total_row | used: bits}. Filled on
+        # first use and kept, the same few states come back again and again while searching.
+        self.cage_allowed = {}
+
+        # Cages with a sum of each spot, cages without one are handled by cell_units alone.
+        self.cell_cages = topology.cell_sum_cages
+
+        self.complete = None  # For later use.
+        self.nodes = None
+        self.stats = None
+
+    def __repr__(self):
+        return f"<BitmaskSolver {self.total_row} x {self.total_row}>"
+
+    def solve(self, grid, limit=1, rng=None, node_limit=None, stop=None, progress=None, stats=None):
+        # Return up to limit solutions.
+        # limit None finds all solutions. node_limit caps the number of guesses and stop() is polled every few hundred
+        # guesses, either one ends the search early. self.complete tells afterwards if the search finished or gave up.
+        # progress(guesses, depth, cells) is called at the same points, cells is the flat grid being searched and
+        # changes as soon as the call returns, so it has to be copied to be kept. self.nodes is the number of guesses
+        # made by the last call. The counters of the call are added to stats (a SearchStats) as one attempt, and
+        # self.stats is that object (a new one when stats is None).
+        # IMPORTANT:
+        #   Every lookup used by the inner loops is bound to a local name first, attribute access is much slower.
+        #   Variants cost only their own lookups: a parity mask per spot and a memoized table per cage, both read
+        #   while a spot's candidates are worked out. Classic puzzles use the candidates function without them.
+        total_row = self.total_row
+        all_mask = self.all_mask
+        units = self.units
+        cell_units = self.cell_units
+        houses = units[:self.house_count]
+        solved = BitmaskSolver.SOLVED
+
+        cell_masks = self.topology.cell_masks
+        cell_cages = self.cell_cages
+        cage_options = self.topology.cage_options
+        cage_allowed = self.cage_allowed
+
+        start_time = time.perf_counter()
+
+        self.complete = True
+        self.nodes = 0
+        self.stats = stats if stats is not None else SearchStats()
+
+        cells = [int(value) for row in grid for value in row]  # Flat copy of the grid.
+        used = [0] * len(units)  # Values already placed in each unit.
+
+        empty = []  # Empty spots, removed and added back in O(1) with the help of position.
+        position = [-1] * len(cells)
+
+        for cell, value in enumerate(cells):
+            if value == 0:
+                position[cell] = len(empty)
+                empty.append(cell)
+                continue
+
+            bit = 1 << (value - 1)
+
+            for unit in cell_units[cell]:
+                if used[unit] & bit:  # Same value appears twice in one unit, no solution.
+                    self.stats.add_attempt(0, 0, 0, 0, 0, time.perf_counter() - start_time, NO_SOLUTION)
+                    return []
+                used[unit] |= bit
+
+            if cell_masks is not None and not cell_masks[cell] & bit:  # Value not allowed there (e.g. odd/even).
+                self.stats.add_attempt(0, 0, 0, 0, 0, time.perf_counter() - start_time, NO_SOLUTION)
+                return []
+
+        for unit, options in cage_options.items():  # No set of values left with the cage's sum.
+            if not any(values & used[unit] == used[unit] for values in options):
+                self.stats.add_attempt(0, 0, 0, 0, 0, time.perf_counter() - start_time, NO_SOLUTION)
+                return []
+
+        if rng is not None:  # Random order of empty spots gives random results for the same grid.
+            rng.shuffle(empty)
+
+            for index, cell in enumerate(empty):
+                position[cell] = index
+
+        trail = []  # Every spot filled so far, in order, so it can be undone.
+
+        def classic_candidates(c_cell):  # Values still possible for an empty spot.
+            mask = 0
+
+            for c_unit in cell_units[c_cell]:
+                mask |= used[c_unit]
+            return all_mask & ~mask
+
+        def cage_values(c_unit, c_used):  # Values the empty spots of a cage can take, OR of the sets still possible.
+            mask = 0
+
+            for values in cage_options[c_unit]:
+                if values & c_used == c_used:
+                    mask |= values
+
+            mask &= ~c_used
+            cage_allowed[(c_unit << total_row) | c_used] = mask
+            return mask
+
+        def variant_candidates(c_cell):  # Same as candidates, with the parity mask and the sums of the cages.
+            mask = 0
+
+            for c_unit in cell_units[c_cell]:
+                mask |= used[c_unit]
+
+            mask = (all_mask if cell_masks is None else cell_masks[c_cell]) & ~mask
+
+            for c_unit in cell_cages[c_cell]:
+                c_used = used[c_unit]
+                allowed = cage_allowed.get((c_unit << total_row) | c_used)
+                mask &= cage_values(c_unit, c_used) if allowed is None else allowed
+            return mask
+
+        candidates = classic_candidates if cell_masks is None and not cage_options else variant_candidates
+
+        def place(c_cell, c_bit):  # Fill a spot and mark the value used in all of its units.
+            cells[c_cell] = c_bit.bit_length()
+
+            for c_unit in cell_units[c_cell]:
+                used[c_unit] |= c_bit
+
+            index = position[c_cell]
+            last = empty.pop()
+
+            if last != c_cell:  # Move the last empty spot into the hole.
+                empty[index] = last
+                position[last] = index
+
+            position[c_cell] = -1
+            trail.append(c_cell)
+
+        def undo(c_cell):  # Empty a spot filled by place.
+            c_bit = 1 << (cells[c_cell] - 1)
+            cells[c_cell] = 0
+
+            for c_unit in cell_units[c_cell]:
+                used[c_unit] ^= c_bit
+
+            position[c_cell] = len(empty)
+            empty.append(c_cell)
+
+        def propagate():  # Fill naked and hidden singles, then return the most constrained spot.
+            while True:
+                changed = False
+
+                best_cell = solved
+                best_count = total_row + 1
+
+                for c_cell in tuple(empty):
+                    mask = candidates(c_cell)
+
+                    if mask == 0:
+                        return None  # Dead end.
+
+                    if mask & (mask - 1) == 0:  # Naked single.
+                        place(c_cell, mask)
+                        changed = True
+                    elif changed is False:
+                        count = bin(mask).count("1")
+
+                        if count < best_count:
+                            best_cell = c_cell
+                            best_count = count
+
+                if changed is True:
+                    continue
+
+                if best_cell == solved:
+                    return solved
+
+                for unit_index, unit in enumerate(houses):  # Hidden singles.
+                    once = 0
+                    twice = 0
+
+                    for c_cell in unit:
+                        if cells[c_cell] == 0:
+                            mask = candidates(c_cell)
+                            twice |= once & mask
+                            once |= mask
+
+                    if once | used[unit_index] != all_mask:
+                        return None  # Some value has no spot left in this unit.
+
+                    single = once & ~twice
+
+                    while single:
+                        bit = single & -single
+                        single ^= bit
+
+                        if used[unit_index] & bit:  # Already placed by an earlier single.
+                            continue
+
+                        for c_cell in unit:
+                            if cells[c_cell] == 0 and candidates(c_cell) & bit:
+                                place(c_cell, bit)
+                                changed = True
+                                break
+                        else:
+                            return None  # The value lost its only spot.
+
+                if changed is False:
+                    return best_cell
+
+        solutions = []
+        stack = []  # Guesses made: [spot, values not tried yet, trail length before the guess].
+
+        nodes = 0  # Guesses made so far.
+        backtracks = 0
+        max_depth = 0
+        propagations = 1
+        outcome = NO_SOLUTION
+
+        result = propagate()
+        forced = len(trail)  # Spots filled by propagation, guesses are taken off at the end.
+
+        while True:
+            if result is None:  # Dead end, try next value below.
+                backtracks += 1
+            elif result == solved:
+                solutions.append([cells[row * total_row:(row + 1) * total_row] for row in range(total_row)])
+
+                if limit is not None and len(solutions) >= limit:
+                    outcome = SOLVED
+                    break
+            else:  # Guess on the most constrained spot.
+                mask = candidates(result)
+                bits = []
+
+                while mask:
+                    bit = mask & -mask
+                    mask ^= bit
+                    bits.append(bit)
+
+                if rng is not None:
+                    rng.shuffle(bits)
+
+                stack.append([result, bits, len(trail)])
+
+                if len(stack) > max_depth:
+                    max_depth = len(stack)
+
+            while stack:  # Backtrack to the latest guess with values left.
+                cell, bits, mark = stack[-1]
+
+                while len(trail) > mark:
+                    undo(trail.pop())
+
+                if bits:
+                    place(cell, bits.pop())
+                    break
+
+                stack.pop()
+            else:
+                break  # Searched everything.
+
+            nodes += 1
+
+            if progress is not None and nodes & 255 == 0:
+                progress(nodes, len(stack), cells)
+
+            if node_limit is not None and nodes > node_limit:
+                self.complete = False  # Gave up, the result says nothing about the puzzle.
+                outcome = GAVE_UP
+                break
+
+            if stop is not None and nodes & 255 == 0 and stop():
+                self.complete = False
+                outcome = CANCELLED
+                break
+
+            mark = len(trail)
+            result = propagate()
+
+            propagations += 1
+            forced += len(trail) - mark
+
+        if outcome == NO_SOLUTION and solutions:  # Searched everything and found every solution.
+            outcome = SOLVED
+
+        self.nodes = nodes
+        self.stats.add_attempt(nodes, backtracks, max_depth, propagations, forced,
+                               time.perf_counter() - start_time, outcome)
+        return solutions
+
+
+def get_solver(size):  # New solver for size, cheap as the tables are shared by size.
+    # Not one shared solver: solve() writes complete, nodes and stats on the solver, and the GUI solves on a worker
+    # thread while hints solve on the Tk thread.
+    return BitmaskSolver(size)
@@ -0,0 +1,115 @@
+# Compact Sudoku grid, one byte per spot, shared by the Sudoku class, the generator and the GUI.
+from .topology import get_topology
+
+
+class Board:  # Flat grid in a bytearray, spot row * size + col. Empty spots are kept in a set, so updates are O(1).
+    # Indexed as board[row, col]. board[row], iterating and len() work like a list of rows (rows are read only bytes),
+    # so the solvers take a board wherever they take a list of rows. numpy.asarray(board) is a view of the same bytes.
+    __slots__ = ("total_row", "block_row", "cells", "empty", "peers")
+
+    def __init__(self, size, cells=None):  # cells: flat values, every spot empty when None.
+        topology = get_topology(size)
+
+        self.total_row = topology.total_row
+        self.block_row = topology.block_row
+
+        if cells is None:
+            self.cells = bytearray(self.total_row * self.total_row)
+        else:
+            self.cells = bytearray(cells)
+
+        if len(self.cells) != self.total_row * self.total_row:
+            raise ValueError(f"Board of size {self.total_row} needs {self.total_row ** 2} values, "
+                             f"got {len(self.cells)}.")
+
+        self.empty = set(cell for cell, value in enumerate(self.cells) if value == 0)  # Empty spots.
+        self.peers = topology.peers
+
+    @classmethod
+    def from_rows(cls, rows):  # Board from a list of rows, a numpy array or another board.
+        if isinstance(rows, Board):
+            return rows.copy()
+        return cls(len(rows), bytes(int(value) for row in rows for value in row))
+
+    def __repr__(self):
+        return f"<Board {self.total_row} x {self.total_row}, {len(self.empty)} empty>"
+
+    def __eq__(self, other):
+        if isinstance(other, Board) is False:
+            return NotImplemented
+        return self.cells == other.cells
+
+    __hash__ = None  # Boards change, so they can't be dict keys.
+
+    def __len__(self):
+        return self.total_row
+
+    def __iter__(self):
+        for row in range(self.total_row):
+            yield self.row(row)
+
+    def __getitem__(self, spot):  # Value of spot (row, col), or a whole row.
+        if isinstance(spot, tuple):
+            return self.cells[spot[0] * self.total_row + spot[1]]
+        return self.row(spot)
+
+    def __setitem__(self, spot, value):
+        row, col = spot
+        self.set(row, col, value)
+
+    def __array__(self, dtype=None, copy=None):  # numpy view of the cells, numpy is only imported when used.
+        import numpy
+
+        array = numpy.frombuffer(self.cells, dtype=numpy.uint8).reshape(self.total_row, self.total_row)
+
+        if dtype is not None and array.dtype != dtype:
+            return array.astype(dtype)
+        if copy is True:
+            return array.copy()
+        return array
+
+    def row(self, row):  # Copy of one row, as bytes so writing to it fails instead of being lost.
+        return bytes(self.cells[row * self.total_row:(row + 1) * self.total_row])
+
+    def set(self, row, col, value):
+        cell = row * self.total_row + col
+        self.cells[cell] = value
+
+        if value == 0:
+            self.empty.add(cell)
+        else:
+            self.empty.discard(cell)
+        return
+
+    def copy(self):
+        board = Board.__new__(Board)
+
+        board.total_row = self.total_row
+        board.block_row = self.block_row
+        board.cells = self.cells[:]
+        board.empty = self.empty.copy()
+        board.peers = self.peers
+        return board
+
+    def rows(self):  # Lists of ints, for code that wants plain lists.
+        return [list(row) for row in self]
+
+    def spots(self, empty=True):  # Sorted (row, col) of the empty spots, or of the filled ones with empty=False.
+        if empty is True:
+            cells = sorted(self.empty)
+        else:
+            cells = [cell for cell, value in enumerate(self.cells) if value != 0]
+        return [divmod(cell, self.total_row) for cell in cells]
+
+    def valid(self, row, col, value):  # True if no spot sharing a unit with (row, col) holds value.
+        cells = self.cells
+
+        for peer in self.peers[row * self.total_row + col]:
+            if cells[peer] == value:
+                return False
+        return True
+
+    def candidates(self, row, col):  # Values that can go in (row, col).
+        cells = self.cells
+        used = set(cells[peer] for peer in self.peers[row * self.total_row + col])
+        return [value for value in range(1, self.total_row + 1) if value not in used]
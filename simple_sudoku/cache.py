@@ -0,0 +1,113 @@
+# Solution cache keyed by canonical form, a relabeled or rotated copy of a solved puzzle is answered without solving.
+import collections
+import hashlib
+import os
+import struct
+
+import numpy
+
+from .canonical import apply, canonical_form, undo
+
+HEADER = struct.Struct("<4sHI")  # Magic, version, number of entries.
+MAGIC = b"SDKC"
+VERSION = 1
+
+
+def grid_key(grid):  # 16 byte hash of a grid.
+    grid = numpy.asarray(grid, dtype=numpy.uint8)
+    return hashlib.blake2b(bytes([grid.shape[0]]) + grid.tobytes(), digest_size=16).digest()
+
+
+class SolutionCache:  # Least recently used entries are dropped once max_entries is reached.
+    # Two levels: grids exactly as submitted before are found by hash alone (microseconds), other grids are moved to
+    # their canonical form first (a few milliseconds) and the stored solution is moved back to the caller's grid.
+    def __init__(self, max_entries=10000, path=None):
+        self.max_entries = max_entries
+        self.path = path  # File to load from and save to, None to keep the cache in memory only.
+
+        self.exact = collections.OrderedDict()  # Key of grid as given: solution.
+        self.entries = collections.OrderedDict()  # Key of canonical grid: solution of the canonical grid.
+
+        self.hits = 0
+        self.misses = 0
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __repr__(self):
+        return f"<SolutionCache {len(self.entries)} entries>"
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def remember(table, key, value, max_entries):
+        table[key] = value
+        table.move_to_end(key)
+
+        while len(table) > max_entries:
+            table.popitem(last=False)  # Least recently used.
+        return
+
+    def solve(self, grid, solve_function):  # Cached solution of grid, solve_function(grid) is called on a miss.
+        # solve_function returns a solution or None (not stored, so unsolvable grids are tried again next time).
+        grid = numpy.asarray(grid)
+        exact_key = grid_key(grid)
+
+        solution = self.exact.get(exact_key)
+
+        if solution is not None:
+            self.exact.move_to_end(exact_key)
+            self.hits += 1
+            return solution.copy()
+
+        canonical, transform = canonical_form(grid)
+        key = grid_key(canonical)
+
+        canonical_solution = self.entries.get(key)
+
+        if canonical_solution is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            solution = undo(canonical_solution, transform)
+        else:
+            self.misses += 1
+            solution = solve_function(grid)
+
+            if solution is None:
+                return None
+
+            solution = numpy.array(solution, dtype=numpy.uint8)  # Own copy, the solver may reuse its grid.
+            self.remember(self.entries, key, apply(solution, transform).astype(numpy.uint8), self.max_entries)
+
+        self.remember(self.exact, exact_key, solution, self.max_entries)
+        return solution.copy()
+
+    def save(self, path=None):  # Write canonical entries, oldest first so loading keeps the same order.
+        path = path or self.path
+
+        with open(path + ".tmp", "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, len(self.entries)))
+
+            for key, solution in self.entries.items():
+                file.write(key + bytes([solution.shape[0]]) + solution.tobytes())
+
+        os.replace(path + ".tmp", path)
+        return
+
+    def load(self, path=None):
+        path = path or self.path
+
+        with open(path, "rb") as file:
+            magic, version, count = HEADER.unpack(file.read(HEADER.size))
+
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a solution cache.")
+
+            for _ in range(count):
+                key = file.read(16)
+                size = file.read(1)[0]
+                solution = numpy.frombuffer(file.read(size * size), dtype=numpy.uint8).reshape(size, size)
+
+                self.remember(self.entries, key, solution.copy(), self.max_entries)
+        return
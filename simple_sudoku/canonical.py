@@ -0,0 +1,133 @@
+# Canonical form of a grid, the same for every grid that is a relabeled, reordered or transposed copy of it.
+import itertools
+import math
+
+import numpy
+
+CANONICAL_SIZES = (4, 9)  # Sizes with few enough column orders to try them all (1296 for 9 x 9).
+
+MAX_CANDIDATES = 20000  # Cap on partial forms kept while searching, only very symmetric grids get near it.
+
+orders_cache = {}  # size: array of every valid row (or column) order.
+
+
+def valid_orders(size):  # Every order keeping bands together, as a (count, size) array. new row i = old row order[i].
+    orders = orders_cache.get(size)
+
+    if orders is None:
+        block_row = int(math.sqrt(size))
+        block_orders = list(itertools.permutations(range(block_row)))
+
+        orders = numpy.array([
+            [band * block_row + inside[index] for band, inside in zip(bands, insides) for index in range(block_row)]
+            for bands in block_orders for insides in itertools.product(block_orders, repeat=block_row)
+        ])
+        orders_cache[size] = orders
+    return orders
+
+
+def apply(grid, transform):  # Move grid to the canonical side of transform.
+    transpose, row_order, col_order, value_map = transform
+    grid = numpy.asarray(grid)
+
+    if transpose:
+        grid = grid.T
+    return value_map[grid[numpy.ix_(row_order, col_order)]]
+
+
+def undo(grid, transform):  # Exact reverse of apply.
+    transpose, row_order, col_order, value_map = transform
+
+    inverse_map = numpy.empty_like(value_map)
+    inverse_map[value_map] = numpy.arange(len(value_map))
+
+    result = numpy.empty_like(numpy.asarray(grid))
+    result[numpy.ix_(row_order, col_order)] = inverse_map[numpy.asarray(grid)]
+
+    if transpose:
+        result = result.T
+    return result
+
+
+def canonical_form(grid):  # Return (canonical grid, transform) where apply(grid, transform) == canonical grid.
+    # The canonical grid is the smallest one, row by row, of all equivalent grids. Empty spots sort first and values
+    # are renumbered in order of first appearance. Rows are fixed one at a time and only the partial forms giving
+    # the smallest rows so far are kept, so most grids are done after trying a few thousand forms for the first row.
+    # Sizes not in CANONICAL_SIZES get the grid itself with the identity transform.
+    grid = numpy.asarray(grid, dtype=numpy.int64)
+    size = grid.shape[0]
+
+    if size not in CANONICAL_SIZES:
+        identity = numpy.arange(size)
+        return grid.copy(), (False, identity, identity, numpy.arange(size + 1))
+
+    block_row = int(math.sqrt(size))
+    orders = valid_orders(size)
+    band_of = numpy.arange(size) // block_row
+    weights = (size + 1) ** numpy.arange(size - 1, -1, -1)  # Compare whole rows as one number.
+
+    grids = numpy.stack([grid, grid.T])
+
+    # Partial forms: transposed or not, column order, rows used so far, value map and next free value.
+    transposes = numpy.repeat(numpy.arange(2), len(orders))
+    col_orders = numpy.tile(numpy.arange(len(orders)), 2)
+    rows = numpy.zeros((len(transposes), 0), dtype=numpy.int64)
+    value_maps = numpy.zeros((len(transposes), size + 1), dtype=numpy.int64)
+    next_values = numpy.ones(len(transposes), dtype=numpy.int64)
+
+    canonical = numpy.zeros((size, size), dtype=numpy.int64)
+
+    for level in range(size):
+        count = len(transposes)
+
+        if level % block_row == 0:  # Starting a band, any row of an unused band.
+            used_bands = numpy.zeros((count, block_row), dtype=bool)
+            used_bands[numpy.arange(count)[:, None], rows // block_row] = True
+            allowed = ~used_bands[:, band_of]
+        else:  # Any unused row of the current band.
+            used_rows = numpy.zeros((count, size), dtype=bool)
+            used_rows[numpy.arange(count)[:, None], rows] = True
+            current_band = rows[:, level - level % block_row] // block_row
+            allowed = (band_of[None, :] == current_band[:, None]) & ~used_rows
+
+        parents, next_rows = numpy.nonzero(allowed)
+
+        transposes = transposes[parents]
+        col_orders = col_orders[parents]
+        rows = numpy.hstack([rows[parents], next_rows[:, None]])
+        value_maps = value_maps[parents]
+        next_values = next_values[parents]
+
+        values = grids[transposes[:, None], next_rows[:, None], orders[col_orders]]
+        count = len(transposes)
+        index = numpy.arange(count)
+
+        new_rows = numpy.zeros((count, size), dtype=numpy.int64)
+
+        for col in range(size):  # Renumber values in order of first appearance.
+            value = values[:, col]
+            new = (value_maps[index, value] == 0) & (value != 0)
+
+            value_maps[index[new], value[new]] = next_values[new]
+            next_values += new
+            new_rows[:, col] = value_maps[index, value]
+
+        keys = new_rows @ weights
+        keep = numpy.nonzero(keys == keys.min())[0][:MAX_CANDIDATES]
+
+        transposes = transposes[keep]
+        col_orders = col_orders[keep]
+        rows = rows[keep]
+        value_maps = value_maps[keep]
+        next_values = next_values[keep]
+
+        canonical[level] = new_rows[keep[0]]
+
+    value_map = value_maps[0].copy()
+
+    missing = [value for value in range(1, size + 1) if value_map[value] == 0]  # Values the grid doesn't use.
+
+    for value, new_value in zip(missing, range(next_values[0], size + 1)):
+        value_map[value] = new_value
+
+    return canonical, (bool(transposes[0]), rows[0], orders[col_orders[0]], value_map)
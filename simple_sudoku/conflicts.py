@@ -0,0 +1,126 @@
+# Live move checking, keeps every unit's value counts so a change only looks at the spots sharing a unit with it.
+from .topology import get_topology
+
+EMPTY = 0
+VALID = 1
+INVALID = 2  # Same value appears again in the row, column or block of the spot.
+
+
+class ConflictTracker:  # Value counts of every unit and the spots in conflict, updated one change at a time.
+    # IMPORTANT:
+    #   A change of one spot can only change the state of spots in its own row, column and block that hold the old
+    #   or the new value, so set() checks those 3 * size spots and nothing else. valid_count and invalid_count cover
+    #   the editable spots only, clues never count as moves of the player.
+    def __init__(self, size, grid, editable=None):  # editable: (row, col) spots the player fills, None for all.
+        topology = get_topology(size)
+
+        self.total_row = topology.total_row
+        self.units = topology.units
+        self.cell_units = topology.cell_units
+
+        self.cells = [int(value) for row in grid for value in row]
+        self.counts = [[0] * (self.total_row + 1) for _ in self.units]  # counts[unit][value].
+
+        for cell, value in enumerate(self.cells):
+            if value != 0:
+                for unit in self.cell_units[cell]:
+                    self.counts[unit][value] += 1
+
+        if editable is None:
+            self.editable = set(range(len(self.cells)))
+        else:
+            self.editable = set(row * self.total_row + col for row, col in editable)
+
+        self.conflicts = set(cell for cell in range(len(self.cells)) if self.in_conflict(cell))
+
+        self.valid_count = 0
+        self.invalid_count = 0
+
+        for cell in self.editable:
+            state = self.state(cell)
+
+            if state == VALID:
+                self.valid_count += 1
+            elif state == INVALID:
+                self.invalid_count += 1
+
+    def __repr__(self):
+        return f"<ConflictTracker {self.total_row} x {self.total_row}, {len(self.conflicts)} conflicts>"
+
+    def in_conflict(self, cell):
+        value = self.cells[cell]
+
+        if value == 0:
+            return False
+
+        for unit in self.cell_units[cell]:
+            if self.counts[unit][value] > 1:
+                return True
+        return False
+
+    def state(self, cell):  # EMPTY, VALID or INVALID.
+        if self.cells[cell] == 0:
+            return EMPTY
+        return INVALID if cell in self.conflicts else VALID
+
+    def value(self, row, col):
+        return self.cells[row * self.total_row + col]
+
+    def is_valid(self, row, col):
+        return self.state(row * self.total_row + col) == VALID
+
+    def set(self, row, col, value):  # Change one spot, return the (row, col) spots whose state changed.
+        total_row = self.total_row
+        cells = self.cells
+        counts = self.counts
+
+        cell = row * total_row + col
+        old_value = cells[cell]
+        value = int(value)
+
+        if old_value == value:
+            return []
+
+        affected = {cell}  # Only spots holding the old or the new value can gain or lose a conflict.
+
+        for unit in self.cell_units[cell]:
+            for peer in self.units[unit]:
+                if cells[peer] != 0 and (cells[peer] == old_value or cells[peer] == value):
+                    affected.add(peer)
+
+        before = {c_cell: self.state(c_cell) for c_cell in affected}
+
+        for unit in self.cell_units[cell]:
+            if old_value != 0:
+                counts[unit][old_value] -= 1
+            if value != 0:
+                counts[unit][value] += 1
+
+        cells[cell] = value
+
+        changed = []
+
+        for c_cell in affected:
+            if self.in_conflict(c_cell):
+                self.conflicts.add(c_cell)
+            else:
+                self.conflicts.discard(c_cell)
+
+            state = self.state(c_cell)
+
+            if state == before[c_cell]:
+                continue
+
+            changed.append(divmod(c_cell, total_row))
+
+            if c_cell in self.editable:
+                if before[c_cell] == VALID:
+                    self.valid_count -= 1
+                elif before[c_cell] == INVALID:
+                    self.invalid_count -= 1
+
+                if state == VALID:
+                    self.valid_count += 1
+                elif state == INVALID:
+                    self.invalid_count += 1
+        return changed
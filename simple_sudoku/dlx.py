@@ -0,0 +1,286 @@
+# Dancing Links exact cover solver, pure Python so it can be used without numpy.
+import time
+
+from .stats import CANCELLED, GAVE_UP, NO_SOLUTION, SOLVED, SearchStats
+from .topology import get_topology
+
+matrices = {}  # size: link lists of the exact cover matrix, built once and copied by every solve.
+
+
+def build_matrix(size):  # Return (left, right, up, down, column, option, size_list) of a board size.
+    size = int(size)
+    matrix = matrices.get(size)
+
+    if matrix is None:
+        topology = get_topology(size)
+
+        total_row = topology.total_row
+        total_cell = topology.total_cell
+
+        # Columns of the exact cover matrix, 4 groups of total_cell columns:
+        #   spot filled, value in row, value in column, value in block.
+        total_col = 4 * total_cell
+
+        # Node 0 is the root, nodes 1 to total_col are column headers, then 4 nodes for every (row, col, value).
+        # All links live in flat lists, which are copied for each solve instead of building the matrix again.
+        node_count = 1 + total_col + 4 * total_cell * total_row
+
+        left = list(range(-1, node_count - 1))
+        right = list(range(1, node_count + 1))
+        up = list(range(node_count))
+        down = list(range(node_count))
+        column = list(range(node_count))
+        option = [-1] * node_count  # Option (row * total_cell + col * total_row + value - 1) of each node.
+
+        left[0] = total_col
+        right[total_col] = 0
+
+        size_list = [0] * (1 + total_col)
+
+        node = total_col + 1
+
+        for cell, (row, col) in enumerate(topology.coords):
+            block = topology.blocks[cell]
+
+            for value in range(total_row):
+                columns = (1 + cell,
+                           1 + total_cell + row * total_row + value,
+                           1 + 2 * total_cell + col * total_row + value,
+                           1 + 3 * total_cell + block * total_row + value)
+
+                for index, c_col in enumerate(columns):
+                    c_node = node + index
+
+                    left[c_node] = node + (index - 1) % 4
+                    right[c_node] = node + (index + 1) % 4
+
+                    # Append to the bottom of the column.
+                    up[c_node] = up[c_col]
+                    down[c_node] = c_col
+                    down[up[c_col]] = c_node
+                    up[c_col] = c_node
+
+                    column[c_node] = c_col
+                    option[c_node] = cell * total_row + value
+                    size_list[c_col] += 1
+
+                node += 4
+
+        matrix = matrices[size] = (left, right, up, down, column, option, size_list)
+    return matrix
+
+
+class DancingLinksSolver:  # Exact cover solver (Algorithm X with Dancing Links).
+    def __init__(self, size):
+        topology = get_topology(size)
+
+        self.total_row = topology.total_row
+
+        self.block_row = topology.block_row
+
+        self.total_col = 4 * topology.total_cell
+
+        # Shared by every solver of the same size, solve() copies the lists it changes.
+        self.left, self.right, self.up, self.down, self.column, self.option, self.size_list = build_matrix(
+            self.total_row)
+
+        self.complete = None  # For later use.
+        self.nodes = None
+        self.stats = None
+
+    def __repr__(self):
+        return f"<DancingLinksSolver {self.total_row} x {self.total_row}>"
+
+    def solve(self, grid, limit=1, rng=None, node_limit=None, stop=None, progress=None, stats=None):
+        # Return up to limit solutions. limit None finds all solutions. node_limit, stop, progress, stats, self.nodes
+        # and self.stats work like they do for BitmaskSolver.solve. There is no propagation step, columns left with
+        # one option count as forced instead.
+        total_row = self.total_row
+        total_cell = total_row * total_row
+
+        left = self.left.copy()
+        right = self.right.copy()
+        up = self.up.copy()
+        down = self.down.copy()
+        size_list = self.size_list.copy()
+        column = self.column
+        option = self.option
+
+        def cover(c_col):  # Remove column and every option that uses it.
+            right[left[c_col]] = right[c_col]
+            left[right[c_col]] = left[c_col]
+
+            i = down[c_col]
+
+            while i != c_col:
+                j = right[i]
+
+                while j != i:
+                    down[up[j]] = down[j]
+                    up[down[j]] = up[j]
+                    size_list[column[j]] -= 1
+                    j = right[j]
+
+                i = down[i]
+
+        def uncover(c_col):  # Exact reverse of cover.
+            i = up[c_col]
+
+            while i != c_col:
+                j = left[i]
+
+                while j != i:
+                    size_list[column[j]] += 1
+                    down[up[j]] = j
+                    up[down[j]] = j
+                    j = left[j]
+
+                i = up[i]
+
+            right[left[c_col]] = c_col
+            left[right[c_col]] = c_col
+
+        def select(c_node):  # Take the option of c_node into the solution.
+            j = right[c_node]
+
+            while j != c_node:
+                cover(column[j])
+                j = right[j]
+
+        def deselect(c_node):  # Exact reverse of select.
+            j = left[c_node]
+
+            while j != c_node:
+                uncover(column[j])
+                j = left[j]
+
+        start_time = time.perf_counter()
+
+        self.complete = True
+        self.nodes = 0
+        self.stats = stats if stats is not None else SearchStats()
+
+        given = []  # Options fixed by the grid.
+        covered = set()
+
+        for row in range(total_row):
+            for col in range(total_row):
+                value = int(grid[row][col])
+
+                if value == 0:
+                    continue
+
+                # First node of the option, which belongs to the "spot filled" column.
+                c_node = 1 + self.total_col + 4 * ((row * total_row + col) * total_row + value - 1)
+
+                c_cols = [column[c_node + index] for index in range(4)]
+
+                if covered.intersection(c_cols):  # Same value twice in one unit, no solution.
+                    self.stats.add_attempt(0, 0, 0, 0, 0, time.perf_counter() - start_time, NO_SOLUTION)
+                    return []
+
+                covered.update(c_cols)
+                cover(column[c_node])
+                select(c_node)
+                given.append(option[c_node])
+
+        solutions = []
+        stack = []  # [column covered, nodes not tried yet, node currently selected].
+
+        guesses = 0  # Options selected by the search so far.
+        backtracks = 0
+        max_depth = 0
+        forced = 0
+        outcome = NO_SOLUTION
+
+        while True:
+            if right[0] == 0:  # Every column is covered, found a solution.
+                cells = [0] * total_cell
+
+                for c_option in given + [option[frame[2]] for frame in stack]:
+                    cells[c_option // total_row] = c_option % total_row + 1
+
+                solutions.append([cells[row * total_row:(row + 1) * total_row] for row in range(total_row)])
+
+                if limit is not None and len(solutions) >= limit:
+                    outcome = SOLVED
+                    break
+            else:
+                # Column with the fewest options left.
+                c_col = right[0]
+                best_col = c_col
+                best_size = size_list[c_col]
+
+                while c_col != 0 and best_size > 1:
+                    if size_list[c_col] < best_size:
+                        best_col = c_col
+                        best_size = size_list[c_col]
+                    c_col = right[c_col]
+
+                if best_size > 0:
+                    cover(best_col)
+
+                    nodes = []
+                    i = down[best_col]
+
+                    while i != best_col:
+                        nodes.append(i)
+                        i = down[i]
+
+                    if rng is not None:
+                        rng.shuffle(nodes)
+                    else:
+                        nodes.reverse()  # Popped from the end, try in matrix order.
+
+                    stack.append([best_col, nodes, -1])
+
+                    if len(stack) > max_depth:
+                        max_depth = len(stack)
+
+                    if best_size == 1:
+                        forced += 1
+                else:
+                    backtracks += 1  # Column without options, dead end.
+
+            while stack:  # Move to the next option of the latest column.
+                frame = stack[-1]
+
+                if frame[2] != -1:
+                    deselect(frame[2])
+
+                if frame[1]:
+                    frame[2] = frame[1].pop()
+                    select(frame[2])
+                    break
+
+                uncover(frame[0])
+                stack.pop()
+            else:
+                break  # Searched everything.
+
+            guesses += 1
+
+            if progress is not None and guesses & 255 == 0:
+                cells = [0] * total_cell
+
+                for c_option in given + [option[frame[2]] for frame in stack if frame[2] != -1]:
+                    cells[c_option // total_row] = c_option % total_row + 1
+
+                progress(guesses, len(stack), cells)
+
+            if node_limit is not None and guesses > node_limit:
+                self.complete = False  # Gave up, the result says nothing about the puzzle.
+                outcome = GAVE_UP
+                break
+
+            if stop is not None and guesses & 255 == 0 and stop():
+                self.complete = False
+                outcome = CANCELLED
+                break
+
+        if outcome == NO_SOLUTION and solutions:  # Searched everything and found every solution.
+            outcome = SOLVED
+
+        self.nodes = guesses
+        self.stats.add_attempt(guesses, backtracks, max_depth, 0, forced, time.perf_counter() - start_time, outcome)
+        return solutions
@@ -0,0 +1,396 @@
+# Puzzle interchange formats: lines ("53..7...."), 0-padded digits, SadMan .sdk files and packed 4-bit records.
+# Single puzzles are flat lists of values. Bulk loaders give a (count, size, size) uint8 array straight from a
+# memory-mapped file, no Python object is made per puzzle. numpy is only imported by the bulk functions, so batch
+# workers that use the single puzzle functions never load it.
+import math
+import os
+
+SYMBOLS = ".123456789ABCDEFGHIJKLMNOP"  # Symbol of each value in line format, index 0 is empty.
+SYMBOL_VALUES = {symbol: value for value, symbol in enumerate(SYMBOLS)}
+SYMBOL_VALUES["0"] = 0  # 0 is also accepted for empty spots.
+
+FORMATS = ("line", "digits", "sdk", "packed")  # "digits" is a line with 0 for empty spots.
+EMPTY_SYMBOLS = {"line": ".", "digits": "0"}
+
+# SadMan .sdk header lines, "#A" followed by the author and so on. Other letters are kept as they are.
+SDK_FIELDS = {"A": "author", "D": "description", "C": "comment", "B": "published", "S": "source", "L": "level",
+              "U": "url"}
+
+INVALID = 255  # Value of bytes that are not a symbol, in the bulk lookup table.
+LOAD_CHUNK = 1 << 24  # Bytes load_lines parses at a time.
+
+symbol_table_cache = None
+
+
+def check_size(size, length):
+    if size * size != length or int(math.sqrt(size)) ** 2 != size or size == 0:
+        raise ValueError(f"{length} values are not a Sudoku.")
+    return size
+
+
+def parse_line(line):  # "53..7...." (or "530070000") to a flat list of values.
+    line = line.strip()
+    size = check_size(int(math.sqrt(len(line))), len(line))
+
+    try:
+        cells = [SYMBOL_VALUES[symbol] for symbol in line.upper()]
+    except KeyError as error:
+        raise ValueError(f"Unknown symbol {error.args[0]!r} in line.") from None
+
+    if max(cells) > size:
+        raise ValueError(f"Value too big for a {size} x {size} Sudoku.")
+    return cells
+
+
+def format_line(cells, empty="."):  # Flat list of values to "53..7....", empty="0" gives the digits format.
+    return "".join(empty if value == 0 else SYMBOLS[value] for value in cells)
+
+
+def parse_sdk(text):  # Return (flat values, header) of a SadMan .sdk file, header maps field names to text.
+    # Rows may be split by spaces or "|", lines of "-" and "+" between blocks are skipped. Only the first grid is
+    # read, so a [Puzzle] section followed by a [State] section gives the puzzle.
+    header = {}
+    rows = []
+
+    for line in text.splitlines():
+        line = line.strip()
+
+        if line.startswith("#"):
+            if len(line) > 1:
+                header[SDK_FIELDS.get(line[1], line[1])] = line[2:].strip()
+            continue
+
+        if line.startswith("["):  # Section name.
+            if rows:
+                break
+            continue
+
+        line = "".join(line.replace("|", " ").split())
+
+        if line and not set(line) <= set("-+"):
+            rows.append(line)
+
+    if any(len(row) != len(rows) for row in rows):
+        raise ValueError(f"Grid of {len(rows)} rows has rows of other lengths.")
+    return parse_line("".join(rows)), header
+
+
+def format_sdk(cells, header=None):  # Flat list of values to a .sdk file, header as returned by parse_sdk.
+    size = check_size(int(math.sqrt(len(cells))), len(cells))
+    letters = {name: letter for letter, name in SDK_FIELDS.items()}
+
+    lines = [f"#{letters.get(name, name)} {value}" for name, value in (header or {}).items()]
+    lines += [format_line(cells[row * size:(row + 1) * size]) for row in range(size)]
+    return "\n".join(lines) + "\n"
+
+
+def parse_puzzle(text):  # One puzzle as a line, digits or a .sdk file (anything on more than one line).
+    lines = [line for line in text.strip().splitlines() if line.strip()]
+
+    if len(lines) == 1:
+        return parse_line(lines[0])
+    return parse_sdk(text)[0]
+
+
+def format_puzzle(cells, format="line"):  # One puzzle as text of format ("line", "digits" or "sdk").
+    if format == "sdk":
+        return format_sdk(cells)
+
+    if format not in EMPTY_SYMBOLS:
+        raise ValueError(f"Unknown text format {format!r}, choose from {sorted(EMPTY_SYMBOLS) + ['sdk']}.")
+    return format_line(cells, empty=EMPTY_SYMBOLS[format])
+
+
+# Packed records, two spots per byte and the first spot in the high nibble. Up to 15 x 15 the nibble is the value
+# (0 for empty). 16 x 16 needs 17 states, so the nibble holds value - 1 and a bitmap of the filled spots follows,
+# first spot in the highest bit. The puzzle bank (bank.py) stores its records with the same nibbles and bitmaps.
+def packed_size(size):  # Bytes per record.
+    if size > 16:
+        raise ValueError("Packed records hold Sudoku up to 16 x 16 only, use text lines for bigger ones.")
+
+    if size == 16:
+        return size * size // 2 + size * size // 8
+    return (size * size + 1) // 2
+
+
+def pack_cells(cells):  # Flat list of values to one record.
+    size = int(math.sqrt(len(cells)))
+    packed_size(size)
+
+    if size == 16:
+        return pack_nibbles([value - 1 if value else 0 for value in cells]) + pack_bits(cells)
+    return pack_nibbles(cells)
+
+
+def pack_nibbles(values):  # Values below 16, two per byte.
+    if len(values) % 2 == 1:
+        values = values + [0]
+    return bytes((values[index] << 4) | values[index + 1] for index in range(0, len(values), 2))
+
+
+def unpack_nibbles(data, count):  # First count values of pack_nibbles data.
+    values = []
+
+    for byte in data[:(count + 1) // 2]:
+        values.append(byte >> 4)
+        values.append(byte & 15)
+    return values[:count]
+
+
+def pack_bits(flags):  # One bit per item, set when the item is true, first item in the highest bit.
+    data = bytearray((len(flags) + 7) // 8)
+
+    for index, flag in enumerate(flags):
+        if flag:
+            data[index >> 3] |= 128 >> (index & 7)
+    return bytes(data)
+
+
+def unpack_bits(data, count):  # First count flags of pack_bits data, as bools.
+    return [bool(data[index >> 3] & (128 >> (index & 7))) for index in range(count)]
+
+
+def unpack_cells(record, size):  # Exact reverse of pack_cells.
+    total_cell = size * size
+    cells = unpack_nibbles(record, total_cell)
+
+    if size == 16:
+        filled = unpack_bits(record[total_cell // 2:], total_cell)
+        return [value + 1 if filled[cell] else 0 for cell, value in enumerate(cells)]
+    return cells
+
+
+def symbol_table():  # bytes.translate table, value of every byte and INVALID for bytes that are not a symbol.
+    global symbol_table_cache
+
+    if symbol_table_cache is None:  # Lower case letters work too.
+        table = bytearray([INVALID]) * 256
+
+        for symbol, value in SYMBOL_VALUES.items():
+            table[ord(symbol)] = value
+            table[ord(symbol.lower())] = value
+
+        symbol_table_cache = bytes(table)
+    return symbol_table_cache
+
+
+def as_bytes(source):  # uint8 array of a path (memory-mapped), bytes or a binary file object.
+    import numpy
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return numpy.frombuffer(source, dtype=numpy.uint8)
+
+    if hasattr(source, "read"):
+        return numpy.frombuffer(source.read(), dtype=numpy.uint8)
+
+    if os.path.getsize(source) == 0:  # An empty file can't be mapped.
+        return numpy.zeros(0, dtype=numpy.uint8)
+    return numpy.memmap(source, dtype=numpy.uint8, mode="r")
+
+
+def load_lines(source):  # (count, size, size) uint8 array of a file of lines, in the line or digits format.
+    # Blank lines, lines starting with # and "\r\n" endings are allowed, every other line must be one puzzle of the
+    # same size. The bytes are parsed LOAD_CHUNK at a time, each chunk ending on a line break, so a memory-mapped file
+    # is never copied whole. In a chunk, lines are found with one pass over the bytes, every byte is turned into its
+    # value by one bytes.translate (much faster than a numpy table lookup) and the puzzles are copied out through a
+    # sliding window view, so no Python object is made per line.
+    import numpy
+
+    data = as_bytes(source)
+    boards = None  # Made once the length of a line is known, room for as many puzzles as the bytes left can hold.
+    count = 0
+    length = None  # Of the first puzzle, every other one must match.
+
+    start = 0
+    first_line = 1  # Number of the first line of the chunk.
+    chunk_size = LOAD_CHUNK
+
+    while start < len(data):
+        end = min(start + chunk_size, len(data))
+        chunk = data[start:end]
+        newlines = numpy.flatnonzero(chunk == 10)
+
+        if end < len(data):
+            if len(newlines) == 0:  # A line longer than a chunk, try again with a bigger one.
+                chunk_size *= 2
+                continue
+
+            chunk = chunk[:int(newlines[-1]) + 1]
+
+        puzzles, length = parse_chunk(chunk, newlines, first_line, length)
+
+        if puzzles is not None:
+            if boards is None:
+                boards = numpy.empty(((len(data) - start) // (length + 1) + 1, length), dtype=numpy.uint8)
+
+            boards[count:count + len(puzzles)] = puzzles
+            count += len(puzzles)
+
+        start += len(chunk)
+        first_line += len(newlines)
+        chunk_size = LOAD_CHUNK
+
+    if boards is None:
+        return numpy.zeros((0, 0, 0), dtype=numpy.uint8)
+
+    size = int(round(math.sqrt(length)))
+    return boards[:count].reshape(count, size, size)
+
+
+def parse_chunk(chunk, newlines, first_line, length):  # Return (puzzles, line length) of the lines of a chunk.
+    # chunk holds whole lines, newlines are the offsets of its line breaks and length that of the lines before it
+    # (None before the first puzzle). puzzles is a (count, length) array, None when the chunk has none.
+    import numpy
+
+    starts = numpy.concatenate(([0], newlines + 1))
+    ends = numpy.concatenate((newlines, [len(chunk)]))
+
+    lengths = ends - starts
+    has_return = (lengths > 0) & (chunk[numpy.maximum(ends - 1, 0)] == 13)
+    lengths -= has_return
+
+    keep = lengths > 0
+    keep[keep] = chunk[starts[keep]] != ord("#")
+
+    starts, lengths = starts[keep], lengths[keep]
+    numbers = numpy.flatnonzero(keep) + first_line
+
+    if len(starts) == 0:
+        return None, length
+
+    if length is None:
+        length = int(lengths[0])
+
+    size = check_size(int(math.sqrt(length)), length)
+
+    if (lengths != length).any():
+        line = int(numbers[numpy.argmax(lengths != length)])
+        raise ValueError(f"Line {line} is not a {size} x {size} Sudoku like the first one.")
+
+    values = numpy.frombuffer(memoryview(chunk).tobytes().translate(symbol_table()), dtype=numpy.uint8)
+    boards = numpy.lib.stride_tricks.sliding_window_view(values, length)[starts]
+
+    check_values(boards, size, numbers)
+    return boards, length
+
+
+def check_values(boards, size, numbers):  # boards: (count, total cell) values of the lines numbered numbers.
+    import numpy
+
+    if boards.max(initial=0) <= size:  # INVALID is above every size.
+        return
+
+    bad = boards.max(axis=1) > size
+
+    if bad.any():
+        line = int(numbers[numpy.argmax(bad)])
+        raise ValueError(f"Line {line} has a symbol that is not a value of a {size} x {size} Sudoku.")
+    return
+
+
+def format_lines(boards, empty="."):  # bytes of the lines of a (count, size, size) array, empty="0" for digits.
+    import numpy
+
+    boards = numpy.asarray(boards, dtype=numpy.uint8)
+    count = len(boards)
+    flat = boards.reshape(count, -1)
+
+    symbols = numpy.frombuffer((empty + SYMBOLS[1:]).encode(), dtype=numpy.uint8)
+
+    lines = numpy.empty((count, flat.shape[1] + 1), dtype=numpy.uint8)
+    lines[:, :-1] = symbols[flat]
+    lines[:, -1] = 10
+    return lines.tobytes()
+
+
+def save_lines(path, boards, empty="."):
+    with open(path, "wb") as file:
+        file.write(format_lines(boards, empty=empty))
+    return
+
+
+def load_packed(source, size):  # (count, size, size) uint8 array of a file of packed records, see pack_cells.
+    import numpy
+
+    data = as_bytes(source)
+    record_size = packed_size(size)
+    total_cell = size * size
+
+    if len(data) % record_size != 0:
+        raise ValueError("Binary input ends in the middle of a puzzle.")
+
+    records = data.reshape(-1, record_size)
+    count = len(records)
+    nibble_bytes = (total_cell + 1) // 2
+
+    cells = numpy.empty((count, nibble_bytes * 2), dtype=numpy.uint8)
+    cells[:, 0::2] = records[:, :nibble_bytes] >> 4
+    cells[:, 1::2] = records[:, :nibble_bytes] & 15
+    cells = cells[:, :total_cell]
+
+    if size == 16:
+        filled = numpy.unpackbits(records[:, nibble_bytes:], axis=1)
+        cells = (cells + 1) * filled
+    elif count and cells.max() > size:
+        raise ValueError(f"Binary input has values too big for a {size} x {size} Sudoku.")
+    return numpy.ascontiguousarray(cells).reshape(count, size, size)
+
+
+def format_packed(boards):  # bytes of the packed records of a (count, size, size) array.
+    import numpy
+
+    boards = numpy.asarray(boards, dtype=numpy.uint8)
+    count, size = len(boards), boards.shape[-1]
+    total_cell = size * size
+    packed_size(size)
+
+    flat = boards.reshape(count, total_cell)
+    nibbles = numpy.where(flat == 0, 0, flat - 1) if size == 16 else flat
+
+    if total_cell % 2 == 1:
+        nibbles = numpy.concatenate((nibbles, numpy.zeros((count, 1), dtype=numpy.uint8)), axis=1)
+
+    records = (nibbles[:, 0::2] << 4) | nibbles[:, 1::2]
+
+    if size == 16:
+        records = numpy.concatenate((records, numpy.packbits(flat != 0, axis=1)), axis=1)
+    return records.tobytes()
+
+
+def save_packed(path, boards):
+    with open(path, "wb") as file:
+        file.write(format_packed(boards))
+    return
+
+
+def load(source, format="line", size=None):  # (count, size, size) uint8 array of a file in any of FORMATS.
+    # source is a path, bytes or a binary file object. size is needed for "packed" only, a .sdk file is one puzzle.
+    import numpy
+
+    if format in EMPTY_SYMBOLS:
+        return load_lines(source)
+
+    if format == "packed":
+        if size is None:
+            raise ValueError("Packed records don't hold their size, give size.")
+        return load_packed(source, size)
+
+    if format == "sdk":
+        cells = parse_sdk(as_bytes(source).tobytes().decode())[0]
+        size = int(math.sqrt(len(cells)))
+        return numpy.array(cells, dtype=numpy.uint8).reshape(1, size, size)
+    raise ValueError(f"Unknown format {format!r}, choose from {list(FORMATS)}.")
+
+
+def dump(boards, format="line"):  # bytes of a (count, size, size) array in any of FORMATS.
+    if format in EMPTY_SYMBOLS:
+        return format_lines(boards, empty=EMPTY_SYMBOLS[format])
+
+    if format == "packed":
+        return format_packed(boards)
+
+    if format == "sdk":
+        if len(boards) != 1:
+            raise ValueError(f"A .sdk file holds one puzzle, got {len(boards)}.")
+        return format_sdk([int(value) for value in boards[0].ravel()]).encode()
+    raise ValueError(f"Unknown format {format!r}, choose from {list(FORMATS)}.")
@@ -0,0 +1,172 @@
+# Puzzle generator, every puzzle it gives has exactly one solution.
+import random
+
+from .bitmask import get_solver
+from .board import Board
+from .grader import DIFFICULTIES, grade
+
+DIFFICULTY_REMOVED = {  # Share of spots to empty for each difficulty, the GUI always used 55 to 65 of 81 spots.
+    "easy": (35 / 81, 45 / 81),
+    "medium": (45 / 81, 55 / 81),
+    "hard": (55 / 81, 65 / 81),
+    "expert": (60 / 81, 1.0),  # As many as possible.
+}
+
+SIZE_DIFFICULTIES = {4: ("easy",)}  # Sizes that can't reach every difficulty, 4 x 4 puzzles always fall to singles.
+
+REGRADE_ORDERS = 5  # Random orders clues are put back in, when a puzzle came out harder than asked.
+
+# Guesses a uniqueness check may take on 9 x 9 (which needs at most about 40), fewer on bigger boards as every guess
+# propagates over more spots.
+UNIQUE_NODE_LIMIT = 50
+
+
+def forced(cells, topology, spot, value):  # True if value is the only one left for the empty spot, or its only spot.
+    # Checked with the clues alone (naked and hidden singles), so emptying a spot that is forced keeps a unique puzzle
+    # unique without any search.
+    peers = topology.peers
+    seen = {cells[peer] for peer in peers[spot]}
+
+    if len(seen - {0}) == topology.total_row - 1:  # Naked single, every other value is next to it.
+        return True
+
+    for unit in topology.cell_units[spot][:3]:  # Hidden single, no other empty spot of a house can take value.
+        if all(cells[cell] != 0 or any(cells[peer] == value for peer in peers[cell])
+               for cell in topology.units[unit] if cell != spot):
+            return True
+    return False
+
+
+def remove_clues(solution, rng, to_remove=None, solver=None, exact=False):  # Empty spots, the solution stays unique.
+    # solution is a solved grid, or a unique puzzle to empty more spots of. Spots are tried in random order and a
+    # spot is only emptied if the puzzle still has one solution. Stops after to_remove spots, or tries every spot when
+    # to_remove is None. solver is a BitmaskSolver of a variant's topology, a classic solver when None.
+    # IMPORTANT:
+    #   Many spots are forced by the clues left and are emptied without a search. The others get a single count of
+    #   solutions up to 2, capped at a few guesses (UNIQUE_NODE_LIMIT). A count that gives up keeps the clue, so each
+    #   removal takes milliseconds even on 16 x 16, but with to_remove None a few clues a longer search could remove
+    #   may be left. exact=True never gives up, so every spot tried is decided and to_remove None gives a minimal
+    #   puzzle (no clue can go). That is as fast on 9 x 9 and takes minutes on 16 x 16.
+    size = len(solution)
+
+    if solver is None:
+        solver = get_solver(size)
+
+    topology = solver.topology
+    node_limit = None if exact is True else max(UNIQUE_NODE_LIMIT * 81 // (size * size), 4)
+    puzzle = Board.from_rows(solution)  # Changed in place, the solver reads its rows directly.
+    removed = 0
+
+    spots = list(range(size * size))
+    rng.shuffle(spots)
+
+    for spot in spots:
+        if to_remove is not None and removed >= to_remove:
+            break
+
+        row, col = divmod(spot, size)
+        value = puzzle[row, col]
+
+        if value == 0:  # Empty in the puzzle given.
+            continue
+
+        puzzle[row, col] = 0
+
+        if forced(puzzle.cells, topology, spot, value) is True or (
+                len(solver.solve(puzzle, limit=2, node_limit=node_limit)) == 1 and solver.complete is True):
+            removed += 1
+        else:
+            puzzle[row, col] = value  # Clue is needed, or proving it isn't would take too long.
+
+    return puzzle.rows()
+
+
+def match_grade(solution, puzzle, difficulty, rng):  # Return puzzle or a puzzle near it of difficulty, None if none.
+    # IMPORTANT:
+    #   Grades rise as clues go, mostly, and the clue counts of one grade are a thin band (on 9 x 9 most puzzles that
+    #   need more than pairs are past every technique of the grader). A puzzle easier than asked loses every clue it
+    #   can. Then clues of the puzzle harder than asked are put back in a random order, with a binary search for a
+    #   count of them that has the grade, a few orders in turn. Putting clues back needs no uniqueness check.
+    target = DIFFICULTIES.index(difficulty)
+    level = DIFFICULTIES.index(grade(puzzle)[0])
+
+    if level == target:
+        return puzzle
+
+    easier = solution
+
+    if level < target:
+        easier, puzzle = puzzle, remove_clues(puzzle, rng)
+        level = DIFFICULTIES.index(grade(puzzle)[0])
+
+        if level == target:
+            return puzzle
+
+        if level < target:
+            return None
+
+    size = len(puzzle)
+    missing = [(row, col) for row in range(size) for col in range(size) if puzzle[row][col] == 0 and easier[row][col]]
+
+    for _ in range(REGRADE_ORDERS):
+        rng.shuffle(missing)
+        low, high = 0, len(missing)  # Too hard with low clues put back, too easy with high.
+
+        while high - low > 1:
+            middle = (low + high) // 2
+            rows = [row[:] for row in puzzle]
+
+            for row, col in missing[:middle]:
+                rows[row][col] = easier[row][col]
+
+            level = DIFFICULTIES.index(grade(rows)[0])
+
+            if level == target:
+                return rows
+
+            if level > target:
+                low = middle
+            else:
+                high = middle
+    return None
+
+
+def generate(difficulty="medium", size=9, rng=None, minimize=False, graded=True, max_attempts=1000, stop=None):
+    # Return (puzzle, solution) of a random puzzle. With graded=True, puzzles are made until the grader agrees with
+    # difficulty, ValueError at once for a difficulty the size can't reach (SIZE_DIFFICULTIES), after max_attempts or
+    # once stop() returns True (polled before every attempt after the first). minimize=True gives a minimal puzzle,
+    # every clue that can go is removed instead of stopping at the difficulty's count (minutes on 16 x 16).
+    if difficulty not in DIFFICULTY_REMOVED:
+        raise ValueError(f"Unknown difficulty {difficulty!r}, choose from {sorted(DIFFICULTY_REMOVED)}.")
+
+    if graded is True and difficulty not in SIZE_DIFFICULTIES.get(size, DIFFICULTIES):
+        raise ValueError(f"{size} x {size} puzzles can't be {difficulty}, choose from {list(SIZE_DIFFICULTIES[size])}.")
+
+    if rng is None:
+        rng = random.Random()  # Own generator, so nothing else using the random module changes the puzzles.
+
+    total_cell = size * size
+    low, high = DIFFICULTY_REMOVED[difficulty]
+
+    for attempt in range(max_attempts):
+        if attempt > 0 and stop is not None and stop() is True:
+            raise ValueError(f"No {difficulty} puzzle found in {attempt} attempts before the time ran out.")
+
+        solution = get_solver(size).solve([[0] * size for _ in range(size)], limit=1, rng=rng)[0]
+
+        if minimize is True:
+            puzzle = remove_clues(solution, rng, exact=True)
+
+            if graded is False or grade(puzzle)[0] == difficulty:
+                return puzzle, solution
+            continue
+
+        puzzle = remove_clues(solution, rng, rng.randint(round(low * total_cell), round(high * total_cell)))
+
+        if graded is True:
+            puzzle = match_grade(solution, puzzle, difficulty, rng)
+
+        if puzzle is not None:
+            return puzzle, solution
+
+    raise ValueError(f"No {difficulty} puzzle found in {max_attempts} attempts.")
@@ -0,0 +1,330 @@
+# Difficulty grader, solves like a person would (no guessing) and grades by the hardest technique needed.
+import itertools
+
+from .topology import get_topology
+
+# Techniques from easiest to hardest, with the difficulty each one stands for. Puzzles that can't be finished with
+# these techniques are "expert".
+TECHNIQUES = (
+    ("Hidden Single", "easy"),
+    ("Naked Single", "easy"),
+    ("Pointing", "medium"),
+    ("Claiming", "medium"),
+    ("Naked Pair", "medium"),
+    ("Hidden Pair", "medium"),
+    ("Naked Triple", "hard"),
+    ("Hidden Triple", "hard"),
+    ("X-Wing", "hard"),
+)
+
+DIFFICULTIES = ("easy", "medium", "hard", "expert")  # Easiest first.
+
+TECHNIQUE_DIFFICULTY = dict(TECHNIQUES)
+
+
+class HumanSolver:  # Candidates of every spot, updated as values are placed and candidates are eliminated.
+    # IMPORTANT:
+    #   Nothing is rescanned after a change. Every elimination updates how many places each value has left in the
+    #   spot's units, which finds naked and hidden singles straight away, and marks the units dirty so the harder
+    #   techniques only look at units that changed since they last looked.
+    def __init__(self, size, grid):
+        topology = get_topology(size)  # Shared tables, nothing is built for each grid.
+
+        self.total_row = topology.total_row
+        self.units = topology.units
+        self.cell_units = topology.cell_units
+        self.peers = topology.peers
+
+        total_row = self.total_row
+        total_cell = topology.total_cell
+
+        self.cells = [0] * total_cell
+        self.candidates = [(1 << total_row) - 1] * total_cell  # Bit (value - 1) represents value.
+        self.placed = [0] * len(self.units)  # Values already placed in each unit.
+
+        # places[unit * total_row + value - 1] = spots of the unit where value is still a candidate.
+        self.places = [total_row] * (len(self.units) * total_row)
+
+        self.naked = []  # Spots that may have one candidate left.
+        self.hidden = []  # (unit, bit) pairs that may have one place left.
+
+        # Units changed since each unit based technique last looked at them.
+        self.dirty = {name: set(range(len(self.units))) for name in
+                      ("Pointing", "Claiming", "Naked Pair", "Hidden Pair", "Naked Triple", "Hidden Triple")}
+
+        self.broken = False  # True once a spot or a unit runs out of options, the grid has no solution.
+
+        for cell, value in enumerate(value for row in grid for value in row):
+            if value != 0:
+                self.place(cell, int(value))
+
+    def __repr__(self):
+        return f"<HumanSolver {self.total_row} x {self.total_row}>"
+
+    def copy(self):  # Independent copy of the state, much cheaper than placing every value again.
+        human = HumanSolver.__new__(HumanSolver)
+
+        human.total_row = self.total_row
+        human.units = self.units
+        human.cell_units = self.cell_units
+        human.peers = self.peers
+
+        human.cells = self.cells[:]
+        human.candidates = self.candidates[:]
+        human.placed = self.placed[:]
+        human.places = self.places[:]
+        human.naked = self.naked[:]
+        human.hidden = self.hidden[:]
+        human.dirty = {name: units.copy() for name, units in self.dirty.items()}
+        human.broken = self.broken
+        return human
+
+    def eliminate(self, cell, value):  # Remove a candidate, return True if it was there.
+        bit = 1 << (value - 1)
+
+        if self.cells[cell] != 0 or not self.candidates[cell] & bit:
+            return False
+
+        self.candidates[cell] ^= bit
+        mask = self.candidates[cell]
+
+        if mask == 0:
+            self.broken = True
+        elif mask & (mask - 1) == 0:
+            self.naked.append(cell)
+
+        for unit in self.cell_units[cell]:
+            self.lose_place(unit, value)
+
+            for dirty in self.dirty.values():
+                dirty.add(unit)
+        return True
+
+    def lose_place(self, unit, value):  # One spot fewer in unit for value, a hidden single when one is left.
+        bit = 1 << (value - 1)
+        index = unit * self.total_row + value - 1
+        self.places[index] -= 1
+
+        if self.places[index] == 1:
+            self.hidden.append((unit, bit))
+        elif self.places[index] == 0 and not self.placed[unit] & bit:
+            self.broken = True
+        return
+
+    def place(self, cell, value):  # Fill a spot and remove value from the candidates of its peers.
+        bit = 1 << (value - 1)
+
+        if self.cells[cell] != 0:
+            self.broken = self.broken or self.cells[cell] != value
+            return
+
+        if not self.candidates[cell] & bit:
+            self.broken = True  # Value clashes with a peer.
+
+        for other in range(1, self.total_row + 1):  # The spot is no longer a place for its other candidates.
+            if other != value and self.candidates[cell] & (1 << (other - 1)):
+                for unit in self.cell_units[cell]:
+                    self.lose_place(unit, other)
+
+        self.cells[cell] = value
+        self.candidates[cell] = 0
+
+        for unit in self.cell_units[cell]:
+            self.placed[unit] |= bit
+            self.places[unit * self.total_row + value - 1] = 0
+
+            for dirty in self.dirty.values():
+                dirty.add(unit)
+
+        for peer in self.peers[cell]:
+            self.eliminate(peer, value)
+        return
+
+    def solved(self):
+        return 0 not in self.cells
+
+    def unit_places(self, unit, bit):  # Spots of unit where bit is a candidate.
+        return [cell for cell in self.units[unit] if self.candidates[cell] & bit]
+
+    def find_step(self):  # Easiest next step as (technique, placements, eliminations), None if stuck.
+        # placements and eliminations are lists of (spot, value). Nothing is changed until apply is called.
+        if self.broken is True:
+            return None
+
+        while self.hidden:
+            unit, bit = self.hidden.pop()
+
+            if self.placed[unit] & bit:
+                continue
+
+            places = self.unit_places(unit, bit)
+
+            if len(places) == 1:
+                self.hidden.append((unit, bit))  # Keep it until it's applied.
+                return "Hidden Single", [(places[0], bit.bit_length())], []
+
+        while self.naked:
+            cell = self.naked.pop()
+            mask = self.candidates[cell]
+
+            if self.cells[cell] == 0 and mask != 0 and mask & (mask - 1) == 0:
+                self.naked.append(cell)
+                return "Naked Single", [(cell, mask.bit_length())], []
+
+        for technique in ("Pointing", "Claiming", "Naked Pair", "Hidden Pair", "Naked Triple", "Hidden Triple"):
+            dirty = self.dirty[technique]
+
+            while dirty:
+                unit = dirty.pop()
+                eliminations = self.check_unit(technique, unit)
+
+                if eliminations:
+                    dirty.add(unit)  # Could hold more of the same technique after this one.
+                    return technique, [], eliminations
+
+        eliminations = self.check_x_wing()
+
+        if eliminations:
+            return "X-Wing", [], eliminations
+        return None
+
+    def apply(self, step):
+        technique, placements, eliminations = step
+
+        for cell, value in placements:
+            self.place(cell, value)
+
+        for cell, value in eliminations:
+            self.eliminate(cell, value)
+        return
+
+    def check_unit(self, technique, unit):  # Eliminations the technique gives in unit, [] if none.
+        total_row = self.total_row
+        unit_cells = self.units[unit]
+        empty = [cell for cell in unit_cells if self.cells[cell] == 0]
+
+        if technique in ("Pointing", "Claiming"):
+            # Pointing: in a block, all places of a value are in one row or column, so the rest of that line loses it.
+            # Claiming: in a row or column, all places of a value are in one block, so the rest of the block loses it.
+            is_block = unit >= 2 * total_row
+
+            if (technique == "Pointing") != is_block:
+                return []
+
+            for value in range(1, total_row + 1):
+                bit = 1 << (value - 1)
+                places = [cell for cell in empty if self.candidates[cell] & bit]
+
+                if len(places) < 2:
+                    continue
+
+                if is_block:
+                    lines = ({self.cell_units[cell][0] for cell in places},
+                             {self.cell_units[cell][1] for cell in places})
+                else:
+                    lines = ({self.cell_units[cell][2] for cell in places},)
+
+                for line in lines:
+                    if len(line) == 1:
+                        other_unit = line.pop()
+                        eliminations = [(cell, value) for cell in self.units[other_unit]
+                                        if cell not in unit_cells and self.cells[cell] == 0
+                                        and self.candidates[cell] & bit]
+
+                        if eliminations:
+                            return eliminations
+            return []
+
+        count = 2 if technique.endswith("Pair") else 3
+
+        if technique.startswith("Naked"):  # count spots share count candidates, others in the unit lose them.
+            options = [cell for cell in empty if 2 <= bin(self.candidates[cell]).count("1") <= count]
+
+            for group in itertools.combinations(options, count):
+                mask = 0
+
+                for cell in group:
+                    mask |= self.candidates[cell]
+
+                if bin(mask).count("1") != count:
+                    continue
+
+                eliminations = [(cell, value) for cell in empty if cell not in group
+                                for value in range(1, total_row + 1)
+                                if self.candidates[cell] & mask & (1 << (value - 1))]
+
+                if eliminations:
+                    return eliminations
+            return []
+
+        # Hidden: count values only fit in the same count spots, those spots lose their other candidates.
+        value_places = {}
+
+        for value in range(1, total_row + 1):
+            if 2 <= self.places[unit * total_row + value - 1] <= count:
+                value_places[value] = frozenset(cell for cell in empty if self.candidates[cell] & (1 << (value - 1)))
+
+        for group in itertools.combinations(value_places, count):
+            cells = frozenset().union(*(value_places[value] for value in group))
+
+            if len(cells) != count:
+                continue
+
+            keep = sum(1 << (value - 1) for value in group)
+
+            eliminations = [(cell, value) for cell in cells
+                            for value in range(1, total_row + 1) if self.candidates[cell] & ~keep & (1 << (value - 1))]
+
+            if eliminations:
+                return eliminations
+        return []
+
+    def check_x_wing(self):  # Value with 2 places in each of two rows, in the same two columns (or the other way).
+        total_row = self.total_row
+
+        for value in range(1, total_row + 1):
+            bit = 1 << (value - 1)
+
+            for base, cover in ((0, 1), (1, 0)):  # Rows and columns, then columns and rows.
+                pairs = {}
+
+                for line in range(total_row):
+                    unit = base * total_row + line
+
+                    if self.places[unit * total_row + value - 1] != 2:
+                        continue
+
+                    places = self.unit_places(unit, bit)
+                    key = tuple(self.cell_units[cell][cover] for cell in places)
+
+                    if key in pairs:
+                        wing = set(places) | set(pairs[key])
+
+                        eliminations = [(cell, value) for cover_unit in key for cell in self.units[cover_unit]
+                                        if cell not in wing and self.candidates[cell] & bit]
+
+                        if eliminations:
+                            return eliminations
+                    else:
+                        pairs[key] = places
+        return []
+
+
+def grade(grid):  # Return (difficulty, hardest technique, techniques used in order) of a puzzle.
+    # Difficulty is "expert" and the hardest technique is None when the techniques above can't finish the puzzle.
+    human = HumanSolver(len(grid), grid)
+    trace = []
+
+    while human.solved() is False:
+        step = human.find_step()
+
+        if step is None:
+            return "expert", None, trace
+
+        human.apply(step)
+        trace.append(step[0])
+
+    names = [name for name, _ in TECHNIQUES]
+    hardest = max(trace, key=names.index, default=None)
+
+    return TECHNIQUE_DIFFICULTY.get(hardest, "easy"), hardest, trace
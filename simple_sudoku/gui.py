@@ -0,0 +1,1074 @@
+# Tkinter GUI, can be used to solve Sudoku or create random Sudoku to play.
+import collections
+import os
+import queue
+import sys
+import threading
+import time
+import tkinter
+from concurrent.futures import ThreadPoolExecutor
+
+from .bank import BANK_SIZES, DEFAULT_PATH, BankFiller, PuzzleBank
+from .conflicts import INVALID, ConflictTracker
+from .hints import HintEngine
+from .journal import SESSION_PATH
+from .sudoku import Sudoku
+from .topology import get_topology
+
+
+class RenderScheduler:  # Collects widget changes and draws them together once Tk is idle, on the Tk thread.
+    def __init__(self, window, report=None):
+        # report: stream that gets the time of every frame and the average of the last ones (GUI debug=True).
+        self.window = window
+        self.report = report
+
+        # Targets are widgets or (canvas, item) pairs for items drawn on a canvas.
+        self.pending = {}  # Widget: options to apply in the next flush.
+        self.shown = {}  # Widget: options as last applied, unchanged options are never sent to Tk again.
+        self.scheduled = False
+
+        self.batch_start = None  # Time of the first change of the current batch.
+        self.frame_times = collections.deque(maxlen=100)  # Seconds from first change to everything drawn.
+
+    def set(self, widget, **options):  # Ask for widget (or canvas item) to look like options, drawn in the next flush.
+        if self.scheduled is False:
+            self.scheduled = True
+            self.batch_start = time.perf_counter()
+            self.window.after_idle(self.flush)
+
+        self.pending.setdefault(widget, {}).update(options)
+        return
+
+    def forget(self, widget):  # Call before destroying a widget.
+        self.pending.pop(widget, None)
+        self.shown.pop(widget, None)
+        return
+
+    def flush(self):
+        self.scheduled = False
+
+        pending = self.pending
+        self.pending = {}
+
+        for widget, options in pending.items():
+            shown = self.shown.setdefault(widget, {})
+            changed = {key: value for key, value in options.items() if shown.get(key) != value}
+
+            if changed:
+                if isinstance(widget, tuple):  # Canvas item, changed in place.
+                    widget[0].itemconfigure(widget[1], **changed)
+                else:
+                    widget.configure(**changed)
+                shown.update(changed)
+
+        self.frame_times.append(time.perf_counter() - self.batch_start)
+
+        if self.report is not None:
+            self.report.write(f"Frame of {len(pending)} changes in {self.frame_times[-1] * 1000:.2f} ms, average of "
+                              f"the last {len(self.frame_times)} {self.average_frame_time() * 1000:.2f} ms\n")
+        return
+
+    def average_frame_time(self):  # Average of the last frames in seconds, 0.0 before the first frame.
+        if len(self.frame_times) == 0:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+
+class BoardCanvas:  # Whole board drawn on one Canvas, every spot is a rectangle and a text item changed in place.
+    PAD = 2  # Room for the outer border.
+
+    def __init__(self, master, size, render, cell_size, font, bg, line_color):
+        topology = get_topology(size)
+
+        self.total_row = topology.total_row
+        self.block_row = topology.block_row
+        self.render = render
+        self.cell_size = cell_size
+
+        self.on_click = None  # Called with (row, col) of a clicked spot.
+
+        side = 2 * BoardCanvas.PAD + size * cell_size
+
+        self.canvas = tkinter.Canvas(master, width=side, height=side, bg=bg, highlightthickness=0)
+
+        self.rects = []  # Background of each spot, spots are numbered row * size + col.
+        self.texts = []  # Value of each spot.
+
+        for row, col in topology.coords:
+            x_coord, y_coord = self.corner(row, col)
+
+            self.rects.append(self.canvas.create_rectangle(x_coord, y_coord, x_coord + cell_size, y_coord + cell_size,
+                                                           fill=bg, outline=line_color))
+            self.texts.append(self.canvas.create_text(x_coord + cell_size / 2, y_coord + cell_size / 2, text="",
+                                                      font=font))
+
+        for index in range(0, size + 1, self.block_row):  # Block borders, drawn over the spots.
+            offset = BoardCanvas.PAD + index * cell_size
+
+            self.canvas.create_line(BoardCanvas.PAD, offset, side - BoardCanvas.PAD, offset, width=3, fill=line_color)
+            self.canvas.create_line(offset, BoardCanvas.PAD, offset, side - BoardCanvas.PAD, width=3, fill=line_color)
+
+        self.canvas.bind("<Button-1>", self.click)
+
+    def __repr__(self):
+        return f"<BoardCanvas {self.total_row} x {self.total_row}>"
+
+    def corner(self, row, col):  # Top left corner of a spot.
+        return BoardCanvas.PAD + col * self.cell_size, BoardCanvas.PAD + row * self.cell_size
+
+    def spot_at(self, x_coord, y_coord):  # (row, col) of the spot under a point, None outside the board.
+        row = (y_coord - BoardCanvas.PAD) // self.cell_size
+        col = (x_coord - BoardCanvas.PAD) // self.cell_size
+
+        if 0 <= row < self.total_row and 0 <= col < self.total_row:
+            return row, col
+        return None
+
+    def click(self, event):
+        spot = self.spot_at(event.x, event.y)
+
+        if spot is not None and self.on_click is not None:
+            self.on_click(*spot)
+        return
+
+    def show(self, row, col, text=None, fg=None, bg=None):  # Change the look of a spot, None keeps an option as it is.
+        cell = row * self.total_row + col
+
+        options = {}
+
+        if text is not None:
+            options["text"] = text
+        if fg is not None:
+            options["fill"] = fg
+
+        if options:
+            self.render.set((self.canvas, self.texts[cell]), **options)
+
+        if bg is not None:
+            self.render.set((self.canvas, self.rects[cell]), fill=bg)
+        return
+
+    def clear(self, fg, bg):  # Every spot empty again, the canvas items are kept.
+        for row in range(self.total_row):
+            for col in range(self.total_row):
+                self.show(row, col, text="", fg=fg, bg=bg)
+
+        self.on_click = None
+        return
+
+
+class GUI:  # GUI Class.
+    SEARCH_POLL_MS = 50  # How often the Tk thread looks for messages of a running search.
+    SEARCH_VIEW_INTERVAL = 0.1  # Seconds between copies of the grid being searched, sent to show on the board.
+
+    def __init__(self, size=9, seed=None, debug=False):  # debug=True prints the time of every frame to stderr.
+        self.sudoku = Sudoku(size, seed=seed)  # Create Sudoku, 9 for the classic 9 x 9 board.
+
+        self.difficulty = "hard"  # Difficulty of puzzles in Play mode.
+
+        # Puzzles are made in the background and stored in the bank, so Play mode starts without waiting. The bank
+        # has sections of every size it can hold, only the one played here is filled. Bank puzzles are made without
+        # the seed, so a seeded GUI creates its own puzzles instead.
+        self.bank = None
+        self.bank_filler = None
+
+        if self.sudoku.total_row in BANK_SIZES and seed is None:
+            try:
+                self.bank = PuzzleBank(DEFAULT_PATH)
+            except (OSError, ValueError):  # Bank can't be used, puzzles are made when needed instead.
+                pass
+            else:
+                self.bank_filler = BankFiller(self.bank, keys=[(self.sudoku.total_row, self.difficulty)])
+                self.bank_filler.start()
+
+        self.window = tkinter.Tk()
+
+        self.render = RenderScheduler(self.window, report=sys.stderr if debug is True else None)  # All board updates.
+    
+        # Store all colors and fonts here for easy access.
+        self.window_color = "#B8F9E2"
+        
+        self.frame_color = "#5CEAB9"
+        
+        self.button_color = "#21EC75"
+        self.button_color2 = "#82F4B1"
+        self.button_color3 = "#FFFFFF"
+        self.button_color4 = "#FEF376"
+
+        self.search_color = "#8A8A8A"  # Values tried by a running search.
+        self.hint_color = "#FFC864"  # Spot of the latest hint.
+
+        self.line_color = "#0E9F4A"
+
+        self.start_b_color = "#11FA04"
+        self.reset_b_color = "#FB0606"
+
+        font_family = ["Times", "Helvetica", "Verdana", "Courier"]
+
+        self.frame_font = (font_family[0], 20, 'bold')
+        self.label_font = (font_family[1], 14)
+        self.button_font = (font_family[2], 10, 'bold')
+        self.info_font = (font_family[3], 10)
+
+        self.window.title("Sudoku By JohnnyLPH")
+        self.window.configure(bg=self.window_color)
+
+        # Main Menu.
+        self.info_frame1 = tkinter.LabelFrame(self.window, text="Main Menu", bg=self.frame_color,
+                                              font=self.frame_font)
+        self.info_frame1.grid(row=0, column=1, padx=(5, 10), pady=(10, 5), sticky="news")
+
+        # Info Panel.
+        self.info_frame2 = tkinter.LabelFrame(self.window, text="Info Panel", bg=self.frame_color,
+                                              font=self.frame_font)
+        self.info_frame2.grid(row=1, column=1, rowspan=9, padx=(5, 10), pady=(5, 10), sticky="news")
+        
+        # Sudoku Board.
+        self.game_frame = tkinter.LabelFrame(self.window, text="Sudoku Board", bg=self.frame_color,
+                                             font=self.frame_font)
+        self.game_frame.grid(row=0, column=0, rowspan=10, padx=(10, 5), pady=10)
+
+        # For later use.
+        self.mode = None
+        self.board = None
+        self.info_list = None
+        self.solution_button = None
+        self.select_buttons = None
+        self.spot_index = None
+        self.tracker = None
+        self.dirty_spots = None
+        self.first_spot = None
+        self.changed_spots = None
+        self.win_value = None
+        self.valid_spots_count = None
+        self.invalid_spots_count = None
+        self.solved_sudoku = None
+        self.mark_ending = None
+        self.executor = None
+        self.search_queue = None
+        self.cancel_event = None
+        self.search_start = None
+        self.search_progress = None
+        self.cancel_button = None
+        self.progress_label = None
+        self.undo_button = None
+        self.redo_button = None
+        self.save_button = None
+        self.hint_button = None
+        self.hint_label = None
+        self.hints = None
+        self.hint_spot = None
+        self.hint_search = None  # Future of the solver working out a hint.
+
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.window.bind("<Control-z>", lambda event: self.undo_move())
+        self.window.bind("<Control-y>", lambda event: self.redo_move())
+        self.window.bind("<Control-s>", lambda event: self.save_game())
+        self.window.bind("<Control-h>", lambda event: self.show_hint())
+
+        self.show_mode()  # Show Main Menu.
+        self.show_grid()  # Show Sudoku Board.
+        self.show_info()  # Show Info Panel.
+
+        self.window.update_idletasks()
+        
+        win_width = self.window.winfo_reqwidth()
+        win_height = self.window.winfo_reqheight()
+        screen_width = self.window.winfo_screenwidth()
+        screen_height = self.window.winfo_screenheight()
+        x_coord = int(screen_width / 2 - win_width / 2)
+        y_coord = int(screen_height / 2 - win_height / 2)
+
+        self.window.geometry(f"+{x_coord}+{y_coord}")  # Center the window on the screen.
+        self.window.resizable(0, 0)  # Not resizeable.
+        self.window.mainloop()  # Mainloop.
+
+    def show_mode(self):
+        label_1 = tkinter.Label(self.info_frame1, text="Choose Mode", bg=self.frame_color, font=self.label_font)
+        
+        self.mode = 1  # 1 for Play Sudoku; 2 for Solve Sudoku.
+
+        def choose_mode(mode):
+            if mode == 2:
+                button_1.configure(command=lambda: choose_mode(1), bg=self.button_color2, relief="raised")
+                button_2.configure(bg=self.button_color, relief="sunken")
+            else:
+                button_1.configure(bg=self.button_color, relief="sunken")
+                button_2.configure(command=lambda: choose_mode(2), bg=self.button_color2, relief="raised")
+
+            self.mode = mode
+
+            button_1.grid(row=1, column=0, sticky="n", padx=(5, 1), pady=5)
+            button_2.grid(row=1, column=1, sticky="n", padx=(1, 5), pady=5)
+            return
+        
+        button_1 = tkinter.Button(self.info_frame1, text="Play Sudoku")
+        button_1.configure(bg=self.button_color, activebackground=self.button_color, font=self.button_font,
+                           relief="sunken")
+
+        button_2 = tkinter.Button(self.info_frame1, text="Solve Sudoku", command=lambda: choose_mode(2))
+        button_2.configure(activebackground=self.button_color, font=self.button_font, bg=self.button_color2)
+
+        def resume():  # Continue the saved game, in the mode it was played in.
+            try:
+                self.sudoku.load_session(SESSION_PATH)
+            except (OSError, ValueError):  # Missing, broken or of another board size.
+                resume_button.configure(text="Saved game can't be used", state="disabled")
+                return
+
+            self.mode = 1 if self.sudoku.current_result is not None else 2
+            start_mode(resumed=True)
+
+        def start_mode(resumed=False):  # Start running main stuffs.
+            if resume_button is not None:
+                resume_button.destroy()
+
+            label_1.configure(state="disabled")
+            button_1.configure(state="disabled")
+            button_2.configure(state="disabled")
+
+            label_1.grid(row=0, column=0, columnspan=2, sticky="n")
+            button_1.grid(row=1, column=0, sticky="n", padx=(5, 1), pady=5)
+            button_2.grid(row=1, column=1, sticky="n", padx=(1, 5), pady=5)
+            
+            start_reset_button.configure(text="Reset", command=self.reset)
+            start_reset_button.configure(activebackground=self.start_b_color, bg=self.reset_b_color, fg="white")
+            start_reset_button.grid(row=2, column=0, columnspan=2, padx=5, pady=(5, 0), sticky="we")
+
+            if self.mode == 1:
+                self.play_sudoku(resumed)  # Show non-empty spots first.
+            else:
+                self.update_empty_spots()  # Straight display empty spots.
+
+        start_reset_button = tkinter.Button(self.info_frame1, text="Start", font=self.button_font, command=start_mode)
+        start_reset_button.configure(activebackground=self.reset_b_color, bg=self.start_b_color)
+
+        label_1.grid(row=0, column=0, columnspan=2, sticky="n")
+
+        button_1.grid(row=1, column=0, sticky="n", padx=(5, 1), pady=5)
+        button_2.grid(row=1, column=1, sticky="n", padx=(1, 5), pady=5)
+
+        start_reset_button.grid(row=2, column=0, columnspan=2, padx=5, pady=(5, 0), sticky="we")
+
+        resume_button = None
+
+        if os.path.exists(SESSION_PATH):
+            resume_button = tkinter.Button(self.info_frame1, text="Resume Saved Game", font=self.button_font,
+                                           command=resume)
+            resume_button.configure(activebackground=self.button_color, bg=self.button_color2)
+            resume_button.grid(row=3, column=0, columnspan=2, padx=5, pady=(10, 0), sticky="we")
+        return
+
+    def reset(self):  # Back to the Main Menu without restarting, the window, board and puzzle bank are kept.
+        if self.cancel_event is not None:
+            self.cancel_event.set()  # A running search stops soon, its result is dropped.
+
+        self.search_queue = None  # The poll of a running search stops at its next call.
+
+        for frame in (self.info_frame1, self.info_frame2):
+            self.clear_frame(frame)
+
+        self.board.clear("black", self.button_color3)
+
+        # A search may still be finishing on the old Sudoku, so a new one is made. It carries on with the same random
+        # generator, and the worker processes are kept since searches never run at the same time.
+        old = self.sudoku
+
+        self.sudoku = Sudoku(old.total_row, engine=old.engine, seed=old.seed)
+        self.sudoku.rng = old.rng
+        self.sudoku.portfolio = old.portfolio
+
+        for name in ("mode", "info_list", "solution_button", "select_buttons", "spot_index", "tracker", "dirty_spots",
+                     "first_spot", "changed_spots", "win_value", "valid_spots_count", "invalid_spots_count",
+                     "solved_sudoku", "mark_ending", "cancel_event", "search_start", "search_progress", "cancel_button",
+                     "progress_label", "undo_button", "redo_button", "save_button", "hint_button", "hint_label",
+                     "hints", "hint_spot", "hint_search"):
+            setattr(self, name, None)
+
+        self.show_mode()
+        self.show_info()
+        return
+
+    def clear_frame(self, frame):  # Destroy every widget inside frame, their pending updates are dropped first.
+        for child in frame.winfo_children():
+            self.clear_frame(child)
+            self.render.forget(child)
+            child.destroy()
+        return
+    
+    def show_grid(self):  # One canvas for the whole board, spots are sized so large boards still fit the screen.
+        cell_size = max(28, min(60, 540 // self.sudoku.total_row))
+        font = (self.label_font[0], max(9, cell_size // 4))
+
+        self.board = BoardCanvas(self.game_frame, self.sudoku.total_row, self.render, cell_size, font,
+                                 self.button_color3, self.line_color)
+        self.board.canvas.grid(row=0, column=0, padx=5, pady=5)
+        return
+    
+    def show_info(self):
+        self.info_list = []
+
+        text = "# Choose one mode and click\nStart Button."
+
+        info1 = tkinter.Label(self.info_frame2, text=text, font=self.info_font, bg=self.frame_color)
+        info1.grid(row=0, column=0, sticky="n", padx=1, pady=1)
+
+        self.info_list.append(info1)  # Will be destroyed later.
+        return
+
+    def show_solution(self, first_call=True):  # Show solution of the Sudoku.
+        def get_solution():
+            if self.mode == 2 and self.invalid_spots_count != 0:  # At least one invalid spots that are not empty.
+                return
+            
+            self.solved_sudoku = True  # Set it True to disable all empty spots while finding a solution.
+            
+            self.solution_button.configure(state="disabled")  # Disable solution button while finding a solution.
+            
+            self.solution_button.grid(row=3, column=0, columnspan=2, padx=5, pady=(10, 0), sticky="we")
+            
+            if self.mode == 1:  # Play Mode, already has a solution.
+                self.sudoku.grid = self.sudoku.current_result
+
+                self.mark_ending = True  # Mark as the end of program since there's a solution.
+
+                self.finish_sudoku()  # Show the final info.
+            else:  # Solve Mode, search in the background so the window keeps responding.
+                self.start_search()
+            return
+        
+        if first_call is True:  # First call, create solution button.
+            self.solution_button = tkinter.Button(self.info_frame1, font=self.button_font)
+            self.solution_button.configure(activebackground=self.reset_b_color, bg=self.start_b_color,
+                                           command=get_solution)
+            
+            if self.mode == 1:  # Show.
+                self.solution_button.configure(text="Show Solution")
+            else:  # Find.
+                self.solution_button.configure(text="Find Solution")
+            
+            self.solution_button.grid(row=3, column=0, columnspan=2, padx=5, pady=(10, 0), sticky="we")
+        else:  # Not first call.
+            if self.changed_spots is False:  # First click on an empty spot, disable solution button.
+                self.solution_button.configure(state="disabled")
+            else:  # Only available after changing spots or assigning value.
+                self.solution_button.configure(state="normal")
+
+            self.solution_button.grid(row=3, column=0, columnspan=2, padx=5, pady=(10, 0), sticky="we")
+        return
+    
+    def start_search(self):  # Solve on a worker thread, progress and the result come back through a queue.
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solver")
+
+        self.search_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.search_start = time.perf_counter()
+        self.search_progress = (0, 0)  # Guesses and depth of the last progress message.
+
+        self.cancel_button = tkinter.Button(self.info_frame1, text="Cancel", font=self.button_font, fg="white")
+        self.cancel_button.configure(activebackground=self.start_b_color, bg=self.reset_b_color,
+                                     command=self.cancel_event.set)
+        self.cancel_button.grid(row=6, column=0, columnspan=2, padx=5, pady=(5, 0), sticky="we")
+
+        self.progress_label = tkinter.Label(self.info_frame1, font=self.info_font, bg=self.frame_color, justify="left")
+        self.progress_label.grid(row=7, column=0, columnspan=2, padx=5, pady=(5, 0), sticky="w")
+
+        search_queue = self.search_queue  # The worker only ever touches the queue, never Tk.
+        last_view = [0.0]
+
+        def progress(guesses, depth, cells):  # Runs on the worker thread every few hundred guesses.
+            now = time.perf_counter()
+
+            if now - last_view[0] >= GUI.SEARCH_VIEW_INTERVAL:  # Throttled, so the search is barely slowed.
+                last_view[0] = now
+                search_queue.put(("progress", guesses, depth, list(cells)))
+
+        future = self.executor.submit(self.sudoku.solve_cached, stop=self.cancel_event.is_set, progress=progress)
+        future.add_done_callback(lambda c_future: search_queue.put(("done", c_future)))
+
+        self.update_journal_buttons()
+        self.window.after(GUI.SEARCH_POLL_MS, self.poll_search, search_queue)
+        return
+
+    def poll_search(self, search_queue):  # Runs on the Tk thread until the search is over.
+        if search_queue is not self.search_queue:  # Reset since the search started, the result is dropped.
+            return
+
+        finished = None
+        view = None
+
+        while True:
+            try:
+                message = search_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if message[0] == "progress":
+                self.search_progress = message[1:3]
+                view = message[3]  # Only the latest view is drawn.
+            else:
+                finished = message[1]
+
+        if finished is not None:
+            self.end_search(finished.result())  # Errors of the search are raised here, on the Tk thread.
+            return
+
+        elapsed = time.perf_counter() - self.search_start
+        guesses, depth = self.search_progress
+
+        text = f"# Searching...\n# Nodes/s: {guesses / elapsed:.0f}\n# Depth: {depth}\n# Elapsed: {elapsed:.1f} s"
+
+        if self.cancel_event.is_set():
+            text = f"# Cancelling...\n# Elapsed: {elapsed:.1f} s"
+
+        self.render.set(self.progress_label, text=text)
+
+        if view is not None:  # Show the values the search is trying in the empty spots.
+            for row, col in self.spot_index:
+                value = view[row * self.sudoku.total_row + col]
+                self.board.show(row, col, text=value if value != 0 else "", fg=self.search_color)
+
+        self.window.after(GUI.SEARCH_POLL_MS, self.poll_search, search_queue)
+        return
+
+    def end_search(self, solved):  # Back on the Tk thread with the result of the search.
+        for widget in (self.cancel_button, self.progress_label):
+            self.render.forget(widget)
+            widget.destroy()
+
+        self.dirty_spots.update(self.spot_index)  # The search view drew over every empty spot.
+
+        if self.sudoku.cancelled is True:  # Cancelled, the board can be changed again.
+            self.solved_sudoku = False
+
+            self.update_empty_spots(False)
+            self.show_solution(False)
+            self.update_journal_buttons()
+            return
+
+        if solved is True:  # Has a solution.
+            self.mark_ending = True  # Mark as the end of program since there's a solution.
+        else:
+            self.update_empty_spots(False)  # Remove the search view.
+
+        self.finish_sudoku()  # Show the final info.
+        return
+
+    def close(self):  # Window closed, a running search is cancelled so the program can exit.
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+
+        self.window.destroy()
+        return
+
+    def finish_sudoku(self):  # Show final info to end the program.
+        self.update_journal_buttons()  # No more moves, a solution or the result of a search is shown.
+
+        for row in range(self.sudoku.block_row):
+            for col in range(self.sudoku.block_row):
+                self.render.forget(self.select_buttons[row][col])  # Drop updates not drawn yet.
+                self.select_buttons[row][col].destroy()  # Destroy all select buttons.
+
+        for info in self.info_list:
+            self.render.forget(info)  # Drop updates not drawn yet (e.g. of the hint).
+            info.destroy()  # Destroy all current info.
+        
+        self.window.update_idletasks()
+
+        if self.solved_sudoku is True:  # First condition. Should always be True if this function is called.
+            end1 = tkinter.Label(self.info_frame2, font=self.info_font, bg=self.frame_color)
+            
+            if self.mark_ending is True:  # Second condition. There's definitely a solution.
+                end1.configure(text="# Sudoku is solved!")
+
+                if self.valid_spots_count == self.win_value:  # Solved by player.
+                    self.solution_button.configure(state="disabled")  # Disable solution button.
+
+                    self.solution_button.grid(row=3, column=0, columnspan=2, padx=5, pady=(10, 0), sticky="we")
+                else:  # Solved by computer.
+                    self.load_board()  # Display the solution.
+                    self.update_empty_spots(False)
+            else:  # No solution available.
+                end1.configure(text="# Sudoku cannot be solved!")
+
+            end1.grid(row=0, column=0, sticky="news", padx=1, pady=1)
+
+            end2 = tkinter.Label(self.info_frame2, font=self.info_font, bg=self.frame_color)
+            end2.configure(text="# Click Reset Button to\nrestart or close window to\nterminate program.")
+
+            end2.grid(row=1, column=0, sticky="news", padx=1, pady=1)
+
+            if self.mark_ending is False:  # No solution. Create extra button to try again.
+                def try_again():
+                    end1.destroy()
+                    end2.destroy()
+                    end3.destroy()
+
+                    self.window.update_idletasks()
+
+                    self.solved_sudoku = False  # Set to False so now all empty spots are available again.
+
+                    self.assign_value()  # Display old info again.
+                    self.show_solution(False)  # Enable the solution button.
+                    self.update_journal_buttons()
+                    return
+                
+                end3 = tkinter.Button(self.info_frame2,  bg=self.button_color2, activebackground=self.button_color)
+                end3.configure(text="Try Again", font=self.button_font)
+                end3.configure(command=try_again)
+                end3.grid(row=2, column=0, padx=5, pady=5, sticky="n")
+        return
+    
+    def assign_value(self, first_call=True):  # Assign value to spot and display info.
+        def make_value_change(value):
+            self.changed_spots = True  # Equivalent to changing spots.
+            
+            self.make_move([(self.first_spot[0], self.first_spot[-1], value)])  # Assign value to the spot.
+
+            self.refresh_after_move()
+            return
+        
+        def control_select_buttons(b_row, b_col, state):  # Easier to disable and enable select buttons.
+            self.render.set(self.select_buttons[b_row][b_col], state=state)
+
+        if self.changed_spots is False or first_call is True:  # First click or first call.
+            if first_call is True:  # First call, display all info needed.
+                if len(self.info_list) == 1:  # Only if it's the very first call.
+                    self.info_list[0].destroy()  # Destroy before displaying other info.
+                
+                self.info_list = []
+                
+                first_info = tkinter.Label(self.info_frame2, font=self.info_font, bg=self.frame_color)
+                first_info.configure(text="# Double-click: Empty Spot")
+                first_info.grid(row=0, column=0, sticky="n", padx=1, pady=1)
+
+                self.info_list.append(first_info)
+
+                text = "# Select Two: Switch Spots"
+                second_info = tkinter.Label(self.info_frame2, text=text, font=self.info_font, bg=self.frame_color)
+                second_info.grid(row=1, column=0, sticky="n", padx=1, pady=1)
+                
+                self.info_list.append(second_info)
+
+                text2 = "# Assign Value:"
+                select_value_label = tkinter.Label(self.info_frame2, text=text2, font=self.info_font,
+                                                   bg=self.frame_color)
+                select_value_label.grid(row=2, column=0, sticky="n", padx=1, pady=1)
+
+                self.info_list.append(select_value_label)
+
+                inner_select_frame = tkinter.LabelFrame(self.info_frame2, bg=self.button_color)  # Select buttons frame.
+                inner_select_frame.grid(row=3, column=0, sticky="n", padx=(2, 0), pady=1)
+
+                self.info_list.append(inner_select_frame)
+
+                value_list = [num + 1 for num in range(self.sudoku.total_row)]  # Values that can be assigned.
+                
+                self.select_buttons = []
+
+                value_index = -1
+                
+                for row in range(self.sudoku.block_row):
+                    row_buttons = []
+                    
+                    for col in range(self.sudoku.block_row):
+                        value_index += 1
+                        
+                        select_button = tkinter.Button(inner_select_frame, width=5, height=3, bg=self.button_color3)
+                        
+                        select_button.configure(activebackground=self.button_color4, relief='flat')
+                        select_button.configure(text=value_list[value_index], font=self.button_font, state="disabled")
+                        select_button.configure(command=lambda value=value_list[value_index]: make_value_change(value))
+                        
+                        select_button.grid(row=row, column=col, padx=1, pady=1, sticky="news")
+
+                        row_buttons.append(select_button)
+                    
+                    self.select_buttons.append(row_buttons)
+            else:  # First click. Make value selection be available.
+                for row in range(self.sudoku.block_row):
+                    for col in range(self.sudoku.block_row):
+                        control_select_buttons(row, col, "normal")
+        else:  # Second click or after assigning value.
+            for row in range(self.sudoku.block_row):
+                for col in range(self.sudoku.block_row):
+                    control_select_buttons(row, col, "disabled")
+        return
+
+    def update_empty_spots(self, first_call=True):  # Display and update empty spots as buttons.
+        if first_call is True:  # First call, create all things needed for later use.
+            self.spot_index = {}  # (row, col): index of the empty spot.
+
+            # Value counts of every row, column and block. A move only rechecks the spots sharing a unit with it and
+            # the spots whose value or state changed are collected in dirty_spots to be drawn again.
+            self.tracker = ConflictTracker(self.sudoku.total_row, self.sudoku.grid, self.sudoku.empty_spots)
+            self.dirty_spots = set()
+
+            # Candidates for hints, kept up to date move by move like the tracker.
+            self.hints = HintEngine(self.sudoku.total_row, self.sudoku.puzzle(), self.sudoku.current_result)
+
+            for row, col in self.sudoku.empty_spots:  # Values of a resumed game.
+                if self.sudoku.grid[row, col] != 0:
+                    self.hints.set(row, col, self.sudoku.grid[row, col])
+
+            self.hint_spot = None
+            
+            self.first_spot = None  # Store position of first spot for assigning value.
+
+            # Used while resetting values of first spot and second spot or assigning value to first spot.
+            self.changed_spots = False
+            
+            self.win_value = len(self.sudoku.empty_spots)  # Used to determine if the Sudoku is solved by player.
+
+            self.valid_spots_count = 0  # Count number of valid spots and used to compare with self.win_value.
+            self.invalid_spots_count = 0  # Count number of invalid spots that are not empty.
+
+            self.solved_sudoku = False  # True if all spots are valid or the computer is searching for a solution.
+
+            self.mark_ending = False  # Mark the end of program. Click reset button to start again.
+
+        def update_each_empty(empty):  # Update value of spot.
+            # Solved the Sudoku or still searching for solution, make all buttons useless now.
+            if self.solved_sudoku is True:
+                return
+            
+            if self.changed_spots is True:  # Changed spots pr assigned a value, empty stored position.
+                self.first_spot = None
+                self.changed_spots = False
+            
+            if self.first_spot is None:  # First click.
+                self.first_spot = empty  # Store first spot.
+            else:  # Second click.
+                row, col = empty[0], empty[-1]  # Position of second spot.
+                second_num = self.sudoku.grid[row, col]  # Value of second spot.
+
+                if empty == self.first_spot:  # Double-click on same spot. Empty the spot.
+                    self.make_move([(row, col, 0)])
+                else:  # Exchange values, undone as one move.
+                    first_num = self.sudoku.grid[self.first_spot[0], self.first_spot[-1]]  # Value of first spot.
+
+                    self.make_move([(row, col, first_num), (self.first_spot[0], self.first_spot[-1], second_num)])
+                
+                self.changed_spots = True  # Mark the changing of spots.
+
+            self.refresh_after_move()
+            return
+        
+        def show_each_empty(empty_spot_index, empty):  # Display spots.
+            row, col = empty[0], empty[-1]
+
+            if self.sudoku.grid[row, col] == 0:
+                text = ""  # Display nothing.
+            else:
+                text = self.sudoku.grid[row, col]
+
+            # Spots of a new puzzle are all empty, a resumed game may already have values and conflicts.
+            state = self.tracker.state(row * self.sudoku.total_row + col)
+
+            if first_call is True:  # First call. Show all empty spots.
+                self.board.show(row, col, text=text, fg="red" if state == INVALID else "black", bg=self.button_color3)
+
+                self.spot_index[(row, col)] = empty_spot_index
+                return
+
+            # Not first call, only the wanted look of the spot is given to the render scheduler, which skips the
+            # canvas items that already look like that.
+            color = "red" if state == INVALID else "black"  # Invalid spot, change foreground to red color.
+
+            self.board.show(row, col, text=text, fg=color, bg=self.button_color3)
+            return
+
+        def click_spot(row, col):  # Clicks on the board, spots that are not empty spots are ignored.
+            if (row, col) in self.spot_index:
+                update_each_empty([row, col])
+            return
+
+        # Everything runs on the Tk thread, Tk widgets must never be touched from other threads.
+        if first_call is True:
+            for index, spot in enumerate(self.sudoku.empty_spots):  # Loop through all empty spots.
+                show_each_empty(index, list(spot))
+
+            self.board.on_click = click_spot
+
+            self.valid_spots_count = self.tracker.valid_count
+            self.invalid_spots_count = self.tracker.invalid_count
+        elif self.first_spot is not None and self.changed_spots is False:  # First click, assigning value.
+            self.board.show(self.first_spot[0], self.first_spot[-1], bg=self.button_color4)
+        else:  # Only spots whose value or state changed since the last time are drawn again.
+            if self.first_spot is not None:
+                self.dirty_spots.add(tuple(self.first_spot))  # Remove the highlight of the first spot.
+
+            if self.hint_spot is not None:
+                self.dirty_spots.add(self.hint_spot)  # Remove the highlight of the hint.
+                self.hint_spot = None
+
+            dirty_spots = self.dirty_spots
+            self.dirty_spots = set()
+
+            for spot in dirty_spots:
+                if spot in self.spot_index:  # Clues never change.
+                    show_each_empty(self.spot_index[spot], list(spot))
+
+            self.valid_spots_count = self.tracker.valid_count
+            self.invalid_spots_count = self.tracker.invalid_count
+
+        if first_call is True:  # First call. Prepare info. Display solution, undo, redo and save buttons.
+            self.assign_value()
+            self.show_solution()
+            self.show_journal_buttons()
+        elif self.first_spot is None or self.changed_spots is True:
+            # Sudoku is solved by player.
+            if self.win_value == self.valid_spots_count and self.invalid_spots_count == 0:
+                if self.mark_ending is False:
+                    self.solved_sudoku = True
+
+                    self.mark_ending = True
+
+                    self.finish_sudoku()  # Display final info.
+        return
+
+    def make_move(self, moves):  # Set (row, col, value) of each move, recorded as one step of undo.
+        for row, col, value in self.sudoku.make_move(moves):
+            self.set_spot(row, col, value)
+        return
+
+    def undo_move(self):  # Ctrl+Z, only the spots the move changed are tracked and drawn again.
+        if self.can_change_spots():
+            for row, col, value in self.sudoku.undo():
+                self.set_spot(row, col, value)
+
+            self.after_journal_move()
+        return
+
+    def redo_move(self):  # Ctrl+Y.
+        if self.can_change_spots():
+            for row, col, value in self.sudoku.redo():
+                self.set_spot(row, col, value)
+
+            self.after_journal_move()
+        return
+
+    def after_journal_move(self):  # Same as the end of a move by clicking, any selected spot is dropped.
+        if self.first_spot is not None:
+            self.dirty_spots.add(tuple(self.first_spot))  # Remove the highlight of the first spot.
+
+        self.first_spot = None
+        self.changed_spots = True
+
+        self.refresh_after_move()
+        return
+
+    def can_change_spots(self):  # False before Start, while searching and once the game is over.
+        return self.spot_index is not None and self.solved_sudoku is False
+
+    def save_game(self):  # Ctrl+S, the game can be resumed from the Main Menu later.
+        if self.spot_index is None or self.mark_ending is True:
+            return
+
+        try:
+            self.sudoku.save_session(SESSION_PATH)
+        except OSError:
+            self.render.set(self.save_button, text="Can't Save Game")
+        else:
+            self.render.set(self.save_button, text="Game Saved")
+        return
+
+    def show_journal_buttons(self):  # Undo and Redo side by side, Save Game below them.
+        self.undo_button = tkinter.Button(self.info_frame1, text="Undo", font=self.button_font,
+                                          command=self.undo_move)
+        self.redo_button = tkinter.Button(self.info_frame1, text="Redo", font=self.button_font,
+                                          command=self.redo_move)
+        self.save_button = tkinter.Button(self.info_frame1, text="Save Game", font=self.button_font,
+                                          command=self.save_game)
+        self.hint_button = tkinter.Button(self.info_frame1, text="Hint", font=self.button_font,
+                                          command=self.show_hint)
+
+        for button in (self.undo_button, self.redo_button, self.save_button, self.hint_button):
+            button.configure(activebackground=self.button_color, bg=self.button_color2)
+
+        self.undo_button.grid(row=4, column=0, padx=(5, 1), pady=(5, 0), sticky="we")
+        self.redo_button.grid(row=4, column=1, padx=(1, 5), pady=(5, 0), sticky="we")
+        self.save_button.grid(row=5, column=0, padx=(5, 1), pady=(5, 0), sticky="we")
+        self.hint_button.grid(row=5, column=1, padx=(1, 5), pady=(5, 0), sticky="we")
+
+        self.update_journal_buttons()
+        return
+
+    def update_journal_buttons(self):
+        if self.undo_button is None:
+            return
+
+        can_change = self.can_change_spots()
+
+        self.render.set(self.undo_button, state="normal" if can_change and self.sudoku.journal.can_undo else "disabled")
+        self.render.set(self.redo_button, state="normal" if can_change and self.sudoku.journal.can_redo else "disabled")
+        self.render.set(self.save_button, text="Save Game", state="normal" if self.mark_ending is False else "disabled")
+        self.render.set(self.hint_button, state="normal" if can_change else "disabled")
+        return
+
+    def show_hint(self):  # Ctrl+H, highlight the spot of the next value and tell how it can be found.
+        if self.can_change_spots() is False:
+            return
+
+        hint = self.hints.hint()  # Only the moves since the last hint are worked out again.
+
+        if hint is None:
+            text = "# No hint, some values\nclash with each other."
+        elif hint.value is None:  # No solution known, the solver runs on the worker thread and the hint comes after.
+            text = "# Hint: searching..."
+            self.start_hint_search()
+        else:
+            spot = (hint.row, hint.col)
+            text = f"# Hint: {hint.value} at row {hint.row + 1},\ncolumn {hint.col + 1}.\n# {hint.technique}"
+
+            if hint.technique == "Mistake":
+                text = f"# Hint: row {hint.row + 1}, column\n{hint.col + 1} should be {hint.value}."
+
+            if hint.eliminations:
+                text += f"\n# After: {', '.join(dict.fromkeys(hint.eliminations))}"
+
+            if self.hint_spot is not None and self.hint_spot != spot:  # Hint of a resumed or changed board.
+                self.board.show(*self.hint_spot, bg=self.button_color3)
+                self.hint_spot = None
+
+            if self.first_spot is None or self.changed_spots is True:  # Keep the look of a selected spot.
+                self.board.show(hint.row, hint.col, bg=self.hint_color)
+                self.hint_spot = spot
+
+        if self.hint_label is None or self.hint_label.winfo_exists() == 0:  # First hint, or the info was redone.
+            self.hint_label = tkinter.Label(self.info_frame2, font=self.info_font, bg=self.frame_color,
+                                            justify="left")
+            self.hint_label.grid(row=4, column=0, sticky="w", padx=1, pady=(5, 1))
+
+            self.info_list.append(self.hint_label)  # Destroyed with the other info.
+
+        self.render.set(self.hint_label, text=text)
+        return
+
+    def start_hint_search(self):  # Solve the board for hints on the worker thread, show_hint runs again when done.
+        if self.hint_search is not None:  # Already searching.
+            return
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solver")
+
+        hints = self.hints
+        cells = hints.board()
+
+        self.hint_search = self.executor.submit(HintEngine.search, self.sudoku.total_row, cells)
+        self.window.after(GUI.SEARCH_POLL_MS, self.poll_hint_search, hints, cells)
+        return
+
+    def poll_hint_search(self, hints, cells):  # Runs on the Tk thread until the search for hints is over.
+        if hints is not self.hints:  # Reset since the search started, the result is dropped.
+            return
+
+        if self.hint_search.done() is False:
+            self.window.after(GUI.SEARCH_POLL_MS, self.poll_hint_search, hints, cells)
+            return
+
+        solution = self.hint_search.result()
+        self.hint_search = None
+
+        hints.search_done(cells, solution)  # Kept for the hints after this one, while the board agrees with it.
+        self.show_hint()
+        return
+
+    def set_spot(self, row, col, value):  # Change the value of an empty spot and track the spots it affects.
+        self.sudoku.grid[row, col] = value
+
+        self.dirty_spots.add((row, col))
+        self.dirty_spots.update(self.tracker.set(row, col, value))
+        self.hints.set(row, col, value)
+        return
+
+    def load_board(self):  # Track every empty spot again after the whole grid was replaced (e.g. by a solution).
+        for row, col in self.sudoku.empty_spots:
+            value = self.sudoku.grid[row, col]
+
+            if self.tracker.value(row, col) != value:
+                self.dirty_spots.add((row, col))
+                self.dirty_spots.update(self.tracker.set(row, col, value))
+        return
+
+    def refresh_after_move(self):  # Update buttons after a click, the board goes last since it may end the game.
+        self.assign_value(False)
+        self.show_solution(False)
+        self.update_empty_spots(False)
+        self.update_journal_buttons()
+        return
+
+    def take_puzzle(self):  # Load a puzzle from the bank, False if it has none of this size and difficulty.
+        if self.bank is None:
+            return False
+
+        stored = self.bank.take(self.sudoku.total_row, self.difficulty)
+
+        self.bank_filler.wake()  # Refill what was taken.
+
+        if stored is None:
+            return False
+
+        self.sudoku.load_puzzle(*stored)
+        return True
+
+    def play_sudoku(self, resumed=False):  # Play mode selected, display non-empty spots.
+        if resumed is True or self.take_puzzle() is True:  # A resumed game already has its puzzle.
+            self.show_puzzle()
+        else:
+            self.start_create()  # Shown once it's made.
+        return
+
+    def show_puzzle(self):
+        # Display non-empty spots first in the game frame, color is different from empty spots.
+        for row, col in self.sudoku.non_empty_spots:
+            self.board.show(row, col, text=self.sudoku.grid[row, col], fg="black", bg=self.window_color)
+
+        self.update_empty_spots()  # Display empty spots.
+        return
+
+    def start_create(self):  # Create a puzzle on the worker thread, like a search, the window stays responsive.
+        # Bigger boards take seconds (25 x 25 is never in the bank). The board can't be clicked until it is shown, as
+        # the empty spots are only set up by show_puzzle.
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solver")
+
+        self.search_queue = queue.Queue()
+        self.search_start = time.perf_counter()
+
+        self.progress_label = tkinter.Label(self.info_frame1, font=self.info_font, bg=self.frame_color, justify="left")
+        self.progress_label.grid(row=7, column=0, columnspan=2, padx=5, pady=(5, 0), sticky="w")
+
+        search_queue = self.search_queue
+
+        future = self.executor.submit(self.sudoku.create_sudoku_puzzle)
+        future.add_done_callback(lambda c_future: search_queue.put(("done", c_future)))
+
+        self.poll_create(search_queue)
+        return
+
+    def poll_create(self, search_queue):  # Runs on the Tk thread until the puzzle is made.
+        if search_queue is not self.search_queue:  # Reset since, the puzzle is dropped.
+            return
+
+        try:
+            finished = search_queue.get_nowait()[1]
+        except queue.Empty:
+            elapsed = time.perf_counter() - self.search_start
+
+            self.render.set(self.progress_label, text=f"# Creating puzzle...\n# Elapsed: {elapsed:.1f} s")
+            self.window.after(GUI.SEARCH_POLL_MS, self.poll_create, search_queue)
+            return
+
+        self.render.forget(self.progress_label)
+        self.progress_label.destroy()
+        self.progress_label = None
+
+        if finished.result() is True:  # Errors of creating are raised here, on the Tk thread.
+            self.show_puzzle()
+        else:  # No solution to make a puzzle from, back to the Main Menu so Start can be clicked again.
+            self.reset()
+            self.info_list[0].configure(text="# Could not create a puzzle.\nChoose one mode and click\nStart Button.")
+        return
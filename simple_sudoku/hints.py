@@ -0,0 +1,152 @@
+# Hints for the player, the next value a person could find from the board as it is, and the technique that finds it.
+import collections
+
+from .bitmask import BitmaskSolver
+from .grader import HumanSolver
+
+# technique: "Mistake" when the player's value differs from the known solution, "Search" when no technique of the
+# grader finds a value and the solver had to be used, otherwise a technique of grader.TECHNIQUES. eliminations are
+# the techniques that removed candidates before the value could be found, in order. A "Search" hint with value None
+# means no solution is known yet: run HintEngine.search on board() (off the Tk thread) and give it to search_done().
+Hint = collections.namedtuple("Hint", ("row", "col", "value", "technique", "eliminations"))
+
+
+class HintEngine:  # Keeps the candidates of the board between moves, a hint after a move only pays for the change.
+    # IMPORTANT:
+    #   base holds the clues only and never changes, state is the board with the player's values. Filling an empty
+    #   spot is one place() on state, and candidates removed while finding earlier hints stay removed, since more
+    #   values only ever rule out more. Emptying or changing a value can bring candidates back, so state is then
+    #   copied from base again (list copies, no solving) and the player's values are placed on it.
+    #   Without a known solution, a solution found by a search is kept as long as every value of the player agrees
+    #   with it. Emptying a value never breaks it, so only a value that differs from it needs a new search.
+    def __init__(self, size, puzzle, solution=None):  # Grids are lists of rows, solution None when not known.
+        self.total_row = int(size)
+
+        self.base = HumanSolver(self.total_row, puzzle)
+        self.state = self.base.copy()
+
+        self.solution = None if solution is None else [int(value) for row in solution for value in row]
+        self.found = None  # Flat solution of an earlier search, kept while the player's values agree with it.
+        self.unsolvable = False  # True when a search found no solution for the board as it is.
+
+        self.values = {}  # Spot: value the player put there.
+        self.stale = False  # True after a value was emptied or changed, state is rebuilt on the next hint.
+        self.last = None  # Hint given for the board as it is, None after any change.
+
+    def __repr__(self):
+        return f"<HintEngine {self.total_row} x {self.total_row}, {len(self.values)} values>"
+
+    def set(self, row, col, value):  # The player changed a spot, 0 empties it.
+        cell = row * self.total_row + col
+        old = self.values.get(cell, 0)
+
+        if old == value:
+            return
+
+        self.last = None
+        self.unsolvable = False
+
+        if value != 0 and self.found is not None and self.found[cell] != value:
+            self.found = None  # The board left the solution found earlier.
+
+        if value == 0:
+            del self.values[cell]
+        else:
+            self.values[cell] = value
+
+        if old == 0 and self.stale is False:
+            self.state.place(cell, value)  # Peers lose value, nothing else is looked at.
+        else:
+            self.stale = True
+        return
+
+    def rebuild(self):
+        self.state = self.base.copy()
+
+        for cell, value in self.values.items():
+            self.state.place(cell, value)
+
+        self.stale = False
+        return
+
+    def hint(self):  # Return a Hint, or None when the board is full or broken and no solution is known.
+        if self.last is not None:
+            return self.last
+
+        if self.stale is True:
+            self.rebuild()
+
+        self.last = self.find_hint()
+        return self.last
+
+    def find_hint(self):
+        total_row = self.total_row
+
+        if self.solution is not None:
+            for cell, value in sorted(self.values.items()):
+                if value != self.solution[cell]:
+                    return Hint(*divmod(cell, total_row), self.solution[cell], "Mistake", ())
+
+        state = self.state
+        eliminations = []
+
+        while state.solved() is False:
+            step = state.find_step()
+
+            if step is None:
+                return self.search_hint()
+
+            technique, placements, removed = step
+
+            if placements:  # Left for the player to fill, state only changes when they do.
+                cell, value = placements[0]
+                return Hint(*divmod(cell, total_row), value, technique, tuple(eliminations))
+
+            state.apply(step)  # Removed candidates stay removed for the hints after this one.
+            eliminations.append(technique)
+        return None
+
+    def search_hint(self):  # Value of the empty spot with the fewest candidates, from a known or found solution.
+        total_row = self.total_row
+        state = self.state
+        known = self.solution if self.solution is not None else self.found
+
+        if known is None and (state.broken is True or self.unsolvable is True):
+            return None
+
+        empty = [cell for cell in range(total_row * total_row) if state.cells[cell] == 0]
+
+        if len(empty) == 0:
+            return None
+
+        cell = min(empty, key=lambda c_cell: bin(state.candidates[c_cell]).count("1"))
+
+        if known is not None:
+            return Hint(*divmod(cell, total_row), known[cell], "Search", ())
+        return Hint(*divmod(cell, total_row), None, "Search", ())  # A search is needed first.
+
+    def board(self):  # Flat values of the clues and the player, for search.
+        cells = list(self.base.cells)
+
+        for cell, value in self.values.items():
+            cells[cell] = value
+        return cells
+
+    @staticmethod
+    def search(size, cells):  # Flat solution of flat cells, None if there's none. Safe on any thread.
+        solutions = BitmaskSolver(size).solve([cells[row * size:(row + 1) * size] for row in range(size)], limit=1)
+
+        if len(solutions) == 0:
+            return None
+        return [value for row in solutions[0] for value in row]
+
+    def search_done(self, cells, solution):  # Result of search(board()), the board may have changed since.
+        if solution is None:
+            self.unsolvable = cells == self.board()  # A changed board may have a solution.
+        elif all(solution[cell] == value for cell, value in self.values.items()):
+            self.found = solution
+        else:
+            return
+
+        self.last = None
+        return
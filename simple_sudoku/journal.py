@@ -0,0 +1,151 @@
+# Undo / redo of moves and saved games. A move is a tuple of (spot, old value, new value) changes, so undoing or
+# redoing touches only the spots it changed.
+import os
+import struct
+
+# File layout:
+#   Header: magic, version, size, 1 if a solution is stored.
+#   Grids: puzzle (clues only), solution (if stored) and current values, one byte per spot.
+#   Journal: number of moves done and undone, then every move as its number of changes and the changes.
+HEADER = struct.Struct("<4sHBB")
+COUNTS = struct.Struct("<II")
+MOVE = struct.Struct("<H")  # Changes of a move, which may set every spot of a 25 x 25 board.
+CHANGE = struct.Struct("<HBB")  # Spot (row * size + col), old value, new value.
+MAGIC = b"SDKS"
+VERSION = 2  # 1 held the changes of a move in one byte, so moves of 256 or more couldn't be saved.
+
+SESSION_PATH = os.path.join(os.path.expanduser("~"), ".simple_sudoku_session")  # Game saved by the GUI.
+
+
+class MoveJournal:  # Moves done and undone, undo and redo are O(1) list pops.
+    __slots__ = ("done", "undone")
+
+    def __init__(self):
+        self.done = []
+        self.undone = []  # Latest undone move last, cleared by any new move.
+
+    def __repr__(self):
+        return f"<MoveJournal {len(self.done)} done, {len(self.undone)} undone>"
+
+    def __len__(self):
+        return len(self.done)
+
+    @property
+    def can_undo(self):
+        return len(self.done) != 0
+
+    @property
+    def can_redo(self):
+        return len(self.undone) != 0
+
+    def record(self, changes):  # Add a move, changes are (spot, old, new). Moves changing nothing are dropped.
+        changes = tuple((spot, old, new) for spot, old, new in changes if old != new)
+
+        if changes:
+            self.done.append(changes)
+            self.undone.clear()
+        return
+
+    def undo(self):  # Return the latest move, or None. Its changes are undone by setting old, last change first.
+        if len(self.done) == 0:
+            return None
+
+        changes = self.done.pop()
+        self.undone.append(changes)
+        return changes
+
+    def redo(self):  # Return the latest undone move, or None. Its changes are redone by setting new, in order.
+        if len(self.undone) == 0:
+            return None
+
+        changes = self.undone.pop()
+        self.done.append(changes)
+        return changes
+
+    def clear(self):
+        self.done.clear()
+        self.undone.clear()
+        return
+
+
+def pack_moves(moves):
+    data = bytearray()
+
+    for changes in moves:
+        data += MOVE.pack(len(changes))
+
+        for change in changes:
+            data += CHANGE.pack(*change)
+    return data
+
+
+def unpack_moves(data, offset, count):  # Return (moves, offset after them).
+    moves = []
+
+    for _ in range(count):
+        change_count, = MOVE.unpack_from(data, offset)
+        offset += MOVE.size
+
+        moves.append(tuple(CHANGE.unpack_from(data, offset + index * CHANGE.size) for index in range(change_count)))
+        offset += change_count * CHANGE.size
+    return moves, offset
+
+
+def save_session(path, puzzle, solution, cells, journal):  # Grids are flat values, solution may be None.
+    size = int(round(len(cells) ** 0.5))
+
+    data = bytearray(HEADER.pack(MAGIC, VERSION, size, 0 if solution is None else 1))
+    data += bytes(puzzle)
+
+    if solution is not None:
+        data += bytes(solution)
+
+    data += bytes(cells)
+    data += COUNTS.pack(len(journal.done), len(journal.undone))
+    data += pack_moves(journal.done)
+    data += pack_moves(journal.undone)
+
+    with open(path + ".tmp", "wb") as file:  # Written aside first, a crash never leaves half a session.
+        file.write(data)
+
+    os.replace(path + ".tmp", path)
+    return
+
+
+def load_session(path):  # Return (size, puzzle, solution, cells, journal), grids as flat bytes, solution may be None.
+    with open(path, "rb") as file:
+        data = file.read()
+
+    try:
+        magic, version, size, has_solution = HEADER.unpack_from(data, 0)
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a saved game.")
+
+        total_cell = size * size
+        offset = HEADER.size
+
+        puzzle = data[offset:offset + total_cell]
+        offset += total_cell
+
+        solution = None
+
+        if has_solution:
+            solution = data[offset:offset + total_cell]
+            offset += total_cell
+
+        cells = data[offset:offset + total_cell]
+        offset += total_cell
+
+        done_count, undone_count = COUNTS.unpack_from(data, offset)
+        offset += COUNTS.size
+
+        journal = MoveJournal()
+        journal.done, offset = unpack_moves(data, offset, done_count)
+        journal.undone, offset = unpack_moves(data, offset, undone_count)
+    except (struct.error, IndexError):
+        raise ValueError(f"{path} is cut short.") from None
+
+    if len(cells) != total_cell:
+        raise ValueError(f"{path} is cut short.")
+    return size, puzzle, solution, cells, journal
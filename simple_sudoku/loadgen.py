@@ -0,0 +1,121 @@
+# Load generator for the HTTP service (server.py), measures throughput and tail latency under concurrent requests.
+# Run "python -m simple_sudoku load --spawn" to start a server in the same process and load it, or point --port at a
+# running one. Standard library only, apart from what the spawned server loads in its workers.
+import asyncio
+import json
+import sys
+import time
+
+from .batch import LatencyHistogram
+from .benchmark import load_corpus
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def make_requests(endpoint, corpus="hard", count=1000):  # Bodies of count requests to endpoint, from a corpus.
+    if endpoint == "generate":
+        return [{"difficulty": "easy", "seed": index, "minimize": False} for index in range(count)]
+
+    puzzles = load_corpus(corpus)
+    key = "board" if endpoint == "validate" else "puzzle"
+    bodies = []
+
+    for index in range(count):
+        body = {key: puzzles[index % len(puzzles)], "seed": index}
+
+        if endpoint == "validate":
+            body["partial"] = True
+        bodies.append(body)
+    return bodies
+
+
+async def post(reader, writer, host, path, body):  # Send one request on a kept-alive connection, return status.
+    data = json.dumps(body).encode()
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+
+    while True:
+        line = await reader.readline()
+
+        if line in (b"\r\n", b"\n", b""):
+            break
+
+        name, _, value = line.decode("latin-1").partition(":")
+
+        if name.strip().lower() == "content-length":
+            length = int(value)
+
+    await reader.readexactly(length)
+    return status
+
+
+async def load(host, port, endpoint="solve", concurrency=16, bodies=()):  # Return the results of one run.
+    # concurrency connections send requests back to back, each taking the next body until none are left. Every
+    # request is timed from sending it to the end of its answer.
+    histogram = LatencyHistogram()
+    statuses = {}
+    bodies = list(bodies)
+    next_body = iter(range(len(bodies)))
+    path = "/" + endpoint
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+
+        try:
+            for index in next_body:  # Shared iterator, so no two clients send the same body.
+                start = time.perf_counter()
+                status = await post(reader, writer, host, path, bodies[index])
+
+                histogram.add(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": histogram.total,
+        "errors": histogram.total - statuses.get(200, 0),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "seconds": elapsed,
+        "requests_per_s": histogram.total / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {f"p{percent:g}": histogram.percentile(percent) * 1000 for percent in PERCENTILES},
+    }
+
+
+def run(host="127.0.0.1", port=8080, endpoint="solve", concurrency=16, count=1000, corpus="hard", spawn=False,
+        workers=None, max_batch=32, report=sys.stderr):  # Load a server, return the results.
+    # spawn=True starts a server on a free port first, with workers and max_batch, and stops it after.
+    from .server import SudokuServer
+
+    bodies = make_requests(endpoint, corpus, count)
+
+    async def main():
+        server = None
+
+        if spawn is True:
+            server = SudokuServer(host, 0, workers=workers, max_batch=max_batch)
+            await server.start()
+
+        try:
+            return await load(host, port if server is None else server.port, endpoint, concurrency, bodies)
+        finally:
+            if server is not None:
+                await server.close()
+
+    results = asyncio.run(main())
+
+    if report is not None:
+        latency = results["latency_ms"]
+        report.write(f"{results['requests']} {endpoint} requests ({results['errors']} failed) in "
+                     f"{results['seconds']:.3f} s, {results['requests_per_s']:.1f} requests/s, "
+                     + ", ".join(f"{name} {value:.3f} ms" for name, value in latency.items()) + "\n")
+    return results
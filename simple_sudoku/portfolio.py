@@ -0,0 +1,111 @@
+# Randomized restart portfolio, runs the bitmask solver on a pool of worker processes.
+import multiprocessing
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .bitmask import BitmaskSolver
+from .stats import CANCELLED, NO_SOLUTION, SOLVED, SearchStats
+
+
+portfolio_stop = None  # Event shared by the worker processes of a portfolio, set once any of them has an answer.
+
+
+def portfolio_init(stop_event):  # Runs once in every worker process.
+    global portfolio_stop
+    portfolio_stop = stop_event
+
+
+def portfolio_search(size, grid, seed, node_limit):  # Randomized restarts in a worker process.
+    # Returns (status, solution, stats), stats has one attempt per restart.
+    solver = BitmaskSolver(size)
+    rng = random.Random(seed)
+    stats = SearchStats()
+
+    while portfolio_stop.is_set() is False:
+        solutions = solver.solve(grid, limit=1, rng=rng, node_limit=node_limit, stop=portfolio_stop.is_set,
+                                 stats=stats)
+
+        if len(solutions) != 0:
+            portfolio_stop.set()  # Tell the other workers to give up.
+            return "solved", solutions[0], stats
+
+        if solver.complete is True:
+            portfolio_stop.set()  # Searched everything, no other worker can do better.
+            return "unsolvable", None, stats
+
+        node_limit *= 2  # Restart with a new order and a bigger budget, so the search stays complete in the end.
+    return "cancelled", None, stats
+
+
+class PortfolioSolver:  # Run randomized restart searches on a process pool, first answer wins.
+    def __init__(self, workers=None):
+        self.workers = int(workers or os.cpu_count() or 1)  # One worker per core by default.
+
+        # Pool and event are created on first use and reused, starting processes is the slow part.
+        self.executor = None
+        self.stop_event = None
+
+        self.stats = None  # SearchStats of the last solve, summed over every worker.
+
+    def __repr__(self):
+        return f"<PortfolioSolver {self.workers} workers>"
+
+    def start(self):  # Start the worker processes before they are needed.
+        if self.executor is None:
+            self.stop_event = multiprocessing.Event()
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=portfolio_init,
+                                                initargs=(self.stop_event,))
+        return
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+            self.stop_event = None
+        return
+
+    def solve(self, size, grid, node_limit=2000, stop=None, rng=None):  # Return a solution, None if there is none.
+        # stop() is polled a few times a second, once it returns True the search is cancelled and None is returned.
+        # self.stats.outcome tells the two kinds of None apart. Worker seeds come from rng (random.Random), or from
+        # the random module when rng is None.
+        self.start()
+        self.stop_event.clear()
+
+        grid = [[int(value) for value in row] for row in grid]
+
+        if rng is None:
+            rng = random
+
+        futures = [self.executor.submit(portfolio_search, size, grid, rng.getrandbits(32), node_limit)
+                   for _ in range(self.workers)]
+
+        result = None
+        outcome = CANCELLED
+        pending = set(futures)
+
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+
+            answers = [future.result() for future in done if future.result()[0] != "cancelled"]
+
+            if answers:  # First real answer.
+                result = answers[0][1]
+                outcome = SOLVED if answers[0][0] == "solved" else NO_SOLUTION
+                break
+
+            if stop is not None and stop() is True:
+                break
+
+        # Cooperative cancellation, every worker polls the event and returns quickly. Wait for them so the event can
+        # be cleared safely for the next solve.
+        self.stop_event.set()
+        wait(futures)
+
+        self.stats = SearchStats()
+
+        for future in futures:
+            self.stats.merge(future.result()[2])
+
+        self.stats.outcome = outcome
+        return result
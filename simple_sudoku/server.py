@@ -0,0 +1,560 @@
+# Local HTTP service over the Sudoku engine, asyncio and the standard library only. Run "python -m simple_sudoku
+# serve". Every endpoint takes a JSON object by POST and answers with a JSON object:
+#   /solve         {"puzzle": ..., "rules": {...}, "seed": 1, "timeout": 10} -> {"solution", "outcome", "stats"}
+#   /generate      {"difficulty": "medium", "size": 9, "seed": 1, "minimize": false, "timeout": 10}
+#                  -> {"puzzle", "solution"}, size 4, 9 or 16 (minimal up to 9), 400 if none is found in time.
+#   /validate      {"board": ..., "partial": false, "rules": {...}} -> {"valid", "conflicts"}
+#   /grade         {"puzzle": ...} -> {"difficulty", "hardest", "techniques"}
+#   /solve/stream  One /solve object per line (NDJSON), one answer per line in input order, sent as they are ready.
+#                  The body may be sent chunked (Transfer-Encoding: chunked) to keep adding lines while answers come.
+# Grids are a line ("53..7...."), a .sdk text or a list of rows, answers use the same form ("format" picks another
+# one: "line", "digits", "sdk" or "rows"). GET /health tells if the server is up.
+import asyncio
+import collections
+import http
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_TIMEOUT = 10.0  # Seconds a solve may take, requests can ask for less or up to MAX_TIMEOUT.
+MAX_TIMEOUT = 60.0
+MAX_BODY = 16 * 1024 * 1024  # Bytes, bigger requests get 413 (a chunked /solve/stream body has no limit).
+LINE_LIMIT = 1024 * 1024  # Longest header or NDJSON line.
+GENERATE_SIZES = (4, 9, 16)  # Sizes /generate makes, 25 x 25 takes seconds per attempt.
+GENERATE_ATTEMPTS = 500  # Puzzles made at most per /generate request, the timeout usually ends a request first.
+MINIMIZE_SIZE = 9  # Biggest size /generate makes minimal puzzles of, a minimal 16 x 16 takes minutes.
+
+ENDPOINTS = {"/solve": "solve", "/generate": "generate", "/validate": "validate", "/grade": "grade"}
+
+
+# Runs in the worker processes.
+def read_grid(grid):  # Return (flat values, size, format of the answer) of a grid given in a request.
+    from .formats import parse_puzzle
+
+    if isinstance(grid, str):
+        cells = parse_puzzle(grid)
+        grid_format = "line" if len(grid.strip().splitlines()) == 1 else "sdk"
+    elif isinstance(grid, list) and all(isinstance(row, list) for row in grid):
+        cells = [int(value) for row in grid for value in row]
+        grid_format = "rows"
+
+        if any(len(row) != len(grid) for row in grid):
+            raise ValueError("Every row must have as many values as there are rows.")
+    else:
+        raise ValueError("A grid is a line of symbols, a .sdk text or a list of rows.")
+
+    size = int(round(len(cells) ** 0.5))
+
+    if size * size != len(cells) or int(round(size ** 0.5)) ** 2 != size or not all(0 <= v <= size for v in cells):
+        raise ValueError(f"{len(cells)} values are not a Sudoku.")
+    return cells, size, grid_format
+
+
+def read_rules(request):  # Rules of a variant, None for classic Sudoku.
+    rules = request.get("rules")
+
+    if rules is not None and not isinstance(rules, dict):
+        raise ValueError("rules must be a JSON object.")
+    return rules
+
+
+def read_timeout(request):  # Seconds the job may take, at most MAX_TIMEOUT.
+    timeout = request.get("timeout", DEFAULT_TIMEOUT)
+
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not timeout > 0:
+        raise ValueError("timeout must be a number of seconds above 0.")
+    return min(float(timeout), MAX_TIMEOUT)
+
+
+def write_grid(cells, size, grid_format):
+    from .formats import format_puzzle
+
+    if grid_format == "rows":
+        return [list(cells[row * size:(row + 1) * size]) for row in range(size)]
+    return format_puzzle(list(cells), grid_format)
+
+
+def solve_job(request):
+    from .board import Board
+    from .sudoku import Sudoku
+
+    cells, size, grid_format = read_grid(request.get("puzzle"))
+    timeout = read_timeout(request)
+
+    sudoku = Sudoku(size, seed=request.get("seed"), rules=read_rules(request))
+    sudoku.grid = Board(size, cells)
+
+    # One process per request, the pool already runs one worker per core.
+    deadline = time.perf_counter() + timeout
+    solved = sudoku.solve_with_threads(workers=1, stop=lambda: time.perf_counter() > deadline)
+
+    return {
+        "solution": write_grid(sudoku.grid.cells, size, request.get("format", grid_format)) if solved else None,
+        "outcome": sudoku.stats.outcome,
+        "stats": sudoku.stats.as_dict(),
+    }
+
+
+def generate_job(request):
+    from .generator import generate
+
+    size = int(request.get("size", 9))
+    timeout = read_timeout(request)
+    minimize = bool(request.get("minimize", False))
+
+    if size not in GENERATE_SIZES:
+        raise ValueError(f"Size must be one of {list(GENERATE_SIZES)}.")
+
+    if minimize is True and size > MINIMIZE_SIZE:
+        raise ValueError(f"Minimal puzzles are made up to {MINIMIZE_SIZE} x {MINIMIZE_SIZE} only.")
+
+    # Checked between attempts, so one attempt (about a second at 16 x 16) may run past the deadline.
+    deadline = time.perf_counter() + timeout
+    puzzle, solution = generate(request.get("difficulty", "medium"), size, rng=random.Random(request.get("seed")),
+                                minimize=minimize, max_attempts=GENERATE_ATTEMPTS,
+                                stop=lambda: time.perf_counter() > deadline)
+
+    grid_format = request.get("format", "line")
+
+    return {
+        "puzzle": write_grid([value for row in puzzle for value in row], size, grid_format),
+        "solution": write_grid([value for row in solution for value in row], size, grid_format),
+    }
+
+
+def validate_job(request):
+    from .validate import conflict_masks
+    from .variants import make_topology
+
+    cells, size, _ = read_grid(request.get("board"))
+    masks = conflict_masks([cells[row * size:(row + 1) * size] for row in range(size)],
+                           make_topology(size, read_rules(request)))
+
+    conflicts = [[int(row), int(col)] for row, col in zip(*masks.nonzero())]
+    full = request.get("partial", False) is True or 0 not in cells
+
+    return {"valid": full and not conflicts, "conflicts": conflicts}
+
+
+def grade_job(request):
+    from .grader import grade
+
+    cells, size, _ = read_grid(request.get("puzzle"))
+    difficulty, hardest, trace = grade([cells[row * size:(row + 1) * size] for row in range(size)])
+
+    return {"difficulty": difficulty, "hardest": hardest, "techniques": dict(collections.Counter(trace))}
+
+
+JOBS = {"solve": solve_job, "generate": generate_job, "validate": validate_job, "grade": grade_job}
+
+
+def run_jobs(jobs):  # One batch in a worker process, return (HTTP status, answer) of every (kind, request) in order.
+    results = []
+
+    for kind, request in jobs:
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object.")
+            results.append((200, JOBS[kind](request)))
+        except (ValueError, TypeError, KeyError) as error:  # Bad request, the worker carries on.
+            results.append((400, {"error": str(error)}))
+        except Exception as error:
+            results.append((500, {"error": f"{type(error).__name__}: {error}"}))
+    return results
+
+
+def warm_worker():  # Load the modules and build the 9 x 9 tables before the first request needs them.
+    run_jobs([("solve", {"puzzle": "." * 81, "seed": 0}), ("grade", {"puzzle": "1" + "." * 80}),
+              ("validate", {"board": "." * 81, "partial": True})])
+    return os.getpid()
+
+
+class MicroBatcher:  # Collects jobs of concurrent requests and sends them to the pool a batch at a time.
+    # IMPORTANT:
+    #   Jobs go out at once while a worker is idle, so a lone request never waits. While every worker is busy, jobs
+    #   wait and go out together as soon as one is done (or once max_batch are waiting), so under load each worker
+    #   gets whatever arrived during its last batch in one message per kind instead of one pickle and wake-up per
+    #   job.
+    def __init__(self, executor, workers, max_batch=32):
+        self.executor = executor
+        self.workers = workers
+        self.max_batch = max_batch
+
+        self.pending = []  # (kind, request, future) not sent yet.
+        self.in_flight = 0  # Batches sent and not done yet.
+
+        self.batches = 0  # Counters for /health.
+        self.jobs = 0
+
+    def __repr__(self):
+        return f"<MicroBatcher {len(self.pending)} waiting, {self.batches} batches, {self.jobs} jobs>"
+
+    async def submit(self, kind, request):  # Return (HTTP status, answer) of one job.
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((kind, request, future))
+
+        if self.in_flight < self.workers or len(self.pending) >= self.max_batch:
+            self.flush()
+        return await future
+
+    def flush(self):  # Send every waiting job, split between the idle workers (one batch per kind if none is idle).
+        # A batch only holds jobs of one kind, a worker runs its batch one job after the other and a /validate must
+        # not wait behind a /solve that may take seconds. Each kind gets a share of the idle workers.
+        pending, self.pending = self.pending, []
+
+        if not pending:
+            return
+
+        loop = asyncio.get_running_loop()
+        idle = max(self.workers - self.in_flight, 1)
+        kinds = {}
+
+        for job in pending:
+            kinds.setdefault(job[0], []).append(job)
+
+        chunks = []
+
+        for jobs in kinds.values():
+            parts = min(max(idle * len(jobs) // len(pending), 1), len(jobs))
+            chunks.extend(jobs[part * len(jobs) // parts:(part + 1) * len(jobs) // parts] for part in range(parts))
+
+        self.in_flight += len(chunks)
+
+        for chunk in chunks:
+            batch = loop.run_in_executor(self.executor, run_jobs, [(kind, request) for kind, request, _ in chunk])
+            batch.add_done_callback(lambda done, c_chunk=chunk: self.finished(done, c_chunk))
+
+        self.batches += len(chunks)
+        self.jobs += len(pending)
+        return
+
+    def finished(self, batch, chunk):
+        self.in_flight -= 1
+
+        if batch.cancelled():
+            results = [(503, {"error": "Server is shutting down."})] * len(chunk)
+        elif batch.exception() is not None:  # Worker process died.
+            results = [(500, {"error": f"Worker failed: {batch.exception()!r}"})] * len(chunk)
+        else:
+            results = batch.result()
+
+        for (_, _, future), result in zip(chunk, results):
+            if not future.done():
+                future.set_result(result)
+
+        if self.pending and not batch.cancelled():  # A worker is free, send what came in meanwhile.
+            self.flush()
+        return
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class SudokuServer:  # HTTP/1.1 server with keep-alive, jobs run on a pre-warmed process pool.
+    def __init__(self, host="127.0.0.1", port=8080, workers=None, max_batch=32):
+        self.host = host
+        self.port = port  # 0 picks a free port, self.port is the real one after start().
+        self.workers = int(workers or os.cpu_count() or 1)
+        self.max_batch = max_batch
+
+        # For later use.
+        self.executor = None
+        self.batcher = None
+        self.server = None
+
+    def __repr__(self):
+        return f"<SudokuServer {self.host}:{self.port}, {self.workers} workers>"
+
+    async def start(self):  # Start and warm every worker, then listen.
+        loop = asyncio.get_running_loop()
+
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.batcher = MicroBatcher(self.executor, self.workers, self.max_batch)
+
+        # Enough warm jobs at once that every worker process is started and gets one.
+        await asyncio.gather(*(loop.run_in_executor(self.executor, warm_worker) for _ in range(self.workers)))
+
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, limit=LINE_LIMIT)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        return
+
+    async def handle(self, reader, writer):  # One connection, requests are answered one after the other.
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as error:
+                    writer.write(response(error.status, {"error": str(error)}, keep_alive=False))
+                    break
+
+                if request is None:  # Closed by the client.
+                    break
+
+                method, path, headers, keep_alive = request
+
+                try:
+                    keep_alive = await self.dispatch(method, path, headers, reader, writer, keep_alive)
+                except HTTPError as error:  # The body may not have been read, so the connection can't be reused.
+                    keep_alive = False
+                    writer.write(response(error.status, {"error": str(error)}, keep_alive))
+
+                await writer.drain()
+
+                if keep_alive is False:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass  # Client went away or sent something that isn't HTTP, nothing to answer.
+        finally:
+            writer.close()
+        return
+
+    async def dispatch(self, method, path, headers, reader, writer, keep_alive):  # Return False to close after.
+        path = path.split("?", 1)[0]
+
+        if method == "GET" and path == "/health":
+            writer.write(response(200, {"status": "ok", "workers": self.workers, "batches": self.batcher.batches,
+                                        "jobs": self.batcher.jobs}, keep_alive))
+            return keep_alive
+
+        if path not in ENDPOINTS and path != "/solve/stream":
+            raise HTTPError(404, f"No endpoint {path}.")
+
+        if method != "POST":
+            raise HTTPError(405, f"{path} takes POST.")
+
+        length = content_length(headers)  # None for a chunked body.
+
+        if path == "/solve/stream":
+            return await self.stream(reader, writer, length, keep_alive)
+
+        if length is None:
+            data = b"".join([chunk async for chunk in read_chunks(reader, MAX_BODY)])
+        else:
+            data = await reader.readexactly(length)
+
+        try:
+            body = json.loads(data or b"{}")
+        except json.JSONDecodeError as error:
+            raise HTTPError(400, f"Body is not JSON: {error}") from None
+
+        status, answer = await self.batcher.submit(ENDPOINTS[path], body)
+        writer.write(response(status, answer, keep_alive))
+        return keep_alive
+
+    async def stream(self, reader, writer, length, keep_alive):  # /solve/stream, answers go out in input order.
+        # Lines are sent to the batcher as soon as they are read, so solving starts before the body is complete.
+        # At most max_batch * workers * 4 answers are waiting to be written, a slow reader slows the input down.
+        # A body that breaks off or is malformed ends the answers with an error line and closes the connection, the
+        # status line went out already.
+        loop = asyncio.get_running_loop()
+        answers = asyncio.Queue(maxsize=self.max_batch * self.workers * 4)
+        broken = False
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n"
+                     + (b"" if keep_alive else b"Connection: close\r\n") + b"\r\n")
+
+        async def read_lines():
+            nonlocal broken
+            number = 0
+
+            try:
+                async for line in body_lines(reader, length):
+                    number += 1
+
+                    if line.strip():
+                        await answers.put(asyncio.ensure_future(self.solve_line(line, number)))
+            except (HTTPError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as error:
+                broken = True
+                failed = loop.create_future()
+                failed.set_result({"line": number + 1, "error": str(error) or "Body ended early."})
+                await answers.put(failed)
+
+            await answers.put(None)
+
+        reading = asyncio.ensure_future(read_lines())
+
+        try:
+            while True:
+                answer = await answers.get()
+
+                if answer is None:
+                    break
+
+                data = (json.dumps(await answer) + "\n").encode()
+                writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+                await writer.drain()
+
+            await reading
+        finally:
+            reading.cancel()
+
+        writer.write(b"0\r\n\r\n")
+        return keep_alive and not broken
+
+    async def solve_line(self, line, number):  # Answer of one NDJSON line, errors are answers too.
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            return {"line": number, "error": f"Not JSON: {error}"}
+
+        if isinstance(request, str):  # A bare puzzle.
+            request = {"puzzle": request}
+
+        status, answer = await self.batcher.submit("solve", request)
+
+        if status != 200:
+            return {"line": number, **answer}
+        return answer
+
+
+async def read_request(reader):  # Return (method, path, headers, keep alive), None once the client is done.
+    line = await reader.readline()
+
+    if not line:
+        return None
+
+    try:
+        method, path, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Bad request line.") from None
+
+    headers = {}
+
+    while True:
+        line = await reader.readline()
+
+        if line in (b"\r\n", b"\n", b""):
+            break
+
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return method, path, headers, keep_alive
+
+
+def content_length(headers):  # Length of the body, None if it is sent chunked.
+    encoding = headers.get("transfer-encoding")
+
+    if encoding is not None:
+        if encoding.lower() != "chunked":
+            raise HTTPError(501, f"Transfer-Encoding {encoding} is not supported, use chunked or a Content-Length.")
+        return None
+
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(400, "Bad Content-Length.") from None
+
+    if not 0 <= length <= MAX_BODY:
+        raise HTTPError(413, f"Bodies are limited to {MAX_BODY} bytes.")
+    return length
+
+
+async def read_chunks(reader, limit=None):  # Data of a chunked body, one chunk at a time.
+    total = 0
+
+    while True:
+        line = await reader.readline()
+
+        try:
+            size = int(line.split(b";", 1)[0], 16)  # Chunk extensions after ";" are ignored.
+        except ValueError:
+            raise HTTPError(400, "Bad chunk size.") from None
+
+        if size == 0:
+            while await reader.readline() not in (b"\r\n", b"\n", b""):  # Trailers, not used.
+                pass
+            return
+
+        total += size
+
+        if limit is not None and total > limit:
+            raise HTTPError(413, f"Bodies are limited to {limit} bytes.")
+
+        data = await reader.readexactly(size)
+
+        if await reader.readline() not in (b"\r\n", b"\n"):
+            raise HTTPError(400, "Chunk is longer than its size.")
+        yield data
+
+
+async def body_lines(reader, length):  # Lines of a body as they arrive, length None for a chunked body.
+    if length is not None:
+        remaining = length
+
+        while remaining > 0:
+            line = await reader.readline()
+
+            if not line:
+                raise asyncio.IncompleteReadError(b"", remaining)
+
+            remaining -= len(line)
+            yield line
+        return
+
+    rest = b""  # Line cut by the end of a chunk.
+
+    async for data in read_chunks(reader):
+        lines = (rest + data).split(b"\n")
+        rest = lines.pop()
+
+        if len(rest) > LINE_LIMIT:
+            raise HTTPError(413, f"Lines are limited to {LINE_LIMIT} bytes.")
+
+        for line in lines:
+            yield line + b"\n"
+
+    if rest:
+        yield rest
+
+
+def response(status, answer, keep_alive):  # Whole HTTP response of a JSON answer.
+    body = json.dumps(answer).encode()
+    head = (f"HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n")
+
+    if keep_alive is False:
+        head += "Connection: close\r\n"
+    return (head + "\r\n").encode("latin-1") + body
+
+
+def run(host="127.0.0.1", port=8080, workers=None, max_batch=32, report=None):  # Serve until Ctrl+C.
+    async def main():
+        server = SudokuServer(host, port, workers=workers, max_batch=max_batch)
+        await server.start()
+
+        if report is not None:
+            report.write(f"Serving on http://{server.host}:{server.port} with {server.workers} workers\n")
+            report.flush()
+
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    return
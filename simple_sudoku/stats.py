@@ -0,0 +1,102 @@
+# Search counters of the solvers, cheap enough to be kept for every solve, and a cProfile helper.
+import cProfile
+import io
+import pstats
+import sys
+
+# Outcome of a search.
+SOLVED = "solved"
+NO_SOLUTION = "no solution"  # Everything was searched, the grid has no (more) solutions.
+GAVE_UP = "gave up"  # node_limit was reached, the result says nothing about the grid.
+CANCELLED = "cancelled"  # stop() returned True.
+
+
+class SearchStats:  # Counters of one solve, summed over every attempt (restart) when the same object is reused.
+    # IMPORTANT:
+    #   Solvers count in local variables and call add_attempt once at the end, so the inner loops stay as fast as
+    #   without stats. callback(stats) is called after every attempt, e.g. to log restarts of a long search.
+    __slots__ = ("nodes", "backtracks", "max_depth", "propagations", "forced", "attempts", "attempt_seconds",
+                 "outcome", "callback")
+
+    def __init__(self, callback=None):
+        self.nodes = 0  # Guesses made.
+        self.backtracks = 0  # Dead ends the search had to back out of.
+        self.max_depth = 0  # Most guesses stacked at once.
+        self.propagations = 0  # Rounds of constraint propagation.
+        self.forced = 0  # Spots filled by propagation (singles) instead of guessing.
+        self.attempts = 0
+        self.attempt_seconds = []  # Time of each attempt.
+        self.outcome = None  # SOLVED, NO_SOLUTION, GAVE_UP or CANCELLED of the last attempt.
+        self.callback = callback
+
+    def __repr__(self):
+        return (f"<SearchStats {self.outcome}, {self.attempts} attempts, {self.nodes} nodes, "
+                f"{self.backtracks} backtracks, depth {self.max_depth}, {self.seconds:.3f} s>")
+
+    def __getstate__(self):  # Sent back from worker processes, the callback stays behind.
+        return {name: getattr(self, name) for name in SearchStats.__slots__ if name != "callback"}
+
+    def __setstate__(self, state):
+        self.callback = None
+
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def seconds(self):
+        return sum(self.attempt_seconds)
+
+    @property
+    def restarts(self):
+        return max(self.attempts - 1, 0)
+
+    def add_attempt(self, nodes, backtracks, max_depth, propagations, forced, seconds, outcome):
+        self.nodes += nodes
+        self.backtracks += backtracks
+        self.max_depth = max(self.max_depth, max_depth)
+        self.propagations += propagations
+        self.forced += forced
+        self.attempts += 1
+        self.attempt_seconds.append(seconds)
+        self.outcome = outcome
+
+        if self.callback is not None:
+            self.callback(self)
+        return
+
+    def merge(self, other):  # Add the attempts of other (e.g. of a worker process), outcome is left as it is.
+        self.nodes += other.nodes
+        self.backtracks += other.backtracks
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.propagations += other.propagations
+        self.forced += other.forced
+        self.attempts += other.attempts
+        self.attempt_seconds.extend(other.attempt_seconds)
+        return
+
+    def as_dict(self):  # Plain values, for JSON.
+        return {
+            "outcome": self.outcome,
+            "nodes": self.nodes,
+            "backtracks": self.backtracks,
+            "max_depth": self.max_depth,
+            "propagations": self.propagations,
+            "forced": self.forced,
+            "attempts": self.attempts,
+            "restarts": self.restarts,
+            "seconds": self.seconds,
+        }
+
+
+def profile(function, *args, sort="cumulative", limit=25, stream=None, **kwargs):  # Run function under cProfile.
+    # Prints the limit slowest entries to stream (stderr by default) and returns what function returned. The
+    # solvers' inner steps (propagate, place, cover, ...) are named functions, so they show up on their own lines.
+    profiler = cProfile.Profile()
+
+    try:
+        result = profiler.runcall(function, *args, **kwargs)
+    finally:
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats(sort).print_stats(limit)
+        (stream or sys.stderr).write(output.getvalue())
+    return result
@@ -0,0 +1,322 @@
+# Sudoku board used by the GUI, solves and creates puzzles.
+import os
+import random
+import time
+
+from .bitmask import BitmaskSolver
+from .board import Board
+from .cache import SolutionCache
+from .dlx import DancingLinksSolver
+from .formats import format_puzzle, parse_puzzle
+from .generator import remove_clues
+from .journal import MoveJournal, load_session, save_session
+from .portfolio import PortfolioSolver
+from .stats import SearchStats
+from .topology import get_topology
+from .transform import multiply
+from .validate import conflict_masks
+from .variants import make_topology, variant_allows
+
+
+class Sudoku:  # Sudoku Class.
+    ENGINES = {"bitmask": BitmaskSolver, "dlx": DancingLinksSolver}  # Solver backends that can be selected.
+
+    solution_cache = None  # SolutionCache shared by all Sudoku, created on first use.
+
+    LOCAL_NODE_LIMIT = 2000  # Guesses tried in this process before starting the portfolio of worker processes.
+
+    def __init__(self, size, engine="bitmask", seed=None, rules=None):
+        # With a seed every search and every created puzzle is the same from one run to the next (see
+        # solve_with_threads), without one they differ each time. rules describe a variant (see variants.py), only
+        # the bitmask engine solves variants.
+        self.rules = rules
+
+        # Unit and peer tables, shared by every classic Sudoku of the same size.
+        self.topology = make_topology(size, rules)
+
+        self.total_row = self.topology.total_row  # Classic Sudoku size = 9 rows * 9 columns.
+        
+        self.block_row = self.topology.block_row  # Number of block rows / columns = square root of total rows.
+
+        self.grid = Board(self.total_row)  # Grid of the Sudoku, 0 represents empty.
+
+        self.empty_spots = self.grid.spots()  # Store spots that are empty, as (row, col).
+
+        self.journal = MoveJournal()  # Moves made on the empty spots, for undo and redo.
+
+        if engine not in Sudoku.ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, choose from {sorted(Sudoku.ENGINES)}.")
+
+        if self.topology.classic is False and engine != "bitmask":
+            raise ValueError(f"Engine {engine!r} solves classic Sudoku only, use the bitmask engine for variants.")
+
+        self.engine = engine
+
+        if self.topology.classic is True:
+            self.solver = Sudoku.ENGINES[engine](self.total_row)  # Engine used to solve the Sudoku.
+        else:
+            self.solver = BitmaskSolver(self.total_row, self.topology)
+
+        self.portfolio = None  # Process pool for hard puzzles, created on first use.
+
+        self.seed = seed
+        self.rng = random.Random(seed)  # Search order and clue removal of this Sudoku only, never the random module.
+
+        # For later use.
+        self.got_result = None
+        self.cancelled = None
+        self.stats = None
+        self.overall_start_time = None
+        self.all_results = None
+        self.current_result = None
+        self.non_empty_spots = None
+
+    def reset_empty(self):
+        self.grid = Board(self.total_row)
+
+        self.empty_spots = self.grid.spots()
+        self.journal.clear()
+        return
+
+    def __repr__(self):
+        return f"<Sudoku {self.total_row} x {self.total_row}>"
+
+    @staticmethod
+    def valid_option(grid, c_row, c_col, c_option, total_row, block_row, topology=None):
+        # Checked if current option is valid or not.
+        # IMPORTANT:
+        #   Only table lookups, the spots sharing a row, column or block with the current spot come from the shared
+        #   topology of total_row. block_row is kept for old callers, the topology already knows the blocks.
+        #   The current spot itself counts too, so empty it first to check the value it holds. topology of a
+        #   variant (Sudoku.topology) adds its units, parity and cage sums.
+        if topology is None:
+            topology = get_topology(total_row)
+
+        cell = c_row * total_row + c_col
+
+        if topology.classic is False:
+            cells = grid.cells if isinstance(grid, Board) else [value for row in grid for value in row]
+
+            if variant_allows(topology, cells, cell, c_option) is False:
+                return False
+
+        if isinstance(grid, Board):  # Flat cells, no row lookups needed.
+            cells = grid.cells
+
+            if cells[cell] == c_option:
+                return False
+
+            for peer in topology.peers[cell]:
+                if cells[peer] == c_option:
+                    return False
+            return True  # Option can be used.
+
+        if grid[c_row][c_col] == c_option:
+            return False
+
+        coords = topology.coords
+
+        for peer in topology.peers[cell]:
+            row, col = coords[peer]
+
+            if grid[row][col] == c_option:
+                return False
+        return True  # Option can be used.
+    
+    def solve_with_threads(self, workers=None, stop=None, progress=None, stats=None, complete=None):
+        # Solve the Sudoku to get one solution. stop and progress are passed to the solver (see BitmaskSolver.solve),
+        # stop can cancel the search from another thread. self.cancelled tells afterwards if False came from
+        # cancelling. self.stats (stats, or a new SearchStats) counts the local search and every portfolio worker,
+        # its outcome tells "no solution" apart from "gave up" or "cancelled".
+        # IMPORTANT:
+        #   No search is ever stopped by a clock, False without cancelling always means the whole search space was
+        #   covered and there is no solution. complete=True searches in this process only, with no guess limit and no
+        #   portfolio, so the result depends on the seed alone. Portfolio workers race each other and the first
+        #   answer wins, which is fast for hard puzzles but not reproducible. complete=None picks complete=True when
+        #   the Sudoku has a seed.
+        self.overall_start_time = time.perf_counter()
+        self.got_result = False
+        self.cancelled = False
+        self.stats = stats if stats is not None else SearchStats()
+
+        grid = self.grid  # Solvers read the rows of the board directly, no list copy is made.
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if complete is None:
+            complete = self.seed is not None
+
+        # Workers only know the classic rules.
+        use_portfolio = self.engine == "bitmask" and workers > 1 and complete is False and self.topology.classic
+
+        # Most puzzles are solved well within the local budget, so worker processes are only used for hard ones.
+        # self.rng shuffles the search order, so creating puzzles gives a different result for every seed.
+        self.all_results = self.solver.solve(grid, limit=1, rng=self.rng,
+                                             node_limit=Sudoku.LOCAL_NODE_LIMIT if use_portfolio else None,
+                                             stop=stop, progress=progress, stats=self.stats)
+
+        def cancelled():
+            return stop is not None and stop() is True
+
+        # Gave up locally, hand over to the pool.
+        if len(self.all_results) == 0 and self.solver.complete is False and cancelled() is False:
+            if self.portfolio is None or self.portfolio.workers != workers:
+                if self.portfolio is not None:
+                    self.portfolio.shutdown()
+
+                self.portfolio = PortfolioSolver(workers)
+
+            solution = self.portfolio.solve(self.total_row, grid, node_limit=Sudoku.LOCAL_NODE_LIMIT, stop=stop,
+                                            rng=self.rng)
+
+            self.stats.merge(self.portfolio.stats)
+            self.stats.outcome = self.portfolio.stats.outcome
+
+            if solution is not None:
+                self.all_results = [solution]
+
+        if len(self.all_results) == 0:
+            self.cancelled = cancelled()
+            return False  # No solution, or cancelled.
+        else:
+            self.got_result = True
+            self.grid = Board.from_rows(self.all_results[0])
+            return True
+
+    def solve_cached(self, stop=None, progress=None):  # Same as solve_with_threads, puzzles solved before are cached.
+        # Not used when creating puzzles, the empty grid would always get the same solution. self.stats is None when
+        # the solution came from the cache. Variants are not cached, the cache only knows the grid and not the rules.
+        if self.topology.classic is False:
+            return self.solve_with_threads(stop=stop, progress=progress)
+
+        if Sudoku.solution_cache is None:
+            Sudoku.solution_cache = SolutionCache()
+
+        def solve_function(grid):  # grid is a numpy view of self.grid.
+            return self.grid if self.solve_with_threads(stop=stop, progress=progress) is True else None
+
+        self.cancelled = False
+        self.stats = None
+
+        solution = Sudoku.solution_cache.solve(self.grid, solve_function)
+
+        if solution is None:
+            return False  # No solution.
+
+        self.got_result = True
+        self.grid = Board.from_rows(solution)
+        return True
+
+    def create_sudoku_puzzle(self):  # Function to create a random puzzle.
+        # Solve to make sure it has a result first before creating the puzzle.
+        if self.solve_with_threads() is False:
+            return False  # No result is available for creating a puzzle.
+
+        # Only empty a spot while the puzzle keeps one solution, so a valid answer of the player always matches
+        # current_result. Maximum numbers to remove is 65, minimum is 55 (fewer if the solution would not be unique).
+        puzzle = remove_clues(self.grid, self.rng, self.rng.randint(55, 65) * self.total_row ** 2 // 81,
+                              solver=None if self.topology.classic is True else self.solver)
+
+        self.load_puzzle(puzzle, self.grid)
+        return True  # Puzzle is created.
+
+    def load_puzzle(self, puzzle, solution):  # Use a ready made puzzle (e.g. from the puzzle bank).
+        self.current_result = Board.from_rows(solution)  # For reference as a solution of the puzzle.
+
+        self.grid = Board.from_rows(puzzle)
+
+        self.non_empty_spots = self.grid.spots(empty=False)  # Store spots that are not empty.
+
+        self.empty_spots = self.grid.spots()  # Store empty spots.
+        self.journal.clear()
+        return
+
+    def load_text(self, text):  # Puzzle from a line ("53..7....", 0 or . for empty) or a .sdk file, no solution known.
+        cells = parse_puzzle(text)
+
+        if len(cells) != self.total_row ** 2:
+            raise ValueError(f"Puzzle of {len(cells)} values is not a {self.total_row} x {self.total_row} Sudoku.")
+
+        self.current_result = None
+        self.grid = Board(self.total_row, cells)
+
+        self.non_empty_spots = self.grid.spots(empty=False)
+        self.empty_spots = self.grid.spots()
+        self.journal.clear()
+        return
+
+    def export_text(self, format="line"):  # Current grid as text, format "line", "digits" or "sdk".
+        return format_puzzle(list(self.grid.cells), format)
+
+    def make_move(self, moves):  # Set (row, col, value) of each move as one step of undo, return the spots changed.
+        changes = []
+
+        for row, col, value in moves:
+            old = self.grid[row, col]
+
+            if old != value:
+                changes.append((row * self.total_row + col, old, value))
+                self.grid[row, col] = value
+
+        self.journal.record(changes)
+        return [(*divmod(spot, self.total_row), new) for spot, _, new in changes]
+
+    def undo(self):  # Take back the latest move, return (row, col, value) of the spots changed.
+        changes = self.journal.undo()
+
+        if changes is None:
+            return []
+        return self.apply_changes((spot, old) for spot, old, _ in reversed(changes))
+
+    def redo(self):  # Make the latest undone move again, return (row, col, value) of the spots changed.
+        changes = self.journal.redo()
+
+        if changes is None:
+            return []
+        return self.apply_changes((spot, new) for spot, _, new in changes)
+
+    def apply_changes(self, values):  # Set (spot, value) pairs, O(1) each.
+        changed = []
+
+        for spot, value in values:
+            row, col = divmod(spot, self.total_row)
+            self.grid[row, col] = value
+            changed.append((row, col, value))
+        return changed
+
+    def puzzle(self):  # Board of the clues only, every empty spot of the puzzle is 0 whatever the player put there.
+        puzzle = self.grid.copy()
+
+        for row, col in self.empty_spots:
+            puzzle[row, col] = 0
+        return puzzle
+
+    def save_session(self, path):  # Write puzzle, solution (if known), current values and the move journal.
+        solution = None if self.current_result is None else Board.from_rows(self.current_result).cells
+
+        save_session(path, self.puzzle().cells, solution, self.grid.cells, self.journal)
+        return
+
+    def load_session(self, path):  # Exact reverse of save_session, ValueError if the game is of another size.
+        size, puzzle, solution, cells, journal = load_session(path)
+
+        if size != self.total_row:
+            raise ValueError(f"{path} holds a {size} x {size} game, not {self.total_row} x {self.total_row}.")
+
+        puzzle = Board(size, puzzle)
+
+        self.current_result = None if solution is None else Board(size, solution)
+        self.non_empty_spots = puzzle.spots(empty=False)
+        self.empty_spots = puzzle.spots()
+
+        self.grid = Board(size, cells)
+        self.journal = journal
+        return
+
+    def conflicts(self):  # (size, size) bool array, True for spots whose value is repeated in a row, column or block.
+        return conflict_masks(self.grid, self.topology)
+
+    def multiply(self, count, rng=None):  # Return count (puzzles, solutions) equivalent to the current grid.
+        # Works on the puzzle in self.grid and its solution in self.current_result (solutions is None without one).
+        return multiply(self.grid, count, solution=self.current_result, rng=rng)
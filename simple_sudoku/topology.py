@@ -0,0 +1,119 @@
+# Unit and peer tables of a board size, built once per size and shared by the solvers, grader, board and GUI. Variants
+# (see variants.py) build their own Topology with more units, other regions, cages and parity masks.
+import itertools
+import math
+
+topologies = {}  # size: Topology.
+
+
+class Topology:  # Which spots share a row, column or block, as flat tuples. Spots are numbered row * size + col.
+    # IMPORTANT:
+    #   Units are houses first (rows, columns, regions, then extra houses such as diagonals), every house holds each
+    #   value once. Cages follow, their values only differ and may have to add up to a sum, so they are left out of
+    #   hidden singles. cell_units of a spot always starts with its row, column and region.
+    __slots__ = ("total_row", "block_row", "total_cell", "units", "cell_units", "peers", "coords", "blocks",
+                 "block_coords", "house_count", "cell_cages", "cell_sum_cages", "cage_options", "cell_masks", "classic")
+
+    def __init__(self, size, regions=None, houses=(), cages=(), cell_masks=None):
+        # regions: region of each spot (jigsaw), square blocks when None. houses: extra units holding each value once.
+        # cages: (spots, sum) pairs, sum None for values that only differ. cell_masks: values allowed in each spot
+        # as bits (value - 1), None allows every value everywhere.
+        self.total_row = int(size)
+        self.block_row = int(math.sqrt(self.total_row))
+        self.total_cell = self.total_row * self.total_row
+
+        total_row = self.total_row
+        block_row = self.block_row
+
+        if block_row * block_row != total_row:
+            raise ValueError(f"Board size must be a square number, got {total_row}.")
+
+        self.coords = tuple(divmod(cell, total_row) for cell in range(self.total_cell))  # (row, col) of each spot.
+
+        # Block of each spot, blocks are numbered left to right, then top to bottom.
+        square_blocks = tuple((row // block_row) * block_row + col // block_row for row, col in self.coords)
+
+        # (block, row inside the block, column inside the block) of each spot, always of the square blocks.
+        self.block_coords = tuple((square_blocks[cell], row % block_row, col % block_row)
+                                  for cell, (row, col) in enumerate(self.coords))
+
+        self.classic = regions is None and not houses and not cages and cell_masks is None
+
+        if regions is None:
+            self.blocks = square_blocks
+        else:
+            self.blocks = tuple(int(region) for region in regions)
+
+            if len(self.blocks) != self.total_cell or sorted(self.blocks) != sorted(square_blocks):
+                raise ValueError(f"Regions must give {total_row} regions of {total_row} spots each.")
+
+        # Units are rows first, then columns, then blocks.
+        units = []
+
+        for row in range(total_row):
+            units.append(tuple(row * total_row + col for col in range(total_row)))
+
+        for col in range(total_row):
+            units.append(tuple(row * total_row + col for row in range(total_row)))
+
+        for block in range(total_row):
+            units.append(tuple(cell for cell in range(self.total_cell) if self.blocks[cell] == block))
+
+        for house in houses:
+            units.append(tuple(sorted(house)))
+
+            if len(units[-1]) != total_row:
+                raise ValueError(f"Extra houses must have {total_row} spots, got {len(units[-1])}.")
+
+        self.house_count = len(units)
+        self.cage_options = {}  # Cage unit: value bits of every set of values the cage can hold, for cages with a sum.
+
+        for spots, total in cages:
+            spots = tuple(sorted(spots))
+
+            if not 0 < len(spots) <= total_row:
+                raise ValueError(f"Cages must have 1 to {total_row} spots, got {len(spots)}.")
+
+            if total is not None:
+                self.cage_options[len(units)] = tuple(
+                    sum(1 << (value - 1) for value in values)
+                    for values in itertools.combinations(range(1, total_row + 1), len(spots)) if sum(values) == total)
+
+            units.append(spots)
+
+        self.units = tuple(units)
+
+        # Units which each spot belongs to, row, column and block first.
+        cell_units = [[row, total_row + col, 2 * total_row + self.blocks[cell]] for cell, (row, col) in
+                      enumerate(self.coords)]
+
+        for unit in range(3 * total_row, len(units)):
+            for cell in units[unit]:
+                cell_units[cell].append(unit)
+
+        self.cell_units = tuple(tuple(c_units) for c_units in cell_units)
+        self.cell_cages = tuple(tuple(unit for unit in c_units if unit >= self.house_count) for c_units in cell_units)
+
+        # Cages with a sum of each spot, the solvers check these against cage_options while working out candidates.
+        self.cell_sum_cages = tuple(tuple(unit for unit in c_cages if unit in self.cage_options)
+                                    for c_cages in self.cell_cages)
+
+        self.cell_masks = None if cell_masks is None else tuple(int(mask) for mask in cell_masks)
+
+        # Spots sharing at least one unit with each spot, the spot itself not included.
+        self.peers = tuple(
+            tuple(sorted(set(c_cell for unit in self.cell_units[cell] for c_cell in self.units[unit]) - {cell}))
+            for cell in range(self.total_cell)
+        )
+
+    def __repr__(self):
+        return f"<Topology {self.total_row} x {self.total_row}>"
+
+
+def get_topology(size):  # Shared tables of size, never changed after they are built.
+    size = int(size)
+    topology = topologies.get(size)
+
+    if topology is None:
+        topology = topologies[size] = Topology(size)
+    return topology
@@ -0,0 +1,53 @@
+# Validity preserving transforms, make many equivalent puzzles from one without solving anything.
+import math
+
+import numpy
+
+# A transform is (value map, row order, column order, transpose):
+#   value map: array of size + 1 values, value_map[0] is always 0 so empty spots stay empty.
+#   row order / column order: new row (column) i is the old row (column) order[i]. Only bands (stacks) are swapped
+#   and rows (columns) are only moved inside their band (stack), so rows, columns and blocks stay rows, columns and
+#   blocks.
+#   transpose: swap rows and columns last.
+
+
+def random_orders(count, size, rng):  # count valid row (or column) orders as a (count, size) array.
+    block_row = int(math.sqrt(size))
+
+    bands = numpy.argsort(rng.random((count, block_row)), axis=1)  # Order of the bands.
+    inside = numpy.argsort(rng.random((count, block_row, block_row)), axis=2)  # Order of rows inside each band.
+
+    return (bands[:, :, None] * block_row + inside).reshape(count, size)
+
+
+def random_transforms(count, size, rng=None):  # count random transforms, as arrays with one row per transform.
+    if rng is None:
+        rng = numpy.random.default_rng()
+
+    value_maps = numpy.zeros((count, size + 1), dtype=numpy.int64)
+    value_maps[:, 1:] = numpy.argsort(rng.random((count, size)), axis=1) + 1
+
+    return value_maps, random_orders(count, size, rng), random_orders(count, size, rng), rng.random(count) < 0.5
+
+
+def apply_transforms(grid, transforms):  # Return a (count, size, size) array, grid transformed by every transform.
+    value_maps, row_orders, col_orders, transposes = transforms
+    count = len(value_maps)
+    size = grid.shape[0]
+
+    grids = numpy.asarray(grid)[row_orders[:, :, None], col_orders[:, None, :]]  # Rows and columns moved at once.
+    grids = numpy.where(transposes[:, None, None], grids.transpose(0, 2, 1), grids)
+
+    return numpy.take_along_axis(value_maps, grids.reshape(count, size * size), axis=1).reshape(count, size, size)
+
+
+def multiply(grid, count, solution=None, rng=None):  # Return count (puzzles, solutions) equivalent to grid.
+    # solutions is None when no solution is given, otherwise the same transforms are applied to it.
+    grid = numpy.asarray(grid)
+    transforms = random_transforms(count, grid.shape[0], rng)
+
+    puzzles = apply_transforms(grid, transforms)
+
+    if solution is None:
+        return puzzles, None
+    return puzzles, apply_transforms(numpy.asarray(solution), transforms)
@@ -0,0 +1,135 @@
+# Whole board validation with numpy, one board or a (count, size, size) stack of boards in a few array operations.
+import numpy
+
+from .topology import get_topology
+
+block_cache = {}  # size: (size, size) array of the block of each spot.
+
+
+def block_index(size):  # Block of each spot as an array, taken from the shared topology.
+    blocks = block_cache.get(size)
+
+    if blocks is None:
+        blocks = block_cache[size] = numpy.array(get_topology(size).blocks, dtype=numpy.int64).reshape(size, size)
+    return blocks
+
+
+def as_boards(grids):  # Return (int64 array of shape (count, size, size), True if a single board was given).
+    boards = numpy.asarray(grids)
+
+    single = boards.ndim == 2
+
+    if single:
+        boards = boards[None]
+
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError(f"Expected a (size, size) board or a (count, size, size) stack, got shape {boards.shape}.")
+
+    size = boards.shape[1]
+
+    if boards.size and (boards.min() < 0 or boards.max() > size):
+        raise ValueError(f"Values must be between 0 (empty) and {size}.")
+    return boards.astype(numpy.int64, copy=False), single
+
+
+def repeated(keys, length):  # True where the key appears more than once, keys are all below length.
+    return numpy.bincount(keys.ravel(), minlength=length)[keys] > 1
+
+
+def conflict_masks(grids, topology=None):  # Boolean mask of the spots holding a value seen again in one of its units.
+    # Every (board, unit, value) gets one number, so each unit type is counted by a single bincount over the whole
+    # stack instead of a loop per spot. Empty spots are never in conflict. Same shape as grids. topology is that of a
+    # variant (see variants.make_topology), classic rules when None.
+    boards, single = as_boards(grids)
+    count, size = boards.shape[0], boards.shape[1]
+
+    if topology is not None and topology.classic is False:
+        masks = variant_conflicts(boards, topology)
+        return masks[0] if single else masks
+
+    unit_index = numpy.arange(count * size, dtype=numpy.int64).reshape(count, 1, size)  # board * size + row.
+    length = count * size * (size + 1)
+
+    rows = (unit_index.transpose(0, 2, 1) * (size + 1)) + boards  # Key of (board, row, value).
+    cols = (unit_index * (size + 1)) + boards  # Key of (board, col, value).
+    blocks = ((numpy.arange(count, dtype=numpy.int64)[:, None, None] * size + block_index(size)) * (size + 1)) + boards
+
+    masks = (boards != 0) & (repeated(rows, length) | repeated(cols, length) | repeated(blocks, length))
+
+    if single:
+        return masks[0]
+    return masks
+
+
+def variant_conflicts(boards, topology):  # conflict_masks of a (count, size, size) stack under a variant's rules.
+    # Same keys as the classic rules, over every (unit, spot) pair of the topology since units differ in length.
+    # Spots breaking their parity and the spots of full cages with the wrong sum are in conflict too.
+    count, size = boards.shape[0], boards.shape[1]
+    total_cell = size * size
+    flat = boards.reshape(count, total_cell)
+
+    member_units = numpy.array([unit for unit, spots in enumerate(topology.units) for _ in spots], dtype=numpy.int64)
+    member_cells = numpy.array([cell for spots in topology.units for cell in spots], dtype=numpy.int64)
+    board_index = numpy.arange(count, dtype=numpy.int64)[:, None]
+
+    values = flat[:, member_cells]
+    keys = (board_index * len(topology.units) + member_units) * (size + 1) + values
+    bad = repeated(keys, count * len(topology.units) * (size + 1)) & (values != 0)
+
+    for unit, options in topology.cage_options.items():  # Every spot of a cage filled, but no set of values fits.
+        cage = flat[:, list(topology.units[unit])]
+        used = numpy.bitwise_or.reduce(numpy.left_shift(1, numpy.maximum(cage - 1, 0)), axis=1)
+        full = (cage != 0).all(axis=1) & ~numpy.isin(used, options)
+        bad[:, member_units == unit] |= full[:, None]
+
+    masks = numpy.bincount((board_index * total_cell + member_cells)[bad], minlength=count * total_cell) > 0
+
+    if topology.cell_masks is not None:
+        allowed = numpy.array(topology.cell_masks, dtype=numpy.int64)
+        masks |= ((flat != 0) & ((allowed >> numpy.maximum(flat - 1, 0)) & 1 == 0)).ravel()
+    return masks.reshape(count, size, size)
+
+
+def valid_boards(grids, topology=None):  # True for every board without conflicts, empty spots allowed.
+    # A bool for a single board.
+    masks = conflict_masks(grids, topology)
+
+    if masks.ndim == 2:
+        return bool(not masks.any())
+    return ~masks.any(axis=(1, 2))
+
+
+def solved_boards(grids, topology=None):  # True for every board that is full and without conflicts.
+    # A bool for a single board.
+    boards, single = as_boards(grids)
+    solved = ~conflict_masks(boards, topology).any(axis=(1, 2)) & (boards != 0).all(axis=(1, 2))
+
+    if single:
+        return bool(solved[0])
+    return solved
+
+
+def check_stream(puzzles, full=True, chunk_size=10000):  # Yield True / False for every flat board, in input order.
+    # full=True asks for solved boards, full=False only for boards without conflicts. Boards of the same size are
+    # stacked chunk_size at a time, so memory stays constant for any input length.
+    check = solved_boards if full is True else valid_boards
+    chunk = []
+
+    def finished():
+        size = int(round(len(chunk[0]) ** 0.5))
+        return check(numpy.array(chunk, dtype=numpy.int64).reshape(len(chunk), size, size)).tolist()
+
+    for cells in puzzles:
+        if chunk and len(cells) != len(chunk[0]):  # New size, a stack holds one size only.
+            yield from finished()
+            chunk = []
+
+        chunk.append(cells)
+
+        if len(chunk) == chunk_size:
+            yield from finished()
+            chunk = []
+
+    if chunk:
+        yield from finished()
+    return
@@ -0,0 +1,93 @@
+# Sudoku variants from a declarative description of their rules, turned into a Topology the solvers propagate on.
+# Rules are a dict that can come straight from JSON, every key is optional and {} is classic Sudoku:
+#   "diagonals": true      Both main diagonals hold each value once (X-Sudoku).
+#   "hyper": true          The windows one spot in from each block corner hold each value once (Hyper / Windoku).
+#   "regions": "111222333..."  Region of every spot in line format (1 to size), replaces the square blocks (jigsaw).
+#   "parity": "o.e..."     o for odd, e for even, . for any value, one symbol per spot (odd / even Sudoku).
+#   "cages": [[sum, [spot, ...]], ...]  Values of a cage differ and add up to sum (Killer), spot is row * size + col.
+from .formats import SYMBOL_VALUES
+from .topology import Topology, get_topology
+
+VARIANTS = ("classic", "x", "hyper", "odd-even", "killer", "jigsaw")  # Names used by the bundled corpus.
+
+RULE_KEYS = ("diagonals", "hyper", "regions", "parity", "cages")
+
+
+def diagonals(size):  # Spots of the main diagonal and of the anti-diagonal.
+    return (tuple(index * size + index for index in range(size)),
+            tuple(index * size + size - 1 - index for index in range(size)))
+
+
+def hyper_windows(size):  # Blocks shifted one spot down and right, with one spot between them.
+    block_row = int(size ** 0.5)
+    starts = range(1, size - block_row, block_row + 1)
+
+    return tuple(tuple((start_row + row) * size + start_col + col for row in range(block_row)
+                       for col in range(block_row)) for start_row in starts for start_col in starts)
+
+
+def parity_masks(size, parity):  # Values allowed in each spot of a parity line.
+    odd = sum(1 << (value - 1) for value in range(1, size + 1, 2))
+    even = sum(1 << (value - 1) for value in range(2, size + 1, 2))
+    masks = {"o": odd, "e": even, ".": odd | even, "0": odd | even}
+
+    if len(parity) != size * size:
+        raise ValueError(f"Parity needs {size * size} symbols, got {len(parity)}.")
+
+    try:
+        return tuple(masks[symbol] for symbol in parity.lower())
+    except KeyError as error:
+        raise ValueError(f"Unknown parity symbol {error.args[0]!r}, use o, e or .") from None
+
+
+def make_topology(size, rules=None):  # Topology of rules, the shared classic one when there are no rules.
+    rules = rules or {}
+    unknown = set(rules) - set(RULE_KEYS)
+
+    if unknown:
+        raise ValueError(f"Unknown rules {sorted(unknown)}, choose from {list(RULE_KEYS)}.")
+
+    if not any(rules.values()):
+        return get_topology(size)
+
+    houses = []
+
+    if rules.get("diagonals"):
+        houses.extend(diagonals(size))
+
+    if rules.get("hyper"):
+        houses.extend(hyper_windows(size))
+
+    regions = rules.get("regions")
+
+    if isinstance(regions, str):
+        try:
+            regions = [SYMBOL_VALUES[symbol] - 1 for symbol in regions.upper()]
+        except KeyError as error:
+            raise ValueError(f"Unknown region symbol {error.args[0]!r}.") from None
+
+    parity = rules.get("parity")
+    cages = [(tuple(spots), total) for total, spots in rules.get("cages") or ()]
+
+    return Topology(size, regions=regions, houses=houses, cages=cages,
+                    cell_masks=None if parity is None else parity_masks(size, parity))
+
+
+def variant_allows(topology, cells, cell, value):  # False if value in cell breaks a parity or a cage sum rule.
+    # cells is the flat grid, values repeated in a unit are left to the peers of the topology.
+    if topology.cell_masks is not None and not topology.cell_masks[cell] & (1 << (value - 1)):
+        return False
+
+    for unit in topology.cell_cages[cell]:
+        options = topology.cage_options.get(unit)
+
+        if options is not None:
+            used = 1 << (value - 1)
+
+            for c_cell in topology.units[unit]:
+                if c_cell != cell and cells[c_cell] != 0:
+                    used |= 1 << (cells[c_cell] - 1)
+
+            if not any(values & used == used for values in options):
+                return False
+    return True
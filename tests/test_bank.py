@@ -0,0 +1,142 @@
+# Puzzle bank: every section is a ring buffer that gives puzzles back oldest first, across reopening and rebuilding.
+import random
+import struct
+
+import pytest
+
+from simple_sudoku.bank import HEADER, MAGIC, BankFiller, PuzzleBank
+from simple_sudoku.bitmask import get_solver
+
+
+def puzzles(size, count, seed=0):  # count (puzzle, solution) pairs of size, not checked for one solution.
+    rng = random.Random(seed)
+    pairs = []
+
+    for _ in range(count):
+        solution = get_solver(size).solve([[0] * size for _ in range(size)], limit=1, rng=rng)[0]
+        pairs.append(([[value if rng.random() < 0.5 else 0 for value in row] for row in solution], solution))
+    return pairs
+
+
+@pytest.mark.parametrize("size", [4, 9, 16])
+def test_put_and_take(tmp_path, size):
+    bank = PuzzleBank(str(tmp_path / "bank"), sizes=(size,), difficulties=("easy",), capacity=3)
+    stored = puzzles(size, 3)
+
+    assert all(bank.put(size, "easy", *pair) is True for pair in stored)
+    assert bank.put(size, "easy", *stored[0]) is False  # Full.
+    assert (bank.count(size, "easy"), bank.free(size, "easy")) == (3, 0)
+    assert [bank.take(size, "easy") for _ in range(4)] == stored + [None]
+    bank.close()
+
+
+def test_ring_wraps(tmp_path):  # Slots are reused round and round, the oldest puzzle always comes first.
+    bank = PuzzleBank(str(tmp_path / "bank"), sizes=(4,), difficulties=("easy",), capacity=3)
+    stored = puzzles(4, 20)
+    waiting = []
+
+    for index, pair in enumerate(stored):
+        assert bank.put(4, "easy", *pair) is True
+        waiting.append(pair)
+
+        if index % 3 != 2:  # Take two of every three, so the ring fills up as it turns.
+            assert bank.take(4, "easy") == waiting.pop(0)
+
+        assert bank.count(4, "easy") == len(waiting)
+
+        if len(waiting) == 3:
+            assert bank.put(4, "easy", *pair) is False
+            assert bank.take(4, "easy") == waiting.pop(0)
+    bank.close()
+
+
+def test_missing_sections(tmp_path):
+    bank = PuzzleBank(str(tmp_path / "bank"), sizes=(4,), difficulties=("easy",))
+
+    assert bank.put(9, "easy", *puzzles(9, 1)[0]) is False
+    assert bank.take(4, "hard") is None
+    assert (bank.count(9, "easy"), bank.free(9, "easy")) == (0, 0)
+    bank.close()
+
+    with pytest.raises(ValueError):
+        PuzzleBank(str(tmp_path / "bank"), sizes=(25,))
+
+
+def test_reopen_keeps_puzzles(tmp_path):
+    path = str(tmp_path / "bank")
+    stored = puzzles(9, 4)
+
+    bank = PuzzleBank(path, sizes=(9,), difficulties=("easy", "hard"), capacity=4)
+    for pair in stored:
+        bank.put(9, "hard", *pair)
+    bank.take(9, "hard")
+    bank.close()
+
+    bank = PuzzleBank(path, sizes=(9,), difficulties=("easy", "hard"), capacity=8)  # Capacity is for new sections.
+    assert bank.free(9, "hard") == 1
+    assert [bank.take(9, "hard") for _ in range(4)] == stored[1:] + [None]
+    bank.close()
+
+
+def test_rebuild_with_new_sections(tmp_path):  # Puzzles of the old sections survive, wrapped rings included.
+    path = str(tmp_path / "bank")
+    stored = puzzles(4, 5)
+
+    bank = PuzzleBank(path, sizes=(4,), difficulties=("easy",), capacity=3)
+    for pair in stored[:3]:
+        bank.put(4, "easy", *pair)
+    bank.take(4, "easy")
+    bank.take(4, "easy")
+    for pair in stored[3:]:  # The ring wraps, the oldest puzzle is in the last slot.
+        bank.put(4, "easy", *pair)
+    bank.close()
+
+    bank = PuzzleBank(path, sizes=(4, 9), difficulties=("easy", "medium"), capacity=2)
+    assert set(bank.keys()) == {(4, "easy"), (4, "medium"), (9, "easy"), (9, "medium")}
+    assert (bank.free(4, "easy"), bank.free(9, "medium")) == (0, 2)
+
+    nine = puzzles(9, 1)[0]
+    assert bank.put(9, "medium", *nine) is True
+    assert [bank.take(4, "easy") for _ in range(4)] == stored[2:] + [None]
+    assert bank.take(9, "medium") == nine
+    bank.close()
+
+
+def test_older_version_starts_again(tmp_path):
+    path = str(tmp_path / "bank")
+
+    bank = PuzzleBank(path, sizes=(4,), difficulties=("easy",))
+    bank.put(4, "easy", *puzzles(4, 1)[0])
+    bank.close()
+
+    with open(path, "r+b") as file:
+        file.write(HEADER.pack(MAGIC, 1, 1))
+
+    bank = PuzzleBank(path, sizes=(4,), difficulties=("easy",))
+    assert bank.count(4, "easy") == 0 and bank.take(4, "easy") is None
+    bank.close()
+
+    with open(path, "r+b") as file:
+        file.write(struct.pack("<4s", b"JUNK"))
+
+    with pytest.raises(ValueError, match="not a puzzle bank"):
+        PuzzleBank(path, sizes=(4,), difficulties=("easy",))
+
+
+def test_filler(tmp_path):  # Fills what it can and gives up on sections the generator can't make.
+    bank = PuzzleBank(str(tmp_path / "bank"), sizes=(4,), difficulties=("easy", "expert"), capacity=2)
+    filler = BankFiller(bank)
+    filler.start()
+
+    while bank.free(4, "easy") != 0 and filler.is_alive():
+        filler.join(0.01)
+
+    filler.stop()
+    filler.join()
+
+    assert filler.failed == {(4, "expert")}
+    assert bank.count(4, "expert") == 0
+
+    puzzle, solution = bank.take(4, "easy")
+    assert get_solver(4).solve(puzzle, limit=2) == [solution]
+    bank.close()
@@ -0,0 +1,103 @@
+# Batch solving: solutions come out in input order whatever the workers do, bad input stops with a message.
+import io
+
+import pytest
+
+from simple_sudoku.__main__ import main
+from simple_sudoku.batch import LatencyHistogram, read_lines, read_packed, run, solve_stream
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.bitmask import get_solver
+from simple_sudoku.formats import format_line, pack_cells
+
+UNSOLVABLE = [1, 1] + [0] * 79  # Two 1s in the first row.
+
+
+def puzzles():  # Flat puzzles of mixed sizes and difficulty, with one that has no solution.
+    grids = load_corpus("easy")[:6] + load_corpus("hard")[:4] + load_corpus("16x16")[:2]
+    cells = [[value for row in grid for value in row] for grid in grids]
+    return cells[:5] + [UNSOLVABLE] + cells[5:]
+
+
+def solution(cells):  # Flat solution of a flat puzzle, all empty without one.
+    size = int(len(cells) ** 0.5)
+    solutions = get_solver(size).solve([cells[row * size:(row + 1) * size] for row in range(size)], limit=1)
+    return [value for row in solutions[0] for value in row] if solutions else [0] * len(cells)
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 64), (1, 1), (2, 1), (2, 3)])
+def test_input_order(workers, chunk_size):
+    histogram = LatencyHistogram()
+    solved = list(solve_stream(puzzles(), workers=workers, chunk_size=chunk_size, histogram=histogram))
+
+    assert solved == [solution(cells) for cells in puzzles()]
+    assert histogram.total == len(solved)
+
+
+def test_read_lines():
+    text = io.StringIO("# comment\n\n" + format_line([0] * 16) + "\r\n  " + format_line(UNSOLVABLE) + "  \n")
+
+    assert list(read_lines(text)) == [[0] * 16, UNSOLVABLE]
+
+
+def test_malformed_line():
+    text = io.StringIO(format_line([0] * 81) + "\n\n" + "." * 5 + "\n" + format_line([0] * 81) + "\n")
+    lines = read_lines(text)
+
+    assert next(lines) == [0] * 81
+
+    with pytest.raises(ValueError, match="^Line 3: "):
+        next(lines)
+
+
+def test_text_run():
+    source = io.StringIO("".join(format_line(cells) + "\n" for cells in puzzles()))
+    target = io.StringIO()
+    report = io.StringIO()
+
+    histogram = run(source, target, workers=1, chunk_size=4, report=report)
+
+    assert target.getvalue().splitlines() == [format_line(solution(cells)) for cells in puzzles()]
+    assert histogram.total == len(puzzles())
+    assert report.getvalue().startswith(f"{len(puzzles())} puzzles (1 without solution) in ")
+
+
+@pytest.mark.parametrize("size", [4, 9, 16])
+def test_binary_run(size):
+    full = [value for row in get_solver(size).solve([[0] * size for _ in range(size)], limit=1)[0] for value in row]
+    puzzle = [value if index % 3 else 0 for index, value in enumerate(full)]
+
+    source = io.BytesIO(pack_cells(puzzle) * 3 + pack_cells([1, 1] + [0] * (size * size - 2)))
+    target = io.BytesIO()
+
+    run(source, target, workers=1, binary_size=size, report=None)
+
+    assert list(read_packed(io.BytesIO(target.getvalue()), size)) == [solution(puzzle)] * 3 + [[0] * size * size]
+
+
+def test_binary_errors():
+    with pytest.raises(ValueError, match="middle of a puzzle"):
+        list(read_packed(io.BytesIO(pack_cells([0] * 81) + b"\x00"), 9))
+
+    with pytest.raises(ValueError, match="up to 16 x 16"):
+        run(io.BytesIO(), io.BytesIO(), binary_size=25, report=None)
+
+
+def test_histogram():
+    histogram = LatencyHistogram()
+
+    assert histogram.percentile(50) == 0.0
+
+    for milliseconds in range(1, 101):
+        histogram.add(milliseconds / 1000)
+
+    assert 0.050 <= histogram.percentile(50) <= 0.050 * 1.02
+    assert 0.099 <= histogram.percentile(99) <= 0.099 * 1.02
+    assert histogram.percentile(100) >= 0.1
+
+
+def test_batch_command_bad_line(tmp_path, capsys):
+    source = tmp_path / "puzzles.txt"
+    source.write_text(format_line([0] * 81) + "\n12\n")
+
+    assert main(["batch", str(source), "-o", str(tmp_path / "out.txt"), "-w", "1"]) == 2
+    assert capsys.readouterr().err.startswith("python -m simple_sudoku batch: Line 2: ")
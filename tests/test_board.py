@@ -0,0 +1,81 @@
+# Board keeps its empty spots in step with its values and passes for a list of rows wherever one is taken.
+import random
+
+import numpy
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.bitmask import get_solver
+from simple_sudoku.board import Board
+
+
+def test_empty_spots_follow_values():
+    rng = random.Random(0)
+    board = Board(9)
+
+    assert len(board.empty) == 81
+
+    for _ in range(500):
+        row, col, value = rng.randrange(9), rng.randrange(9), rng.randrange(10)
+        board[row, col] = value
+
+        assert board[row, col] == value
+        assert board.empty == {cell for cell, c_value in enumerate(board.cells) if c_value == 0}
+
+    assert board.spots() == [divmod(cell, 9) for cell in sorted(board.empty)]
+    assert sorted(board.spots() + board.spots(empty=False)) == [(row, col) for row in range(9) for col in range(9)]
+
+
+def test_like_a_list_of_rows():
+    rows = load_corpus("hard")[0]
+    board = Board.from_rows(rows)
+
+    assert len(board) == 9 and list(board) == [bytes(row) for row in rows]
+    assert board[4] == bytes(rows[4]) and board.rows() == rows
+    assert get_solver(9).solve(board, limit=1) == get_solver(9).solve(rows, limit=1)
+
+    with pytest.raises(TypeError):
+        board[0][0] = 1  # Rows are copies, writing to one must not pass silently.
+
+
+def test_copy_and_equality():
+    board = Board.from_rows(load_corpus("easy")[0])
+    copy = board.copy()
+
+    assert copy == board and copy is not board and Board.from_rows(board) == board
+    copy[0, 0] = 0 if board[0, 0] else 1
+
+    assert copy != board and copy.empty != board.empty
+    assert (board == [[0] * 9] * 9) is False
+
+    with pytest.raises(TypeError):
+        hash(board)
+
+
+def test_numpy_view():
+    board = Board(4)
+    array = numpy.asarray(board)
+
+    board[1, 2] = 3
+    assert array.shape == (4, 4) and array[1, 2] == 3  # Same bytes, no copy.
+
+    assert numpy.array(board, dtype=numpy.int64).dtype == numpy.int64
+    assert numpy.array_equal(Board.from_rows(array).rows(), array)
+
+
+def test_valid_and_candidates():
+    board = Board.from_rows(load_corpus("easy")[0])
+    size = 9
+
+    for row, col in board.spots():
+        used = {board[other // size, other % size] for other in range(size * size)
+                if other != row * size + col and (other // size == row or other % size == col
+                                                  or (other // 27, other % size // 3) == (row // 3, col // 3))}
+
+        assert board.candidates(row, col) == [value for value in range(1, 10) if value not in used]
+        assert all(board.valid(row, col, value) is (value not in used) for value in range(1, 10))
+
+
+def test_wrong_length():
+    with pytest.raises(ValueError, match="needs 81 values"):
+        Board(9, bytes(80))
@@ -0,0 +1,56 @@
+# The solution cache answers relabeled, rotated and shuffled copies of a solved puzzle without solving them.
+import numpy
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.bitmask import BitmaskSolver
+from simple_sudoku.cache import SolutionCache
+from simple_sudoku.transform import multiply
+
+
+def not_called(grid):
+    raise AssertionError("Cache missed a transformed copy of a cached puzzle.")
+
+
+@pytest.mark.parametrize("corpus", ["easy", "hard"])
+def test_hits_after_transforms(corpus):
+    cache = SolutionCache()
+    rng = numpy.random.default_rng(0)
+
+    for puzzle in load_corpus(corpus)[:4]:
+        solution = cache.solve(puzzle, lambda grid: BitmaskSolver(9).solve(grid.tolist(), limit=1)[0])
+        puzzles, solutions = multiply(puzzle, 20, solution=solution, rng=rng)
+
+        for transformed, expected in zip(puzzles, solutions):
+            assert numpy.array_equal(cache.solve(transformed, not_called), expected)
+
+    assert cache.misses == 4
+    assert cache.hits == 4 * 20
+
+
+def test_unsolvable_is_not_cached():
+    cache = SolutionCache()
+    puzzle = numpy.array(load_corpus("easy")[0])
+    calls = []
+
+    def solve_function(grid):
+        calls.append(grid)
+        return None
+
+    assert cache.solve(puzzle, solve_function) is None
+    assert cache.solve(puzzle, solve_function) is None
+    assert len(calls) == 2
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "cache.bin")
+    cache = SolutionCache(path=path)
+    puzzle = load_corpus("hard")[0]
+    solution = cache.solve(puzzle, lambda grid: BitmaskSolver(9).solve(grid.tolist(), limit=1)[0])
+    cache.save()
+
+    loaded = SolutionCache(path=path)
+    transformed, expected = multiply(puzzle, 1, solution=solution, rng=numpy.random.default_rng(1))
+
+    assert len(loaded) == 1
+    assert numpy.array_equal(loaded.solve(transformed[0], not_called), expected[0])
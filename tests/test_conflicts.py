@@ -0,0 +1,54 @@
+# ConflictTracker keeps the same states as checking every unit from scratch, through any sequence of moves.
+import random
+
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.conflicts import EMPTY, INVALID, VALID, ConflictTracker
+from simple_sudoku.topology import get_topology
+
+
+def brute_force_states(size, cells):  # State of every spot, counting the values of its units directly.
+    topology = get_topology(size)
+    states = []
+
+    for cell, value in enumerate(cells):
+        if value == 0:
+            states.append(EMPTY)
+        elif any(sum(1 for other in topology.units[unit] if cells[other] == value) > 1
+                 for unit in topology.cell_units[cell]):
+            states.append(INVALID)
+        else:
+            states.append(VALID)
+    return states
+
+
+@pytest.mark.parametrize("size, corpus", [(9, "easy"), (9, "hard"), (16, "16x16")])
+def test_random_moves_match_brute_force(size, corpus):
+    rng = random.Random(size)
+    puzzle = load_corpus(corpus)[0]
+    editable = [(row, col) for row in range(size) for col in range(size) if puzzle[row][col] == 0]
+
+    tracker = ConflictTracker(size, puzzle, editable)
+    cells = [value for row in puzzle for value in row]
+    states = brute_force_states(size, cells)
+
+    assert [tracker.state(cell) for cell in range(size * size)] == states
+
+    for _ in range(500):
+        row, col = rng.choice(editable)
+        value = rng.choice([0] + list(range(1, size + 1)))
+
+        changed = tracker.set(row, col, value)
+        cells[row * size + col] = value
+        new_states = brute_force_states(size, cells)
+
+        assert tracker.value(row, col) == value
+        assert [tracker.state(cell) for cell in range(size * size)] == new_states
+        flipped = set(divmod(cell, size) for cell in range(size * size) if states[cell] != new_states[cell])
+        assert set(changed) == flipped
+
+        moves = [new_states[row * size + col] for row, col in editable]
+        assert tracker.valid_count == moves.count(VALID)
+        assert tracker.invalid_count == moves.count(INVALID)
+        states = new_states
@@ -0,0 +1,86 @@
+# Every interchange format gives back the grids it was given.
+import random
+
+import numpy
+import pytest
+
+from simple_sudoku.__main__ import main
+from simple_sudoku.bitmask import get_solver
+from simple_sudoku.formats import (dump, format_line, format_puzzle, format_sdk, load, pack_cells, packed_size,
+                                   parse_line, parse_puzzle, parse_sdk, unpack_cells)
+
+
+def random_grids(size, count, seed=0):  # count partly filled grids of size, as flat lists.
+    rng = random.Random(seed)
+    grids = []
+
+    for _ in range(count):
+        solution = get_solver(size).solve([[0] * size for _ in range(size)], limit=1, rng=rng)[0]
+        grids.append([value if rng.random() < 0.5 else 0 for row in solution for value in row])
+    return grids
+
+
+@pytest.mark.parametrize("size", [4, 9, 16, 25])
+def test_line_roundtrip(size):
+    for cells in random_grids(size, 5):
+        assert parse_line(format_line(cells)) == cells
+        assert parse_puzzle(format_puzzle(cells, "digits")) == cells
+        assert parse_sdk(format_sdk(cells))[0] == cells
+        assert parse_puzzle(format_puzzle(cells, "sdk")) == cells
+
+
+@pytest.mark.parametrize("size", [4, 9, 16])
+def test_packed_roundtrip(size):
+    for cells in random_grids(size, 5):
+        record = pack_cells(cells)
+
+        assert len(record) == packed_size(size)
+        assert unpack_cells(record, size) == cells
+
+
+def test_packed_rejects_big_sizes():
+    with pytest.raises(ValueError):
+        pack_cells([0] * 625)
+
+
+@pytest.mark.parametrize("size", [4, 9, 16])
+@pytest.mark.parametrize("format", ["line", "digits", "packed"])
+def test_bulk_roundtrip(size, format):
+    boards = numpy.array(random_grids(size, 20, seed=size), dtype=numpy.uint8).reshape(20, size, size)
+    loaded = load(dump(boards, format), format, size=size)
+
+    assert loaded.dtype == numpy.uint8
+    assert numpy.array_equal(loaded, boards)
+
+
+def test_bulk_sdk_roundtrip():
+    boards = numpy.array(random_grids(9, 1), dtype=numpy.uint8).reshape(1, 9, 9)
+    assert numpy.array_equal(load(dump(boards, "sdk"), "sdk"), boards)
+
+
+def test_bulk_line_errors_name_the_line():
+    data = bytearray(dump(numpy.zeros((3, 9, 9), dtype=numpy.uint8), "line"))
+    data[82 + 5] = ord("X")  # Sixth spot of the second line.
+
+    with pytest.raises(ValueError, match="Line 2 "):
+        load(data, "line")
+
+
+def test_convert_command(tmp_path):
+    source = tmp_path / "puzzles.txt"
+    target = tmp_path / "puzzles.bin"
+    boards = numpy.array(random_grids(9, 3), dtype=numpy.uint8).reshape(3, 9, 9)
+    source.write_bytes(dump(boards, "line"))
+
+    assert main(["convert", str(source), "-o", str(target), "--to", "packed"]) is None
+    assert numpy.array_equal(load(target.read_bytes(), "packed", size=9), boards)
+
+
+def test_convert_command_bad_line(tmp_path, capsys):  # A message and status 2 like batch and check, no traceback.
+    source = tmp_path / "puzzles.txt"
+    target = tmp_path / "out.txt"
+    source.write_text("." * 81 + "\n12\n")
+
+    assert main(["convert", str(source), "-o", str(target)]) == 2
+    assert capsys.readouterr().err.startswith("python -m simple_sudoku convert: ")
+    assert target.exists() is False
@@ -0,0 +1,81 @@
+# Generated puzzles must have exactly one solution, the grade asked for and, when asked, no clue to spare.
+import random
+
+import pytest
+
+from simple_sudoku.bitmask import BitmaskSolver
+from simple_sudoku.dlx import DancingLinksSolver
+from simple_sudoku.generator import generate, remove_clues
+from simple_sudoku.grader import grade
+
+
+def check_unique(puzzle, solution):
+    size = len(puzzle)
+
+    assert BitmaskSolver(size).solve(puzzle, limit=2) == [solution]
+    assert len(DancingLinksSolver(size).solve(puzzle, limit=2)) == 1
+    assert all(value in (0, solution[row][col]) for row in range(size) for col, value in enumerate(puzzle[row]))
+
+
+@pytest.mark.parametrize("size", [4, 9, 16])
+def test_unique(size):
+    rng = random.Random(size)
+
+    for _ in range(3 if size == 16 else 20):
+        puzzle, solution = generate("easy", size, rng=rng, graded=False)
+        check_unique(puzzle, solution)
+
+
+@pytest.mark.parametrize("difficulty, seed", [("easy", 0), ("medium", 0), ("hard", 3), ("expert", 0)])
+def test_graded(difficulty, seed):
+    puzzle, solution = generate(difficulty, 9, rng=random.Random(seed))
+
+    check_unique(puzzle, solution)
+    assert grade(puzzle)[0] == difficulty
+
+
+def test_graded_16():
+    puzzle, solution = generate("medium", 16, rng=random.Random(1))
+
+    check_unique(puzzle, solution)
+    assert grade(puzzle)[0] == "medium"
+
+
+def test_minimal():  # No clue of a minimal puzzle can go without a second solution.
+    for seed in range(3):
+        puzzle, solution = generate("easy", 9, rng=random.Random(seed), minimize=True, graded=False)
+        check_unique(puzzle, solution)
+
+        for row in range(9):
+            for col in range(9):
+                if puzzle[row][col] != 0:
+                    fewer = [line[:] for line in puzzle]
+                    fewer[row][col] = 0
+
+                    assert len(BitmaskSolver(9).solve(fewer, limit=2)) == 2
+
+
+def test_remove_clues_count():
+    solution = BitmaskSolver(9).solve([[0] * 9 for _ in range(9)], limit=1, rng=random.Random(5))[0]
+    puzzle = remove_clues(solution, random.Random(5), to_remove=40)
+
+    assert sum(row.count(0) for row in puzzle) == 40
+    check_unique(puzzle, solution)
+
+    more = remove_clues(puzzle, random.Random(6), to_remove=5)  # A puzzle loses more clues, the rest stay.
+    assert sum(row.count(0) for row in more) == 45
+    check_unique(more, solution)
+
+
+def test_same_seed_same_puzzle():
+    assert generate("medium", 9, rng=random.Random(9)) == generate("medium", 9, rng=random.Random(9))
+
+
+def test_unreachable_difficulty():
+    with pytest.raises(ValueError, match="4 x 4 puzzles can't be hard"):
+        generate("hard", 4)
+
+    with pytest.raises(ValueError, match="Unknown difficulty"):
+        generate("impossible", 9)
+
+    assert grade(generate("easy", 4)[0])[0] == "easy"
@@ -0,0 +1,123 @@
+# The grader's incremental bookkeeping must match a full rescan, so no single is missed and grades don't drift.
+import random
+
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.bitmask import get_solver
+from simple_sudoku.generator import remove_clues
+from simple_sudoku.grader import DIFFICULTIES, TECHNIQUE_DIFFICULTY, HumanSolver, grade
+
+
+def rescan(human):  # Return (places, hidden pairs, broken) counted from the candidates of every spot.
+    # places maps (unit, value) to its count for the values not placed in the unit yet, the others aren't kept up.
+    total_row = human.total_row
+    places = {}
+    hidden = set()
+    broken = any(human.cells[cell] == 0 and human.candidates[cell] == 0 for cell in range(len(human.cells)))
+
+    for unit, unit_cells in enumerate(human.units):
+        for value in range(1, total_row + 1):
+            bit = 1 << (value - 1)
+            count = sum(1 for cell in unit_cells if human.cells[cell] == 0 and human.candidates[cell] & bit)
+
+            if human.placed[unit] & bit:
+                continue
+
+            places[unit, value] = count
+
+            if count == 1:
+                hidden.add((unit, bit))
+            elif count == 0:
+                broken = True
+    return places, hidden, broken
+
+
+def check(human):
+    places, hidden, broken = rescan(human)
+
+    assert {key: human.places[key[0] * human.total_row + key[1] - 1] for key in places} == places
+    assert hidden <= set(human.hidden)  # Queued pairs may be stale, missing ones are singles the grader can't see.
+    assert human.broken == broken
+
+
+@pytest.mark.parametrize("size", [4, 9, 16])
+def test_bookkeeping_matches_rescan(size):
+    rng = random.Random(size)
+
+    for _ in range(5 if size < 16 else 1):  # A rescan of 16 x 16 after every change is slow.
+        solution = get_solver(size).solve([[0] * size for _ in range(size)], limit=1, rng=rng)[0]
+        flat = [value for row in solution for value in row]
+        human = HumanSolver(size, remove_clues(solution, rng, to_remove=size * size * 2 // 3))
+        check(human)
+
+        empty = [cell for cell in range(size * size) if human.cells[cell] == 0]
+        rng.shuffle(empty)
+
+        for cell in empty:  # Eliminate wrong candidates and place values in random order, checking every change.
+            wrong = [value for value in range(1, size + 1)
+                     if value != flat[cell] and human.candidates[cell] & (1 << (value - 1))]
+
+            for value in rng.sample(wrong, len(wrong) // 2):
+                human.eliminate(cell, value)
+                check(human)
+
+            if rng.random() < 0.5:
+                human.place(cell, flat[cell])
+                check(human)
+
+
+def test_wrong_placement_breaks():
+    human = HumanSolver(4, [[1, 2, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+    human.place(2, 1)  # Second 1 in the first row.
+
+    assert human.broken is True
+    assert human.find_step() is None
+
+
+class RescanSolver(HumanSolver):  # Queues every hidden single from a full rescan before each step.
+    def find_step(self):
+        self.hidden = sorted(rescan(self)[1])
+        return super().find_step()
+
+
+def rescan_grade(grid):  # grade() with RescanSolver.
+    human = RescanSolver(len(grid), grid)
+    trace = []
+
+    while human.solved() is False:
+        step = human.find_step()
+
+        if step is None:
+            return "expert"
+
+        human.apply(step)
+        trace.append(step[0])
+    return max((TECHNIQUE_DIFFICULTY[technique] for technique in trace), key=DIFFICULTIES.index, default="easy")
+
+
+def test_grades_match_rescan():
+    rng = random.Random(7)
+
+    for index in range(40):
+        solution = get_solver(9).solve([[0] * 9 for _ in range(9)], limit=1, rng=rng)[0]
+        puzzle = remove_clues(solution, rng, None if index % 2 else 55)
+
+        assert grade(puzzle)[0] == rescan_grade(puzzle)
+
+
+def test_corpus_grades():
+    assert all(grade(puzzle)[0] == "easy" for puzzle in load_corpus("easy"))
+
+
+def test_hidden_single_is_found():  # The 1 of the first row can only go in its last spot, no spot has one candidate.
+    grid = [[0] * 9 for _ in range(9)]
+
+    for row, col in ((1, 0), (2, 3), (4, 6), (8, 7)):
+        grid[row][col] = 1
+
+    human = HumanSolver(9, grid)
+    technique, placements, _ = human.find_step()
+
+    assert technique == "Hidden Single"
+    assert placements == [(8, 1)]
@@ -0,0 +1,99 @@
+# Hints must always give a value of the solution, and name the simplest technique that finds it.
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.bitmask import BitmaskSolver
+from simple_sudoku.grader import TECHNIQUE_DIFFICULTY
+from simple_sudoku.hints import HintEngine
+
+
+def singles(state):  # Return (hidden single found, naked single found) by looking at every unit and spot.
+    empty = [cell for cell in range(len(state.cells)) if state.cells[cell] == 0]
+    naked = any(bin(state.candidates[cell]).count("1") == 1 for cell in empty)
+    hidden = any(sum(1 for cell in unit if state.cells[cell] == 0 and state.candidates[cell] & (1 << value)) == 1
+                 for unit in state.units for value in range(state.total_row))
+    return hidden, naked
+
+
+def play(engine, solution):  # Fill the board from hints alone, return the techniques of the hints in order.
+    size = len(solution)
+    techniques = []
+
+    while True:
+        hint = engine.hint()
+
+        if hint is None:
+            return techniques
+
+        if hint.value is None:  # No solution known, search the way the GUI does off the Tk thread.
+            cells = engine.board()
+            engine.search_done(cells, HintEngine.search(size, cells))
+            continue
+
+        assert hint.value == solution[hint.row][hint.col]
+
+        if not hint.eliminations:  # Hidden singles come first, then naked singles, then everything else.
+            hidden, naked = singles(engine.state)
+            assert hint.technique == ("Hidden Single" if hidden else "Naked Single" if naked else hint.technique)
+
+        assert engine.hint() is hint  # Asking again without a move gives the same hint.
+
+        techniques.append(hint.technique)
+        engine.set(hint.row, hint.col, hint.value)
+
+
+@pytest.mark.parametrize("corpus", ["easy", "hard", "17-clue"])
+@pytest.mark.parametrize("known", [True, False])
+def test_play_to_the_end(corpus, known):
+    for puzzle in load_corpus(corpus):
+        size = len(puzzle)
+        solution = BitmaskSolver(size).solve(puzzle, limit=1)[0]
+        engine = HintEngine(size, puzzle, solution if known else None)
+
+        techniques = play(engine, solution)
+
+        assert len(techniques) == sum(row.count(0) for row in puzzle)
+        assert all(technique in TECHNIQUE_DIFFICULTY or technique == "Search" for technique in techniques)
+
+        if corpus == "easy":  # Singles finish every easy puzzle, a search would mean one was missed.
+            assert set(techniques) <= {"Hidden Single", "Naked Single"}
+
+
+def test_hidden_single():  # The 1 of the first row can only go in its last spot, no spot has one candidate.
+    grid = [[0] * 9 for _ in range(9)]
+
+    for row, col in ((1, 0), (2, 3), (4, 6), (8, 7)):
+        grid[row][col] = 1
+
+    hint = HintEngine(9, grid).hint()
+
+    assert (hint.row, hint.col, hint.value, hint.technique) == (0, 8, 1, "Hidden Single")
+
+
+def test_hidden_single_after_moves():  # Singles made by the player's values are found too.
+    puzzle = load_corpus("easy")[0]
+    solution = BitmaskSolver(9).solve(puzzle, limit=1)[0]
+    engine = HintEngine(9, puzzle, solution)
+
+    for cell in range(81):  # Fill the first rows, the rest of the board is left to hints.
+        row, col = divmod(cell, 9)
+
+        if puzzle[row][col] == 0 and row < 4:
+            engine.set(row, col, solution[row][col])
+
+    assert engine.hint().technique in ("Hidden Single", "Naked Single")
+
+
+def test_mistake_and_change():
+    puzzle = load_corpus("easy")[0]
+    solution = BitmaskSolver(9).solve(puzzle, limit=1)[0]
+    engine = HintEngine(9, puzzle, solution)
+
+    row, col = next((row, col) for row in range(9) for col in range(9) if puzzle[row][col] == 0)
+    wrong = solution[row][col] % 9 + 1
+    engine.set(row, col, wrong)
+
+    assert engine.hint()[:4] == (row, col, solution[row][col], "Mistake")
+
+    engine.set(row, col, 0)  # Emptied again, the hints carry on from the clues.
+    assert play(engine, solution)
@@ -0,0 +1,125 @@
+# Undo and redo of moves, and saved games that come back with their moves.
+import struct
+
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.journal import HEADER, MAGIC, MoveJournal, load_session, save_session
+from simple_sudoku.sudoku import Sudoku
+
+
+def test_undo_redo():
+    journal = MoveJournal()
+    journal.record([(0, 0, 1), (1, 0, 2)])
+    journal.record([(5, 0, 3)])
+    journal.record([(6, 0, 4)])
+
+    assert (len(journal), journal.can_undo, journal.can_redo) == (3, True, False)
+    assert journal.undo() == ((6, 0, 4),)
+    assert journal.undo() == ((5, 0, 3),)
+    assert journal.redo() == ((5, 0, 3),)
+    assert journal.can_redo is True
+
+    journal.record([(7, 0, 9)])  # A new move drops what was undone.
+    assert journal.can_redo is False and journal.redo() is None
+    assert [journal.undo() for _ in range(4)] == [((7, 0, 9),), ((5, 0, 3),), ((0, 0, 1), (1, 0, 2)), None]
+
+
+def test_moves_changing_nothing_are_dropped():
+    journal = MoveJournal()
+    journal.record([(0, 3, 3)])
+    journal.record([])
+
+    assert len(journal) == 0
+
+
+def test_sudoku_undo_redo():
+    game = Sudoku(9)
+    game.load_puzzle(load_corpus("easy")[0], [[0] * 9 for _ in range(9)])
+    row, col = game.empty_spots[0]
+    start = game.grid.copy()
+
+    assert game.make_move([(row, col, 4)]) == [(row, col, 4)]
+    assert game.make_move([(row, col, 5)]) == [(row, col, 5)]
+    assert game.undo() == [(row, col, 4)]
+    assert game.undo() == [(row, col, 0)]
+    assert game.grid == start and game.undo() == []
+    assert game.redo() == [(row, col, 4)]
+
+
+def session(size=9):  # (puzzle, solution, cells, journal) of a game with moves done and undone.
+    total_cell = size * size
+    puzzle = [index % size + 1 if index % 3 == 0 else 0 for index in range(total_cell)]
+    empty = [spot for spot in range(total_cell) if puzzle[spot] == 0]
+    journal = MoveJournal()
+
+    journal.record([(spot, 0, spot % size + 1) for spot in empty])  # One move filling the whole board.
+    journal.record([(empty[0], empty[0] % size + 1, 0)])
+    journal.record([(empty[1], empty[1] % size + 1, 0), (empty[2], empty[2] % size + 1, 0)])
+    journal.undo()
+
+    cells = [value if value else spot % size + 1 for spot, value in enumerate(puzzle)]
+    cells[empty[0]] = 0
+    return puzzle, [spot % size + 1 for spot in range(total_cell)], cells, journal
+
+
+@pytest.mark.parametrize("size", [9, 25])  # 25 x 25 has a move of more than 255 changes.
+@pytest.mark.parametrize("with_solution", [True, False])
+def test_session_roundtrip(tmp_path, size, with_solution):
+    path = str(tmp_path / "session")
+    puzzle, solution, cells, journal = session(size)
+
+    save_session(path, bytes(puzzle), bytes(solution) if with_solution else None, bytes(cells), journal)
+    loaded_size, loaded_puzzle, loaded_solution, loaded_cells, loaded = load_session(path)
+
+    assert (loaded_size, list(loaded_puzzle), list(loaded_cells)) == (size, puzzle, cells)
+    assert loaded_solution is None if not with_solution else list(loaded_solution) == solution
+    assert (loaded.done, loaded.undone) == (journal.done, journal.undone)
+
+    if size == 25:
+        assert len(loaded.done[0]) > 255
+
+    # Undo and redo carry on where the saved game stopped.
+    assert loaded.redo() == journal.undone[-1]
+    assert [loaded.undo() for _ in range(4)] == [journal.undone[-1], *reversed(journal.done), None]
+
+
+def test_sudoku_session_roundtrip(tmp_path):
+    path = str(tmp_path / "session")
+    game = Sudoku(9, seed=3)
+    game.load_puzzle(load_corpus("easy")[0], [[0] * 9 for _ in range(9)])
+    (row, col), (row2, col2) = game.empty_spots[:2]
+
+    game.make_move([(row, col, 1)])
+    game.make_move([(row2, col2, 2), (row, col, 3)])
+    game.make_move([(row2, col2, 4)])
+    game.undo()
+    game.save_session(path)
+
+    loaded = Sudoku(9)
+    loaded.load_session(path)
+
+    assert loaded.grid == game.grid and loaded.puzzle() == game.puzzle()
+    assert loaded.redo() == [(row2, col2, 4)]
+    assert loaded.undo() == [(row2, col2, 2)]
+    assert loaded.undo() == [(row, col, 1), (row2, col2, 0)]
+    assert loaded.undo() == [(row, col, 0)]
+    assert loaded.grid == game.puzzle()
+
+    with pytest.raises(ValueError, match="9 x 9 game"):
+        Sudoku(4).load_session(path)
+
+
+def test_bad_sessions(tmp_path):
+    path = str(tmp_path / "session")
+    save_session(path, bytes(81), None, bytes(81), MoveJournal())
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    for bad in (data[:-3], struct.pack("<4sHBB", MAGIC, 1, 9, 0) + data[HEADER.size:], b"JUNK" + data[4:]):
+        with open(path, "wb") as file:
+            file.write(bad)
+
+        with pytest.raises(ValueError):
+            load_session(path)
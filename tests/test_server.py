@@ -0,0 +1,156 @@
+# HTTP service: the jobs a worker runs, how requests are batched, and whole requests against a started server.
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.server import MicroBatcher, SudokuServer, run_jobs
+
+PUZZLE = "".join(str(value) if value else "." for row in load_corpus("hard")[0] for value in row)
+
+
+def test_jobs():
+    (status, solved), (_, valid), (_, graded), (_, made) = run_jobs([
+        ("solve", {"puzzle": PUZZLE, "seed": 1}),
+        ("validate", {"board": PUZZLE, "partial": True}),
+        ("grade", {"puzzle": PUZZLE}),
+        ("generate", {"difficulty": "easy", "seed": 2, "format": "digits"}),
+    ])
+
+    assert status == 200 and solved["outcome"] == "solved"
+    assert all(clue in (".", value) for clue, value in zip(PUZZLE, solved["solution"]))
+    assert valid == {"valid": True, "conflicts": []}
+    assert graded["difficulty"] in ("easy", "medium", "hard", "expert")
+    assert len(made["puzzle"]) == 81 and "." not in made["puzzle"]
+
+
+@pytest.mark.parametrize("kind, request_body", [
+    ("solve", {"puzzle": PUZZLE, "rules": 1}),
+    ("solve", {"puzzle": PUZZLE, "timeout": "soon"}),
+    ("solve", {"puzzle": PUZZLE, "timeout": -1}),
+    ("solve", {"puzzle": "123"}),
+    ("solve", ["not", "an", "object"]),
+    ("validate", {"board": PUZZLE, "rules": "x"}),
+    ("generate", {"size": 25}),
+    ("generate", {"size": 16, "minimize": True}),
+    ("generate", {"size": 4, "difficulty": "hard"}),
+    ("generate", {"timeout": None}),
+])
+def test_bad_requests(kind, request_body):  # Client mistakes are a 400 with a message, never a 500.
+    [(status, answer)] = run_jobs([(kind, request_body)])
+
+    assert status == 400
+    assert answer["error"]
+
+
+def test_generate_timeout():
+    [(status, answer)] = run_jobs([("generate", {"size": 16, "difficulty": "hard", "timeout": 0.01, "seed": 1})])
+
+    assert status == 400 and "time ran out" in answer["error"]
+
+
+class RecordingExecutor(ThreadPoolExecutor):  # Keeps the kinds of every batch sent to it.
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.batches = []
+
+    def submit(self, function, jobs):
+        self.batches.append([kind for kind, _ in jobs])
+        return super().submit(function, jobs)
+
+
+def test_batches_hold_one_kind():
+    async def main():
+        with RecordingExecutor() as executor:
+            batcher = MicroBatcher(executor, workers=1)
+            first = asyncio.ensure_future(batcher.submit("solve", {"puzzle": PUZZLE}))
+            await asyncio.sleep(0)  # Sent at once, the only worker is busy now.
+
+            later = [batcher.submit(kind, {"puzzle": PUZZLE, "board": PUZZLE})
+                     for kind in ("validate", "solve", "grade", "validate", "solve")]
+            results = await asyncio.gather(first, *later)
+            return executor.batches, results
+
+    batches, results = asyncio.run(main())
+
+    assert all(status == 200 for status, _ in results)
+    assert batches[0] == ["solve"]
+    assert sorted(map(tuple, batches[1:])) == [("grade",), ("solve", "solve"), ("validate", "validate")]
+
+
+async def exchange(port, data):  # Send raw bytes, return (status, headers, body) of the answer.
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = b""
+
+        while (size := int(await reader.readline(), 16)) != 0:
+            body += await reader.readexactly(size)
+            await reader.readline()
+
+    writer.close()
+    return status, headers, body
+
+
+def chunked(data, size):  # data as a chunked body of chunks of size bytes.
+    return b"".join(b"%x\r\n%s\r\n" % (len(data[start:start + size]), data[start:start + size])
+                    for start in range(0, len(data), size)) + b"0\r\n\r\n"
+
+
+def post(path, data, headers=""):
+    return (f"POST {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n{headers}".encode()
+            + (b"" if "Transfer-Encoding" in headers else b"Content-Length: %d\r\n" % len(data)) + b"\r\n" + data)
+
+
+def test_server():
+    async def main():
+        server = SudokuServer("127.0.0.1", 0, workers=1)
+        await server.start()
+
+        try:
+            health = await exchange(server.port, b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+            solve = await exchange(server.port, post("/solve", json.dumps({"puzzle": PUZZLE}).encode()))
+            missing = await exchange(server.port, post("/nowhere", b"{}"))
+            not_json = await exchange(server.port, post("/grade", b"{"))
+
+            body = json.dumps({"board": PUZZLE}).encode()
+            chunked_body = await exchange(server.port, post("/validate", chunked(body, 7),
+                                                            "Transfer-Encoding: chunked\r\n"))
+
+            lines = b"".join(json.dumps(request).encode() + b"\n" for request in
+                             [{"puzzle": PUZZLE}, PUZZLE, {"puzzle": "12"}])
+            stream = await exchange(server.port, post("/solve/stream", chunked(lines, 13),
+                                                      "Transfer-Encoding: chunked\r\n"))
+            broken = await exchange(server.port, post("/solve/stream", b"zz\r\n", "Transfer-Encoding: chunked\r\n"))
+            other = await exchange(server.port, post("/solve", b"{}", "Transfer-Encoding: gzip\r\n"))
+        finally:
+            await server.close()
+        return health, solve, missing, not_json, chunked_body, stream, broken, other
+
+    health, solve, missing, not_json, chunked_body, stream, broken, other = asyncio.run(main())
+
+    assert health[0] == 200 and json.loads(health[2])["status"] == "ok"
+    assert solve[0] == 200 and json.loads(solve[2])["outcome"] == "solved"
+    assert missing[0] == 404 and not_json[0] == 400
+    assert chunked_body[0] == 200 and json.loads(chunked_body[2])["valid"] is False  # Not full yet.
+
+    answers = [json.loads(line) for line in stream[2].splitlines()]
+    assert stream[0] == 200 and stream[1]["transfer-encoding"] == "chunked"
+    assert answers[0]["solution"] == answers[1]["solution"] and answers[0]["outcome"] == "solved"
+    assert answers[2]["line"] == 3 and answers[2]["error"]
+
+    assert broken[0] == 200 and json.loads(broken[2])["error"] == "Bad chunk size."
+    assert other[0] == 501
@@ -0,0 +1,35 @@
+# The Dancing Links backend must agree with the bitmask solver on every bundled corpus.
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.bitmask import BitmaskSolver
+from simple_sudoku.dlx import DancingLinksSolver
+from simple_sudoku.validate import solved_boards
+
+
+@pytest.mark.parametrize("corpus", ["easy", "hard", "17-clue", "16x16"])
+def test_dlx_agrees_with_bitmask(corpus):
+    for puzzle in load_corpus(corpus):
+        size = len(puzzle)
+        limit = 1 if size == 16 else 2  # Proving 16 x 16 puzzles unique takes DLX seconds each.
+        bitmask = BitmaskSolver(size).solve(puzzle, limit=limit)
+        dlx = DancingLinksSolver(size).solve(puzzle, limit=limit)
+
+        assert len(bitmask) == len(dlx) == 1
+        assert [list(row) for row in dlx[0]] == [list(row) for row in bitmask[0]]
+        assert solved_boards([dlx[0]])[0]
+
+        for row, puzzle_row in zip(dlx[0], puzzle):  # Clues are kept.
+            assert all(value == clue for value, clue in zip(row, puzzle_row) if clue != 0)
+
+
+def test_dlx_counts_every_solution():  # The empty 4 x 4 grid has 288 solutions.
+    empty = [[0] * 4 for _ in range(4)]
+
+    assert len(DancingLinksSolver(4).solve(empty, limit=None)) == 288
+    assert len(BitmaskSolver(4).solve(empty, limit=None)) == 288
+
+
+def test_dlx_stops_at_limit():
+    empty = [[0] * 9 for _ in range(9)]
+    assert len(DancingLinksSolver(9).solve(empty, limit=3)) == 3
@@ -0,0 +1,95 @@
+# Every solve ends with the outcome that tells its result apart, and counters that add up over attempts and workers.
+import io
+import pickle
+
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.bitmask import BitmaskSolver
+from simple_sudoku.dlx import DancingLinksSolver
+from simple_sudoku.portfolio import PortfolioSolver
+from simple_sudoku.stats import CANCELLED, GAVE_UP, NO_SOLUTION, SOLVED, SearchStats, profile
+from simple_sudoku.sudoku import Sudoku
+
+HARD = load_corpus("hard")[1]  # Needs a few hundred guesses of either solver.
+EMPTY = [[0] * 9 for _ in range(9)]
+UNSOLVABLE = [[1, 1] + [0] * 7] + [[0] * 9 for _ in range(8)]
+
+
+@pytest.mark.parametrize("solver_class", [BitmaskSolver, DancingLinksSolver])
+def test_outcomes(solver_class):
+    solver = solver_class(9)
+
+    assert len(solver.solve(HARD)) == 1 and solver.complete is True
+    assert solver.stats.outcome == SOLVED and solver.stats.attempts == 1
+    assert 0 < solver.stats.backtracks <= solver.stats.nodes and solver.stats.max_depth > 0
+
+    assert solver.solve(UNSOLVABLE) == [] and solver.complete is True
+    assert solver.stats.outcome == NO_SOLUTION
+
+    assert solver.solve(EMPTY, limit=10 ** 6, node_limit=10) == [] and solver.complete is False
+    assert solver.stats.outcome == GAVE_UP and solver.stats.nodes <= 11
+
+    solver.solve(EMPTY, limit=10 ** 6, stop=lambda: True)
+    assert solver.complete is False and solver.stats.outcome == CANCELLED
+
+
+def test_attempts_add_up():
+    seen = []
+    stats = SearchStats(callback=lambda c_stats: seen.append((c_stats.attempts, c_stats.outcome)))
+    solver = BitmaskSolver(9)
+
+    solver.solve(EMPTY, limit=10 ** 6, node_limit=10, stats=stats)
+    first_nodes = stats.nodes
+    solver.solve(HARD, stats=stats)
+
+    assert seen == [(1, GAVE_UP), (2, SOLVED)]
+    assert stats.nodes > first_nodes
+    assert (stats.restarts, len(stats.attempt_seconds)) == (1, 2)
+    assert stats.seconds == sum(stats.attempt_seconds)
+
+
+def test_merge_and_pickle():
+    stats = SearchStats(callback=print)
+    stats.add_attempt(10, 4, 3, 7, 20, 0.5, GAVE_UP)
+
+    other = pickle.loads(pickle.dumps(stats))  # The way stats come back from worker processes.
+    assert other.callback is None and other.as_dict() == stats.as_dict()
+
+    other.add_attempt(5, 1, 6, 2, 3, 0.25, SOLVED)
+    stats.merge(other)
+
+    assert stats.as_dict() == {"outcome": GAVE_UP, "nodes": 25, "backtracks": 9, "max_depth": 6, "propagations": 16,
+                               "forced": 43, "attempts": 3, "restarts": 2, "seconds": 1.25}
+
+
+def test_sudoku_stats():
+    game = Sudoku(9, seed=1)
+    game.load_text("".join(str(value) for row in HARD for value in row))
+
+    assert game.solve_with_threads(workers=1) is True and game.stats.outcome == SOLVED
+
+    game.load_text("".join(str(value) for row in UNSOLVABLE for value in row))
+    stats = SearchStats()
+
+    assert game.solve_with_threads(workers=1, stats=stats) is False
+    assert game.stats is stats and stats.outcome == NO_SOLUTION and game.cancelled is False
+
+
+def test_portfolio_stats():  # Counters of every worker are summed, attempts include each worker's restarts.
+    portfolio = PortfolioSolver(2)
+
+    try:
+        solution = portfolio.solve(9, HARD, node_limit=1)  # Every worker restarts a few times before it solves.
+    finally:
+        portfolio.shutdown()
+
+    assert solution is not None
+    assert portfolio.stats.outcome == SOLVED and portfolio.stats.attempts >= 2 and portfolio.stats.nodes > 0
+
+
+def test_profile():
+    stream = io.StringIO()
+
+    assert profile(sum, [1, 2, 3], stream=stream, limit=3) == 6
+    assert "function calls" in stream.getvalue()
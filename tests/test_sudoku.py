@@ -0,0 +1,57 @@
+# A seeded Sudoku makes the same puzzles and the same searches on every run, whatever else uses random numbers.
+import random
+
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.stats import SOLVED
+from simple_sudoku.sudoku import Sudoku
+
+HARD = "".join(str(value) for row in load_corpus("hard")[1] for value in row)
+
+
+def created(size, seed, engine="bitmask"):  # (puzzle, solution) made by a new Sudoku, as lists of rows.
+    game = Sudoku(size, engine=engine, seed=seed)
+    random.seed()  # The random module must have no say.
+
+    assert game.create_sudoku_puzzle() is True
+    return game.grid.rows(), game.current_result.rows()
+
+
+@pytest.mark.parametrize("size, engine", [(4, "bitmask"), (9, "bitmask"), (9, "dlx"), (16, "bitmask")])
+def test_same_seed_same_puzzle(size, engine):
+    assert created(size, 7, engine) == created(size, 7, engine)
+    assert created(size, 7, engine) != created(size, 8, engine)
+
+
+def test_unseeded_puzzles_differ():
+    assert len({str(created(9, None)) for _ in range(3)}) == 3
+
+
+def solve(seed, text=HARD, workers=4):  # Return (solution, guesses) of a search by a new Sudoku.
+    game = Sudoku(9, seed=seed)
+    game.load_text(text)
+
+    assert game.solve_with_threads(workers=workers) is True
+    assert game.portfolio is None  # A seed means one complete search in this process, never the portfolio race.
+    return game.grid.rows(), game.stats.nodes
+
+
+def test_same_seed_same_search():
+    first = solve(3)
+
+    assert solve(3) == first and solve(3, workers=1) == first
+    assert Sudoku(9, seed=3).stats is None
+
+
+def test_seed_changes_search_order():  # The empty board has many solutions, each seed finds its own.
+    assert len({str(solve(seed, "." * 81)[0]) for seed in range(5)}) == 5
+
+
+def test_created_puzzle_is_solved_the_same():
+    puzzle, solution = created(9, 11)
+    game = Sudoku(9, seed=12)
+    game.load_text("".join(str(value) for row in puzzle for value in row))
+
+    assert game.solve_with_threads() is True
+    assert game.grid.rows() == solution and game.stats.outcome == SOLVED
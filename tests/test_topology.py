@@ -0,0 +1,70 @@
+# Shared unit and peer tables, checked against the rules of Sudoku worked out spot by spot.
+import pytest
+
+from simple_sudoku.bitmask import BitmaskSolver
+from simple_sudoku.topology import Topology, get_topology
+from simple_sudoku.variants import make_topology
+
+
+@pytest.mark.parametrize("size", [4, 9, 16, 25])
+def test_units_and_peers(size):
+    topology = get_topology(size)
+    block_row = int(size ** 0.5)
+
+    assert topology.classic is True
+    assert len(topology.units) == topology.house_count == 3 * size
+    assert all(len(unit) == size for unit in topology.units)
+
+    for cell in range(size * size):
+        row, col = divmod(cell, size)
+        block = (row // block_row) * block_row + col // block_row
+
+        assert topology.coords[cell] == (row, col)
+        assert topology.cell_units[cell] == (row, size + col, 2 * size + block)
+        assert all(cell in topology.units[unit] for unit in topology.cell_units[cell])
+
+        peers = {other for other in range(size * size) if other != cell and (
+            other // size == row or other % size == col
+            or (other // size // block_row, other % size // block_row) == (row // block_row, col // block_row))}
+        assert set(topology.peers[cell]) == peers
+        assert len(topology.peers[cell]) == 2 * (size - 1) + (block_row - 1) ** 2
+
+
+def test_shared_per_size():
+    assert get_topology(9) is get_topology(9)
+    assert get_topology(9) is not get_topology(16)
+    assert make_topology(9) is get_topology(9)
+    assert BitmaskSolver(9).units is get_topology(9).units
+
+
+def test_bad_sizes():
+    with pytest.raises(ValueError):
+        Topology(10)
+
+    with pytest.raises(ValueError):
+        Topology(4, regions=[0] * 16)
+
+
+def test_cages():
+    # A cage with a sum and one without, over the first two spots and the last two.
+    topology = make_topology(4, {"cages": [[3, [0, 1]], [None, [14, 15]]]})
+
+    assert topology.classic is False
+    assert topology.house_count == 12
+    assert topology.cage_options == {12: (0b0011,)}  # 1 + 2 is the only way to make 3.
+    assert topology.cell_cages[0] == (12,) and topology.cell_cages[15] == (13,)
+    assert topology.cell_sum_cages[0] == (12,) and topology.cell_sum_cages[15] == ()
+
+    solver = BitmaskSolver(4, topology)
+    assert solver.cell_cages is topology.cell_sum_cages  # Built once with the topology, not per solver.
+
+    solution = solver.solve([[0] * 4 for _ in range(4)], limit=1)[0]
+    assert sorted(solution[0][:2]) == [1, 2] and solution[3][2] != solution[3][3]
+
+
+def test_extra_houses():
+    topology = make_topology(9, {"diagonals": True, "hyper": True})
+
+    assert topology.house_count == 27 + 2 + 4
+    assert topology.units[27] == tuple(index * 10 for index in range(9))
+    assert 27 in topology.cell_units[40] and 28 in topology.cell_units[40]  # The center is on both diagonals.
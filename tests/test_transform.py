@@ -0,0 +1,70 @@
+# Transforms must turn a puzzle into an equivalent one: a solution stays a solution and one solution stays one.
+import numpy
+import pytest
+
+from simple_sudoku.benchmark import load_corpus
+from simple_sudoku.bitmask import get_solver
+from simple_sudoku.sudoku import Sudoku
+from simple_sudoku.transform import apply_transforms, multiply, random_orders, random_transforms
+from simple_sudoku.validate import solved_boards
+
+
+@pytest.mark.parametrize("size", [4, 9, 16, 25])
+def test_orders_keep_bands(size):
+    block_row = int(size ** 0.5)
+    orders = random_orders(200, size, numpy.random.default_rng(size))
+
+    for order in orders:
+        assert sorted(order) == list(range(size))
+
+        bands = order.reshape(block_row, block_row) // block_row
+        assert all(len(set(band)) == 1 for band in bands)  # Rows of a band stay together.
+
+
+def test_value_maps():
+    value_maps = random_transforms(100, 9, numpy.random.default_rng(1))[0]
+
+    assert (value_maps[:, 0] == 0).all()
+    assert all(sorted(value_map[1:]) == list(range(1, 10)) for value_map in value_maps)
+
+
+def test_identity():
+    grid = numpy.array(load_corpus("hard")[0])
+    identity = (numpy.arange(10)[None], numpy.arange(9)[None], numpy.arange(9)[None], numpy.array([False]))
+
+    assert numpy.array_equal(apply_transforms(grid, identity)[0], grid)
+
+
+@pytest.mark.parametrize("corpus", ["hard", "16x16"])
+def test_equivalent_puzzles(corpus):
+    puzzle = load_corpus(corpus)[0]
+    size = len(puzzle)
+    solution = get_solver(size).solve(puzzle, limit=1)[0]
+
+    puzzles, solutions = multiply(puzzle, 20 if size == 9 else 4, solution=solution, rng=numpy.random.default_rng(3))
+
+    assert solved_boards(solutions).all()
+
+    for new_puzzle, new_solution in zip(puzzles, solutions):
+        assert (new_puzzle == 0).sum() == sum(row.count(0) for row in puzzle)
+        assert ((new_puzzle == 0) | (new_puzzle == new_solution)).all()  # Clues agree with the moved solution.
+        assert get_solver(size).solve(new_puzzle.tolist(), limit=2) == [new_solution.tolist()]
+
+
+def test_seeded():
+    grid = load_corpus("easy")[0]
+    first = multiply(grid, 5, rng=numpy.random.default_rng(7))[0]
+
+    assert numpy.array_equal(first, multiply(grid, 5, rng=numpy.random.default_rng(7))[0])
+    assert multiply(grid, 5)[1] is None
+
+
+def test_sudoku_multiply():
+    game = Sudoku(9)
+    puzzle = load_corpus("easy")[1]
+    game.load_puzzle(puzzle, get_solver(9).solve(puzzle, limit=1)[0])
+
+    puzzles, solutions = game.multiply(4, rng=numpy.random.default_rng(0))
+
+    assert puzzles.shape == solutions.shape == (4, 9, 9)
+    assert solved_boards(solutions).all()
@@ -0,0 +1,27 @@
+# Every puzzle of the variant corpus has exactly one solution under its rules, and the solution keeps them.
+import pytest
+
+from simple_sudoku.benchmark import load_variants
+from simple_sudoku.bitmask import BitmaskSolver
+from simple_sudoku.validate import solved_boards
+from simple_sudoku.variants import VARIANTS, make_topology, variant_allows
+
+VARIANT_PUZZLES = load_variants()
+
+
+def test_every_variant_is_in_the_corpus():
+    assert set(VARIANT_PUZZLES) == set(VARIANTS)
+
+
+@pytest.mark.parametrize("variant", VARIANTS)
+def test_one_solution(variant):
+    for rules, puzzle in zip(*VARIANT_PUZZLES[variant]):
+        size = len(puzzle)
+        topology = make_topology(size, rules)
+        solutions = BitmaskSolver(size, topology).solve(puzzle, limit=2)
+
+        assert len(solutions) == 1
+        assert solved_boards([solutions[0]], topology)[0]
+
+        cells = [value for row in solutions[0] for value in row]
+        assert all(variant_allows(topology, cells, cell, value) for cell, value in enumerate(cells))